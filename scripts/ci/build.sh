@@ -50,6 +50,17 @@ fi
 #     fi
 # done <<< "$content"
 
+##############################################
+# Generate the argument manifests and help indexes packaged with the command modules
+if python -c "import azure.cli.core" 2>/dev/null; then
+    echo 'Generate command module argument manifests'
+    python ./scripts/generate_argument_manifests.py
+    echo 'Generate command module help indexes'
+    python ./scripts/generate_help_indexes.py
+else
+    echo 'Skip generating command module argument manifests and help indexes: azure.cli.core cannot be imported'
+fi
+
 ##############################################
 # build product packages
 echo 'Build Azure CLI and its command modules'
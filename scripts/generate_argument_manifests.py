@@ -0,0 +1,33 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# Generates the argument manifest (_argument_manifest.json) of every installed command module.
+# The manifest is packaged with the module so that loading the arguments of a command, e.g. for
+# 'az vm show --help' or tab completion, doesn't require importing the SDK operation.
+
+from __future__ import print_function
+
+import argparse
+import sys
+
+from azure.cli.core.application import Configuration
+from azure.cli.core.commands import command_module_map
+from azure.cli.core.commands._argument_manifest import build_argument_manifests, write_argument_manifests
+
+parser = argparse.ArgumentParser(description='Argument manifest generator')
+parser.add_argument('--modules', metavar='MODULE', nargs='+', help='Filter by command module')
+args = parser.parse_args()
+
+# ignore the params passed in now so they aren't used by the cli
+sys.argv = sys.argv[:1]
+
+cmd_table = Configuration().get_command_table()
+manifests = build_argument_manifests(cmd_table, command_module_map)
+if args.modules:
+    manifests = {name: manifest for name, manifest in manifests.items() if name in args.modules}
+write_argument_manifests(manifests)
+
+for name in sorted(manifests):
+    print('{}: {} commands'.format(name, len(manifests[name])))
@@ -0,0 +1,31 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# Generates the help index (_help_index.json) of every installed command module, the parsed YAML
+# help of its commands and groups. The index is packaged with the module so that showing help,
+# 'az find' and 'az interactive' don't parse the YAML help on every invocation.
+
+from __future__ import print_function
+
+import argparse
+import sys
+
+from azure.cli.core._help_index import build_help_indexes, write_help_indexes
+from azure.cli.core.commands import _get_installed_command_modules
+
+parser = argparse.ArgumentParser(description='Help index generator')
+parser.add_argument('--modules', metavar='MODULE', nargs='+', help='Filter by command module')
+args = parser.parse_args()
+
+# ignore the params passed in now so they aren't used by the cli
+sys.argv = sys.argv[:1]
+
+indexes = build_help_indexes(list(_get_installed_command_modules()))
+if args.modules:
+    indexes = {name: index for name, index in indexes.items() if name in args.modules}
+write_help_indexes(indexes)
+
+for name in sorted(indexes):
+    print('{}: {} entries'.format(name, len(indexes[name])))
@@ -0,0 +1,76 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Measures the cold start of `az network vnet show --help`, and the loading of the command table
+of a module, with the arguments of every command, into the parser, as `az interactive` does.
+The parser creates the parser of a command when it is first used: `all parsers` is the time
+taken to create every one of them, which was the cost of every load before.
+
+    python scripts/performance/load_command_table.py --module network --loop 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import subprocess
+import sys
+import time
+
+
+def measure_cold_start(command, loop):
+    times = []
+    for _ in range(loop):
+        start = time.time()
+        subprocess.call([sys.executable, '-m', 'azure.cli'] + command.split(),
+                        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        times.append(time.time() - start)
+    return min(times), sum(times) / len(times)
+
+
+def measure_load_command_table(module):
+    from azure.cli.core.application import APPLICATION, Configuration
+    from azure.cli.core.commands import get_command_table, load_params
+    from azure.cli.core.parser import AzCliCommandParser
+
+    APPLICATION.initialize(Configuration())
+    command_table = get_command_table(module)
+    for command in command_table:
+        load_params(command)
+
+    parser = AzCliCommandParser(prog='az', parents=[APPLICATION.global_parser])
+    start = time.time()
+    parser.load_command_table(command_table)
+    load_time = time.time() - start
+
+    start = time.time()
+    args = parser.parse_args('{} vnet show -g rg -n vnet'.format(module).split())
+    parse_time = time.time() - start
+
+    start = time.time()
+    parsers = sum(len(subparsers.choices.values()) for subparsers in list(parser.subparsers.values()))
+    create_time = time.time() - start
+    return len(command_table), parsers, load_time, parse_time, create_time, args
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='network')
+    parser.add_argument('--loop', type=int, default=5)
+    args = parser.parse_args()
+
+    command = 'network vnet show --help'
+    best, mean = measure_cold_start(command, args.loop)
+    print('az {}: best {:.3f} s, mean {:.3f} s'.format(command, best, mean))
+
+    commands, parsers, load_time, parse_time, create_time, _ = measure_load_command_table(args.module)
+    print('Commands: {}, parsers: {}'.format(commands, parsers))
+    print('Load command table: {:.3f} s'.format(load_time))
+    print('Parse one command: {:.3f} s'.format(parse_time))
+    print('Create all parsers: {:.3f} s'.format(create_time))
+
+
+if __name__ == '__main__':
+    main()
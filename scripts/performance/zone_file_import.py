@@ -0,0 +1,71 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Measures the parsing of a synthetic zone file, made of reverse DNS, TXT and A records, before
+`az network dns zone import` sends it.
+
+    python scripts/performance/zone_file_import.py --records 1000000
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import time
+
+from azure.cli.command_modules.network.zone_file import parse_zone_file
+
+
+def make_zone_file(records):
+    lines = ['$ORIGIN 10.in-addr.arpa.',
+             '$TTL 1h',
+             '@ IN SOA ns1.contoso.com. hostmaster.contoso.com. (',
+             '    2017110101 ; serial',
+             '    12h 15m 3w 3h )',
+             '@ IN NS ns1.contoso.com.']
+    for i in range(records):
+        kind = i % 4
+        name = '{}.{}.{}'.format(i % 256, (i // 256) % 256, i // 65536)
+        if kind < 2:
+            lines.append('{} 3600 IN PTR host-{}.contoso.com.'.format(name, i))
+        elif kind == 2:
+            lines.append('txt-{} IN TXT "v=spf1 include:_spf.contoso.com ~all" "id={}" ; comment'.format(i, i))
+        else:
+            lines.append('a-{}\tIN\tA\t10.{}'.format(i, name))
+            lines.append('\tTXT ( "continued \\"{}\\""'.format(i))
+            lines.append('\t      "on two lines" )')
+    return '\n'.join(lines) + '\n'
+
+
+def get_peak_memory_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=1000000)
+    args = parser.parse_args()
+
+    text = make_zone_file(args.records)
+    start = time.time()
+    zone = parse_zone_file(text, '10.in-addr.arpa')
+    elapsed = time.time() - start
+
+    print('Records: {}'.format(args.records))
+    print('Record sets: {}'.format(sum(len(x) for x in zone.values())))
+    print('Parse: {:.2f} s ({:.0f} records/s)'.format(elapsed, args.records / elapsed))
+    peak = get_peak_memory_mb()
+    if peak is not None:
+        print('Peak memory: {:.0f} MB'.format(peak))
+
+
+if __name__ == '__main__':
+    main()
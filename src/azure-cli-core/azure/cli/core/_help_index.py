@@ -0,0 +1,137 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import hashlib
+import json
+import os
+import sys
+from codecs import open as codecs_open
+from importlib import import_module
+
+import azure.cli.core.azlogging as azlogging
+from azure.cli.core.commands._command_index import COMMAND_MODULES_PREFIX, get_command_module_name
+from azure.cli.core.help_files import helps
+
+logger = azlogging.get_az_logger(__name__)
+
+HELP_INDEX_FILE_NAME = '_help_index.json'
+
+# the parsed help entries of the loaded help indexes by name, and the command modules they were loaded for
+_loaded_entries = {}
+_loaded_modules = set()
+_loaded_modules_count = 0
+
+
+def get_help_index_path(command_module):
+    '''Return the path of the help index shipped with the command module `command_module`
+    (e.g. 'vm') or None if the command module has not been imported.
+    '''
+    package = sys.modules.get(COMMAND_MODULES_PREFIX + command_module, None)
+    if package is None or not getattr(package, '__file__', None):
+        return None
+    return os.path.join(os.path.dirname(package.__file__), HELP_INDEX_FILE_NAME)
+
+
+def _get_text_hash(text):
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    return hashlib.sha1(text).hexdigest()
+
+
+def _load_help_index(command_module):
+    path = get_help_index_path(command_module)
+    if path and os.path.isfile(path):
+        try:
+            with codecs_open(path, 'r', encoding='utf-8') as f:
+                _loaded_entries.update(json.load(f))
+        except (OSError, IOError, ValueError):
+            logger.debug("Unable to read help index '%s'.", path)
+
+
+def _load_help_indexes():
+    # the help of a command module is registered when it is imported, so only the indexes of the
+    # imported command modules are loaded, once the modules were imported
+    global _loaded_modules_count  # pylint: disable=global-statement
+    if len(sys.modules) == _loaded_modules_count:
+        return
+    _loaded_modules_count = len(sys.modules)
+    for module_name in list(sys.modules):
+        command_module = get_command_module_name(module_name)
+        if command_module and command_module not in _loaded_modules:
+            _loaded_modules.add(command_module)
+            _load_help_index(command_module)
+
+
+def parse_help_text(text):
+    '''Parse the YAML help `text` and return the data with dates, e.g. of the min_profile and
+    max_profile of examples, as strings.'''
+    import yaml
+    return _normalize_help_data(yaml.load(text))
+
+
+def _normalize_help_data(data):
+    if isinstance(data, dict):
+        return {key: _normalize_help_data(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_normalize_help_data(value) for value in data]
+    if isinstance(data, (datetime.date, datetime.datetime)):
+        return str(data)
+    return data
+
+
+def get_help_data(name):
+    '''Return the parsed help registered for the command or group `name`, or None.
+
+    The help is read from the help index of its command module when the index was generated
+    from the same help text. Otherwise the YAML help text is parsed.
+    '''
+    text = helps.get(name, None)
+    if text is None:
+        return None
+    _load_help_indexes()
+    entry = _loaded_entries.get(name, None)
+    if entry and entry.get('hash') == _get_text_hash(text):
+        return entry['data']
+    return parse_help_text(text)
+
+
+def build_help_indexes(command_modules):
+    '''Import the command modules `command_modules` and return a dict of command module name ->
+    help index of the help they register.
+    '''
+    indexes = {}
+    for command_module in command_modules:
+        registered = set(helps)
+        try:
+            import_module(COMMAND_MODULES_PREFIX + command_module)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to import command module '%s'.", command_module)
+            continue
+        index = {}
+        for name in set(helps) - registered:
+            try:
+                entry = {'hash': _get_text_hash(helps[name]), 'data': parse_help_text(helps[name])}
+                json.dumps(entry)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Unable to index the help of '%s'.", name)
+                continue
+            index[name] = entry
+        indexes[command_module] = index
+    return indexes
+
+
+def write_help_indexes(indexes):
+    '''Write the help indexes, a dict of command module name -> help index.'''
+    global _loaded_modules_count  # pylint: disable=global-statement
+    for command_module, index in indexes.items():
+        path = get_help_index_path(command_module)
+        if not path:
+            continue
+        with codecs_open(path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        _loaded_modules.discard(command_module)
+        _loaded_modules_count = 0
+        logger.debug("Wrote help index for %d commands and groups to '%s'.", len(index), path)
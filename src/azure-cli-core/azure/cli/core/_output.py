@@ -34,12 +34,32 @@ class ComplexEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
-def format_json(obj):
-    result = obj.result
+def _dump_json(result, indent=2):
     # OrderedDict.__dict__ is always '{}', to persist the data, convert to dict first.
     input_dict = dict(result) if hasattr(result, '__dict__') else result
-    return json.dumps(input_dict, indent=2, sort_keys=True, cls=ComplexEncoder,
-                      separators=(',', ': ')) + '\n'
+    return json.dumps(input_dict, indent=indent, sort_keys=True, cls=ComplexEncoder,
+                      separators=(',', ': ') if indent else (',', ':'))
+
+
+def _stream_json(items):
+    # Writes the same document as json.dumps(list(items), indent=2), one element at a time
+    separator = '[\n'
+    for item in items:
+        yield separator + '  ' + _dump_json(item).replace('\n', '\n  ')
+        separator = ',\n'
+    yield '[]\n' if separator == '[\n' else '\n]\n'
+
+
+def format_json(obj):
+    if obj.is_streamed:
+        return _stream_json(obj.result)
+    return _dump_json(obj.result) + '\n'
+
+
+def format_jsonl(obj):
+    result_list = obj.result if obj.is_streamed or isinstance(obj.result, list) else [obj.result]
+    lines = (_dump_json(item, indent=None) + '\n' for item in result_list)
+    return lines if obj.is_streamed else ''.join(lines)
 
 
 def format_json_color(obj):
@@ -82,16 +102,20 @@ def format_table(obj):
 
 def format_tsv(obj):
     result = obj.result
+    if obj.is_streamed:
+        return TsvOutput.iter_rows(result)
     result_list = result if isinstance(result, list) else [result]
     return TsvOutput.dump(result_list)
 
 
 class CommandResultItem(object):  # pylint: disable=too-few-public-methods
 
-    def __init__(self, result, table_transformer=None, is_query_active=False):
+    def __init__(self, result, table_transformer=None, is_query_active=False, is_streamed=False):
         self.result = result
         self.table_transformer = table_transformer
         self.is_query_active = is_query_active
+        # the result is an iterator over the items of a list, consumed as the output is written
+        self.is_streamed = is_streamed
 
 
 class OutputProducer(object):  # pylint: disable=too-few-public-methods
@@ -99,11 +123,16 @@ class OutputProducer(object):  # pylint: disable=too-few-public-methods
     format_dict = {
         'json': format_json,
         'jsonc': format_json_color,
+        'jsonl': format_jsonl,
         'table': format_table,
         'text': format_text,
         'tsv': format_tsv,
     }
 
+    # formats which write each item of a list as it becomes available, instead of laying out
+    # the whole list at once
+    streaming_formats = ('json', 'jsonl', 'tsv')
+
     def __init__(self, formatter, file=sys.stdout):  # pylint: disable=redefined-builtin
         self.formatter = formatter
         self.file = file
@@ -113,12 +142,17 @@ class OutputProducer(object):  # pylint: disable=too-few-public-methods
             self.file = colorama.AnsiToWin32(self.file).stream
         output = self.formatter(obj)
         try:
-            print(output, file=self.file, end='')
+            for chunk in [output] if isinstance(output, string_types) else output:
+                self._write(chunk)
         except IOError as ex:
             if ex.errno == errno.EPIPE:
                 pass
             else:
                 raise
+
+    def _write(self, output):
+        try:
+            print(output, file=self.file, end='')
         except UnicodeEncodeError:
             print(output.encode('ascii', 'ignore').decode('utf-8', 'ignore'),
                   file=self.file, end='')
@@ -127,6 +161,10 @@ class OutputProducer(object):  # pylint: disable=too-few-public-methods
     def get_formatter(format_type):
         return OutputProducer.format_dict.get(format_type)
 
+    @staticmethod
+    def supports_streaming(format_type):
+        return format_type in OutputProducer.streaming_formats
+
 
 class TableOutput(object):  # pylint: disable=too-few-public-methods
 
@@ -255,3 +293,11 @@ class TsvOutput(object):  # pylint: disable=too-few-public-methods
         result = io.getvalue()
         io.close()
         return result
+
+    @staticmethod
+    def iter_rows(data):
+        for item in data:
+            io = StringIO()
+            TsvOutput._dump_row(item, io)
+            yield io.getvalue()
+            io.close()
@@ -641,32 +641,51 @@ class SubscriptionFinder(object):
         return self._auth_context_factory(tenant, token_cache)
 
     def _find_using_common_tenant(self, access_token, resource):
-        import adal
         from msrest.authentication import BasicTokenAuthentication
 
         all_subscriptions = []
         token_credential = BasicTokenAuthentication({'access_token': access_token})
         client = self._arm_client_factory(token_credential)
-        tenants = client.tenants.list()
-        for t in tenants:
-            tenant_id = t.tenant_id
-            temp_context = self._create_auth_context(tenant_id)
-            try:
-                temp_credentials = temp_context.acquire_token(resource, self.user_id, _CLIENT_ID)
-            except adal.AdalError as ex:
-                # because user creds went through the 'common' tenant, the error here must be
-                # tenant specific, like the account was disabled. For such errors, we will continue
-                # with other tenants.
-                logger.warning("Failed to authenticate '%s' due to error '%s'", t, ex)
-                continue
-            subscriptions = self._find_using_specific_tenant(
-                tenant_id,
-                temp_credentials[_ACCESS_TOKEN])
-            all_subscriptions.extend(subscriptions)
+        tenant_ids = [t.tenant_id for t in client.tenants.list()]
+        for tenant_id, subscriptions in zip(tenant_ids, self._find_in_tenants(tenant_ids, resource)):
+            if subscriptions is not None:
+                all_subscriptions.extend(subscriptions)
+                self.tenants.append(tenant_id)
 
         return all_subscriptions
 
+    def _find_in_tenants(self, tenant_ids, resource):
+        '''Find the subscriptions of the tenants `tenant_ids` on up to `core.max_concurrent_tenants`
+        workers. Returns the subscriptions of each tenant, or None for the tenants which failed to
+        authenticate.
+        '''
+        from concurrent.futures import ThreadPoolExecutor
+        from azure.cli.core._config import az_config
+        if not tenant_ids:
+            return []
+        max_concurrent = az_config.getint('core', 'max_concurrent_tenants', fallback=8)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrent, len(tenant_ids)))) as executor:
+            return list(executor.map(lambda tenant_id: self._find_in_tenant(tenant_id, resource), tenant_ids))
+
+    def _find_in_tenant(self, tenant_id, resource):
+        import adal
+        temp_context = self._create_auth_context(tenant_id)
+        try:
+            temp_credentials = temp_context.acquire_token(resource, self.user_id, _CLIENT_ID)
+        except adal.AdalError as ex:
+            # because user creds went through the 'common' tenant, the error here must be
+            # tenant specific, like the account was disabled. For such errors, we will continue
+            # with other tenants.
+            logger.warning("Failed to authenticate '%s' due to error '%s'", tenant_id, ex)
+            return None
+        return self._list_subscriptions(tenant_id, temp_credentials[_ACCESS_TOKEN])
+
     def _find_using_specific_tenant(self, tenant, access_token):
+        all_subscriptions = self._list_subscriptions(tenant, access_token)
+        self.tenants.append(tenant)
+        return all_subscriptions
+
+    def _list_subscriptions(self, tenant, access_token):
         from msrest.authentication import BasicTokenAuthentication
 
         token_credential = BasicTokenAuthentication({'access_token': access_token})
@@ -676,7 +695,6 @@ class SubscriptionFinder(object):
         for s in subscriptions:
             setattr(s, 'tenant_id', tenant)
             all_subscriptions.append(s)
-        self.tenants.append(tenant)
         return all_subscriptions
 
 
@@ -5,7 +5,11 @@
 
 import json
 import os
+import stat
+import sys
+import tempfile
 import time
+from contextlib import contextmanager
 try:
     import collections.abc as collections
 except ImportError:
@@ -15,11 +19,72 @@ except ImportError:
 from codecs import open as codecs_open
 
 
+class _FileLock(object):
+    '''An exclusive lock on `filename`, shared by all processes, held while in the context.'''
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.filename, 'a')
+        if sys.platform == 'win32':
+            import msvcrt
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def _atomic_write(filename, content, encoding):
+    '''Write `content` to a temporary file next to `filename` and rename it over `filename`
+    so readers never observe a partially written file.'''
+    fd, temp_filename = tempfile.mkstemp(dir=os.path.dirname(filename) or '.',
+                                         prefix=os.path.basename(filename), suffix='.tmp')
+    os.close(fd)
+    try:
+        with codecs_open(temp_filename, 'w', encoding=encoding) as f:
+            f.write(content)
+        if os.path.exists(filename):
+            os.chmod(temp_filename, stat.S_IMODE(os.stat(filename).st_mode))
+        try:
+            os.replace(temp_filename, filename)
+        except AttributeError:
+            # Python 2 has no os.replace, os.rename only overwrites an existing file on POSIX
+            if sys.platform == 'win32' and os.path.exists(filename):
+                os.remove(filename)
+            os.rename(temp_filename, filename)
+    except Exception:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
 class Session(collections.MutableMapping):
     '''A simple dict-like class that is backed by a JSON file.
 
     All direct modifications will save the file. Indirect modifications should
     be followed by a call to `save_with_retry` or `save`.
+
+    Saving only writes the keys changed by this process on top of the current
+    contents of the file, under a lock shared by all processes, and skips the
+    write if nothing changed. Within a `transaction` modifications are only
+    kept in memory and saved once the outermost transaction ends.
     '''
 
     def __init__(self, encoding=None):
@@ -27,24 +92,59 @@ class Session(collections.MutableMapping):
         self.filename = None
         self.data = {}
         self._encoding = encoding if encoding else 'utf-8-sig'
+        # the file contents as last read or written by this process
+        self._synced_data = {}
+        self._transaction_depth = 0
 
     def load(self, filename, max_age=0):
         self.filename = filename
         self.data = {}
+        self._synced_data = {}
         try:
             if max_age > 0:
                 st = os.stat(self.filename)
-                if st.st_mtime + max_age < time.clock():
-                    self.save()
+                if st.st_mtime + max_age < time.time():
+                    with _FileLock(self._lock_filename):
+                        _atomic_write(self.filename, json.dumps(self.data), self._encoding)
             with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
-                self.data = json.load(f)
+                content = f.read()
+            self.data = json.loads(content)
+            self._synced_data = json.loads(content)
         except (OSError, IOError):
             self.save()
 
+    @property
+    def _lock_filename(self):
+        return self.filename + '.lock'
+
+    def _read_synced_data(self):
+        try:
+            with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
+                return json.load(f)
+        except (OSError, IOError, ValueError):
+            return None
+
     def save(self):
-        if self.filename:
-            with codecs_open(self.filename, 'w', encoding=self._encoding) as f:
-                json.dump(self.data, f)
+        if self.filename and not self._transaction_depth:
+            with _FileLock(self._lock_filename):
+                current = self._read_synced_data()
+                merged = dict(current or {})
+                data = json.loads(json.dumps(self.data))
+                for key in set(self._synced_data) | set(data):
+                    if key not in data:
+                        merged.pop(key, None)
+                    elif key not in self._synced_data or self._synced_data[key] != data[key]:
+                        merged[key] = data[key]
+                if merged != current:
+                    _atomic_write(self.filename, json.dumps(merged), self._encoding)
+            self._synced_data = json.loads(json.dumps(merged))
+            # keep the objects of this process and pick up the keys changed by others
+            for key in list(self.data):
+                if key not in merged:
+                    del self.data[key]
+            for key in merged:
+                if key not in data or merged[key] != data[key]:
+                    self.data[key] = merged[key]
 
     def save_with_retry(self, retries=5):
         for _ in range(retries - 1):
@@ -56,6 +156,18 @@ class Session(collections.MutableMapping):
         else:
             self.save()
 
+    @contextmanager
+    def transaction(self):
+        '''Keep all modifications in memory and save them once, at the end of the outermost
+        transaction.'''
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                self.save_with_retry()
+
     def get(self, key, default=None):
         return self.data.get(key, default)
 
@@ -77,6 +189,39 @@ class Session(collections.MutableMapping):
         return len(self.data)
 
 
+class CacheSession(Session):
+    '''A Session of cached values which expire `max_age` seconds after they are set.
+
+    Use `get_value` and `set_value` to access the values. Expired values are dropped when the
+    file is loaded.
+    '''
+
+    def __init__(self, max_age, encoding=None):
+        super(CacheSession, self).__init__(encoding)
+        self.max_age = max_age
+
+    def load(self, filename, max_age=0):
+        super(CacheSession, self).load(filename, max_age)
+        expired = [key for key, entry in self.data.items() if not self._is_fresh(entry)]
+        if expired:
+            with self.transaction():
+                for key in expired:
+                    del self[key]
+
+    def _is_fresh(self, entry):
+        try:
+            return 0 <= time.time() - entry['time'] < self.max_age
+        except (KeyError, TypeError):
+            return False
+
+    def get_value(self, key, default=None):
+        entry = self.data.get(key)
+        return entry['value'] if self._is_fresh(entry) else default
+
+    def set_value(self, key, value):
+        self[key] = {'time': time.time(), 'value': value}
+
+
 # ACCOUNT contains subscriptions information
 ACCOUNT = Session()
 
@@ -85,3 +230,6 @@ CONFIG = Session()
 
 # SESSION provides read-write session variables
 SESSION = Session()
+
+# INDEX maps command names to the command modules that own them
+INDEX = Session()
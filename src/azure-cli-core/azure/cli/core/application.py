@@ -4,12 +4,16 @@
 # --------------------------------------------------------------------------------------------
 
 from collections import defaultdict
+from contextlib import contextmanager
 import sys
 import os
 import uuid
 import argparse
+import threading
+import timeit
+import types
 from azure.cli.core.parser import AzCliCommandParser, enable_autocomplete
-from azure.cli.core._output import CommandResultItem
+from azure.cli.core._output import CommandResultItem, OutputProducer
 import azure.cli.core.extensions
 import azure.cli.core._help as _help
 import azure.cli.core.azlogging as azlogging
@@ -93,6 +97,25 @@ class Configuration(object):  # pylint: disable=too-few-public-methods
                     yield (dummy_cmdname, CliCommand(dummy_cmdname, None))
 
 
+class _EventDataFormatter(object):  # pylint: disable=too-few-public-methods
+    '''Formats the data of an event when a log record is emitted rather than when it is logged.
+    '''
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return truncate_text(str(self.data), width=500)
+
+
+def _get_handler_name(handler):
+    name = getattr(handler, '__qualname__', None) or getattr(handler, '__name__', None)
+    if not name:
+        return repr(handler)
+    module = getattr(handler, '__module__', None)
+    return '{}.{}'.format(module, name) if module else name
+
+
 class Application(object):
 
     TRANSFORM_RESULT = 'Application.TransformResults'
@@ -106,6 +129,7 @@ class Application(object):
 
     def __init__(self, configuration=None):
         self._event_handlers = defaultdict(lambda: [])
+        self._event_timings = defaultdict(lambda: [0, 0.0])
         self.session = {
             'headers': {},  # the x-ms-client-request-id is generated before a command is to execute
             'command': 'unknown',
@@ -128,15 +152,36 @@ class Application(object):
         self.parser = AzCliCommandParser(prog='az', parents=[self.global_parser])
         self.configuration = configuration
         self.progress_controller = progress.ProgressHook()
+        # the request headers and progress controller of the commands executed concurrently
+        # for the values of --ids
+        self._thread_local = threading.local()
 
     def get_progress_controller(self, det=False):
+        thread_progress_controller = getattr(self._thread_local, 'progress_controller', None)
+        if thread_progress_controller:
+            return thread_progress_controller
         self.progress_controller.init_progress(progress.get_progress_view(det))
         return self.progress_controller
 
+    def get_request_headers(self):
+        '''The headers added to the requests of the executing command.'''
+        return getattr(self._thread_local, 'headers', None) or self.session['headers']
+
+    @contextmanager
+    def use_request_headers(self, headers):
+        '''Add `headers`, e.g. the headers of a command captured on another thread, to the requests
+        sent by this thread while in the context.'''
+        previous = getattr(self._thread_local, 'headers', None)
+        self._thread_local.headers = headers
+        try:
+            yield
+        finally:
+            self._thread_local.headers = previous
+
     def initialize(self, configuration):
         self.configuration = configuration
 
-    def execute(self, unexpanded_argv):  # pylint: disable=too-many-statements
+    def execute(self, unexpanded_argv, stream_result=False):  # pylint: disable=too-many-statements
         self.refresh_request_id()
 
         argv = Application._expand_file_prefixed_files(unexpanded_argv)
@@ -184,35 +229,33 @@ class Application(object):
         args = self.parser.parse_args(argv)
 
         self.raise_event(self.COMMAND_PARSER_PARSED, command=args.command, args=args)
-        results = []
-        for expanded_arg in _explode_list_args(args):
-            self.session['command'] = expanded_arg.command
-            try:
-                _validate_arguments(expanded_arg)
-            except CLIError:
-                raise
-            except:  # pylint: disable=bare-except
-                err = sys.exc_info()[1]
-                getattr(expanded_arg, '_parser', self.parser).validation_error(str(err))
-
-            # Consider - we are using any args that start with an underscore (_) as 'private'
-            # arguments and remove them from the arguments that we pass to the actual function.
-            # This does not feel quite right.
-            params = dict([(key, value)
-                           for key, value in expanded_arg.__dict__.items()
-                           if not key.startswith('_')])
-            params.pop('subcommand', None)
-            params.pop('func', None)
-            params.pop('command', None)
-
-            telemetry.set_command_details(expanded_arg.command,
-                                          self.configuration.output_format,
-                                          [p for p in unexpanded_argv if p.startswith('-')])
-
-            result = expanded_arg.func(params)
-            result = todict(result)
-            results.append(result)
-
+        expanded_args = list(_explode_list_args(args))
+        max_concurrent = az_config.getint('core', 'max_concurrent_ids', fallback=1)
+        if len(expanded_args) > 1 and max_concurrent > 1:
+            # all the values are validated before any of them is executed
+            params = [self._get_command_params(expanded_arg, unexpanded_argv)
+                      for expanded_arg in expanded_args]
+            if _can_execute_concurrently(command_table[args.command], params[0]):
+                results = self._execute_concurrently(expanded_args, params, max_concurrent)
+            else:
+                results = [expanded_arg.func(p) for expanded_arg, p in zip(expanded_args, params)]
+        else:
+            results = []
+            for expanded_arg in expanded_args:
+                results.append(expanded_arg.func(self._get_command_params(expanded_arg, unexpanded_argv)))
+
+        if stream_result and len(results) == 1 and isinstance(results[0], types.GeneratorType) \
+                and OutputProducer.supports_streaming(self.configuration.output_format) \
+                and not self.session['query_active']:
+            # The items of a paged result are transformed and written out one at a time, as the
+            # pages are fetched, instead of holding the whole result in memory
+            return CommandResultItem(self._transform_result_items(results[0]),
+                                     table_transformer=command_table[args.command].table_transformer,
+                                     is_query_active=False,
+                                     is_streamed=True)
+
+        results = [todict(list(result) if isinstance(result, types.GeneratorType) else result)
+                   for result in results]
         if len(results) == 1:
             results = results[0]
 
@@ -224,13 +267,104 @@ class Application(object):
                                  table_transformer=command_table[args.command].table_transformer,
                                  is_query_active=self.session['query_active'])
 
+    def _get_command_params(self, expanded_arg, unexpanded_argv):
+        self.session['command'] = expanded_arg.command
+        try:
+            _validate_arguments(expanded_arg)
+        except CLIError:
+            raise
+        except:  # pylint: disable=bare-except
+            err = sys.exc_info()[1]
+            getattr(expanded_arg, '_parser', self.parser).validation_error(str(err))
+
+        # Consider - we are using any args that start with an underscore (_) as 'private'
+        # arguments and remove them from the arguments that we pass to the actual function.
+        # This does not feel quite right.
+        params = dict([(key, value)
+                       for key, value in expanded_arg.__dict__.items()
+                       if not key.startswith('_')])
+        params.pop('subcommand', None)
+        params.pop('func', None)
+        params.pop('command', None)
+
+        telemetry.set_command_details(expanded_arg.command,
+                                      self.configuration.output_format,
+                                      [p for p in unexpanded_argv if p.startswith('-')])
+        return params
+
+    def _execute_concurrently(self, expanded_args, params, max_concurrent):
+        '''Execute the command for each value of --ids on up to `max_concurrent` workers.
+
+        Every value gets its own x-ms-client-request-id, the progress is reported as the number
+        of values completed and the errors are reported for each value once all completed.
+        '''
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        def _execute(index):
+            headers = dict(self.session['headers'])
+            headers['x-ms-client-request-id'] = str(uuid.uuid1())
+            self._thread_local.headers = headers
+            self._thread_local.progress_controller = progress.ProgressHook()
+            self._thread_local.progress_controller.init_progress(progress.NoOpView())
+            try:
+                logger.debug("Executing '%s' for %s with x-ms-client-request-id %s",
+                             expanded_args[index].command, _get_ids_label(expanded_args, index),
+                             headers['x-ms-client-request-id'])
+                result = expanded_args[index].func(params[index])
+                return list(result) if isinstance(result, types.GeneratorType) else result
+            finally:
+                del self._thread_local.headers
+                del self._thread_local.progress_controller
+
+        total = len(expanded_args)
+        results = [None] * total
+        errors = []
+        progress_controller = self.get_progress_controller(det=True)
+        progress_controller.begin(value=0, total_val=total)
+        with ThreadPoolExecutor(max_workers=min(max_concurrent, total)) as executor:
+            futures = {executor.submit(_execute, index): index for index in range(total)}
+            for completed, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as ex:  # pylint: disable=broad-except
+                    errors.append((index, ex))
+                progress_controller.add(message='{} of {} completed'.format(completed, total),
+                                        value=completed, total_val=total)
+        progress_controller.end()
+
+        if errors:
+            for index, ex in sorted(errors, key=lambda e: e[0]):
+                logger.error('%s: %s', _get_ids_label(expanded_args, index), ex)
+            raise CLIError('{} of {} operations failed.'.format(len(errors), total))
+        return results
+
+    def _transform_result_items(self, items):
+        for item in items:
+            event_data = {'result': todict(item)}
+            self.raise_event(self.TRANSFORM_RESULT, event_data=event_data)
+            yield event_data['result']
+
     def raise_event(self, name, **kwargs):
         '''Raise the event `name`.
         '''
-        data = truncate_text(str(kwargs), width=500)
-        logger.debug("Application event '%s' with event data %s", name, data)
+        # The event data, e.g. the whole command table, is only formatted if a handler emits the record
+        logger.debug("Application event '%s' with event data %s", name, _EventDataFormatter(kwargs))
         for func in list(self._event_handlers[name]):  # Make copy in case handler modifies the list
+            start_time = timeit.default_timer()
             func(**kwargs)
+            elapsed_time = timeit.default_timer() - start_time
+            timing = self._event_timings[(name, _get_handler_name(func))]
+            timing[0] += 1
+            timing[1] += elapsed_time
+
+    def get_event_timings(self):
+        '''Return the handlers called for each event as (event name, handler name, calls, seconds),
+        the slowest first.
+        '''
+        return sorted(((name, handler, calls, seconds)
+                       for (name, handler), (calls, seconds) in self._event_timings.items()),
+                      key=lambda t: t[3], reverse=True)
 
     def register(self, name, handler):
         '''Register a callable that will be called when the
@@ -268,7 +402,7 @@ class Application(object):
     def _register_builtin_arguments(**kwargs):
         global_group = kwargs['global_group']
         global_group.add_argument('--output', '-o', dest='_output_format',
-                                  choices=['json', 'tsv', 'table', 'jsonc'],
+                                  choices=['json', 'tsv', 'table', 'jsonc', 'jsonl'],
                                   default=az_config.get('core', 'output', fallback='json'),
                                   help='Output format',
                                   type=str.lower)
@@ -330,6 +464,17 @@ def _validate_arguments(args, **_):
         pass
 
 
+def _can_execute_concurrently(command, params):
+    # commands which prompt for confirmation are only executed concurrently when not prompting
+    from azure.cli.core.commands import CONFIRM_PARAM_NAME
+    return CONFIRM_PARAM_NAME not in command.arguments or params.get(CONFIRM_PARAM_NAME) or \
+        az_config.getboolean('core', 'disable_confirm_prompt', fallback=False)
+
+
+def _get_ids_label(expanded_args, index):
+    return getattr(expanded_args[index], '_ids', None) or 'value {}'.format(index + 1)
+
+
 def _explode_list_args(args):
     '''Iterate through each attribute member of args and create a copy with
     the IterateValues 'flattened' to only contain a single value
@@ -8,13 +8,17 @@ from __future__ import print_function
 import datetime
 import json
 import logging as logs
+import os
 import pkgutil
 import re
 import sys
+import threading
 import time
 import timeit
 import traceback
+import types
 from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from importlib import import_module
 
 import six
@@ -141,9 +145,14 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         self.progress_controller = progress_controller or APPLICATION.get_progress_controller()
         self.deploy_dict = {}
         self.last_progress_report = datetime.datetime.now()
+        # set once the poller completes, to stop waiting as soon as it does
+        self._done_event = None
 
     def _delay(self):
-        time.sleep(self.poller_done_interval_ms / 1000.0)
+        if self._done_event:
+            self._done_event.wait(self.poller_done_interval_ms / 1000.0)
+        else:
+            time.sleep(self.poller_done_interval_ms / 1000.0)
 
     def _generate_template_progress(self, correlation_id):  # pylint: disable=no-self-use
         """ gets the progress for template deployments """
@@ -209,27 +218,41 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
 
     def __call__(self, poller):
         from msrest.exceptions import ClientException
+        from azure.cli.core.commands._polling import PollingBackoff
         correlation_message = ''
         self.progress_controller.begin()
         correlation_id = None
 
         az_logger = azlogging.get_az_logger()
         is_verbose = any(handler.level <= logs.INFO for handler in az_logger.handlers)
+        # the activity log is queried less and less often as the operation goes on
+        progress_report_backoff = PollingBackoff(initial=10, ceiling=60)
+        next_progress_report = self.last_progress_report + datetime.timedelta(seconds=10)
+
+        self._done_event = threading.Event()
+        try:
+            poller.add_done_callback(lambda _: self._done_event.set())
+        except (AttributeError, ValueError):
+            # the poller has completed already, or can't notify its completion
+            self._done_event = None
 
         while not poller.done():
             self.progress_controller.add(message='Running')
-            try:
-                # pylint: disable=protected-access
-                correlation_id = json.loads(
-                    poller._response.__dict__['_content'].decode())['properties']['correlationId']
+            if correlation_id is None:
+                try:
+                    # pylint: disable=protected-access
+                    correlation_id = json.loads(
+                        poller._response.__dict__['_content'].decode())['properties']['correlationId']
 
-                correlation_message = 'Correlation ID: {}'.format(correlation_id)
-            except:  # pylint: disable=bare-except
-                pass
+                    correlation_message = 'Correlation ID: {}'.format(correlation_id)
+                except:  # pylint: disable=bare-except
+                    pass
 
             current_time = datetime.datetime.now()
-            if is_verbose and current_time - self.last_progress_report >= datetime.timedelta(seconds=10):
+            if is_verbose and current_time >= next_progress_report:
                 self.last_progress_report = current_time
+                next_progress_report = current_time + datetime.timedelta(
+                    seconds=progress_report_backoff.next_delay())
                 try:
                     self._generate_template_progress(correlation_id)
                 except Exception as ex:  # pylint: disable=broad-except
@@ -311,9 +334,10 @@ class CliCommand(object):  # pylint:disable=too-many-instance-attributes
 
     def __init__(self, name, handler, description=None, table_transformer=None,
                  arguments_loader=None, description_loader=None,
-                 formatter_class=None, deprecate_info=None):
+                 formatter_class=None, deprecate_info=None, operation=None):
         self.name = name
         self.handler = handler
+        self.operation = operation
         self.help = None
         self.description = description_loader \
             if description_loader and CliCommand._should_load_description() \
@@ -426,12 +450,54 @@ def _get_command_table_from_extensions():
                 logger.debug(traceback.format_exc())
 
 
+def _get_installed_command_modules():
+    installed_command_modules = OrderedDict()
+    try:
+        mods_ns_pkg = import_module('azure.cli.command_modules')
+        for module_finder, modname, _ in pkgutil.iter_modules(mods_ns_pkg.__path__):
+            if modname not in BLACKLISTED_MODS:
+                installed_command_modules[modname] = os.path.join(getattr(module_finder, 'path', ''), modname)
+    except ImportError:
+        pass
+    return installed_command_modules
+
+
+def _get_command_index_version(installed_command_modules):
+    from azure.cli.core.commands._command_index import get_index_version
+    return get_index_version(installed_command_modules,
+                             {ext_name: get_extension_path(ext_name) for ext_name in get_extension_names()})
+
+
+def _load_command_modules(modules):
+    cumulative_elapsed_time = 0
+    for mod in modules:
+        try:
+            start_time = timeit.default_timer()
+            import_module('azure.cli.command_modules.' + mod).load_commands()
+            elapsed_time = timeit.default_timer() - start_time
+            logger.debug("Loaded module '%s' in %.3f seconds.", mod, elapsed_time)
+            cumulative_elapsed_time += elapsed_time
+        except Exception as ex:  # pylint: disable=broad-except
+            # Changing this error message requires updating CI script that checks for failed
+            # module loading.
+            logger.error("Error loading command module '%s'", mod)
+            telemetry.set_exception(exception=ex, fault_type='module-load-error-' + mod,
+                                    summary='Error loading module: {}'.format(mod))
+            logger.debug(traceback.format_exc())
+    return cumulative_elapsed_time
+
+
 def get_command_table(module_name=None):
     '''Loads command table(s)
     When `module_name` is specified, only commands from that module will be loaded.
-    If the module is not found, all commands are loaded.
+    If there is no module with that name, the command index is used to load only the modules
+    owning commands that start with `module_name`.
+    If that fails, all commands are loaded and the command index is refreshed.
     '''
+    from azure.cli.core.commands._command_index import (get_indexed_command_modules,
+                                                        update_command_index)
     loaded = False
+    index_version = None
     # TODO remove module_name != 'sf' once old sf module is deprecated from the repo
     if module_name and module_name not in BLACKLISTED_MODS and module_name != 'sf':
         try:
@@ -439,37 +505,35 @@ def get_command_table(module_name=None):
             logger.debug("Successfully loaded command table from module '%s'.", module_name)
             loaded = True
         except ImportError:
-            logger.debug("Loading all installed modules as module with name '%s' not found.", module_name)
+            try:
+                index_version = _get_command_index_version(_get_installed_command_modules())
+                indexed_modules = get_indexed_command_modules(module_name, index_version)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Unable to read the command index.")
+                logger.debug(traceback.format_exc())
+                indexed_modules = None
+            if indexed_modules:
+                logger.debug("Loading modules %s owning commands starting with '%s' from the command index.",
+                             indexed_modules, module_name)
+                _load_command_modules(indexed_modules)
+                loaded = True
+            else:
+                logger.debug("Loading all installed modules as module with name '%s' not found.", module_name)
         except Exception:  # pylint: disable=broad-except
             pass
     if not loaded:
-        installed_command_modules = []
-        try:
-            mods_ns_pkg = import_module('azure.cli.command_modules')
-            installed_command_modules = [modname for _, modname, _ in
-                                         pkgutil.iter_modules(mods_ns_pkg.__path__)
-                                         if modname not in BLACKLISTED_MODS]
-        except ImportError:
-            pass
-        logger.debug('Installed command modules %s', installed_command_modules)
-        cumulative_elapsed_time = 0
-        for mod in installed_command_modules:
-            try:
-                start_time = timeit.default_timer()
-                import_module('azure.cli.command_modules.' + mod).load_commands()
-                elapsed_time = timeit.default_timer() - start_time
-                logger.debug("Loaded module '%s' in %.3f seconds.", mod, elapsed_time)
-                cumulative_elapsed_time += elapsed_time
-            except Exception as ex:  # pylint: disable=broad-except
-                # Changing this error message requires updating CI script that checks for failed
-                # module loading.
-                logger.error("Error loading command module '%s'", mod)
-                telemetry.set_exception(exception=ex, fault_type='module-load-error-' + mod,
-                                        summary='Error loading module: {}'.format(mod))
-                logger.debug(traceback.format_exc())
+        installed_command_modules = _get_installed_command_modules()
+        logger.debug('Installed command modules %s', list(installed_command_modules))
+        cumulative_elapsed_time = _load_command_modules(installed_command_modules)
         logger.debug("Loaded all modules in %.3f seconds. "
                      "(note: there's always an overhead with the first module loaded)",
                      cumulative_elapsed_time)
+        try:
+            update_command_index(command_table, command_module_map,
+                                 index_version or _get_command_index_version(installed_command_modules))
+        except Exception:  # pylint: disable=broad-except
+            logger.debug("Unable to update the command index.")
+            logger.debug(traceback.format_exc())
     try:
         # We always load extensions even if the appropriate module has been loaded
         # as an extension could override the commands already loaded.
@@ -521,17 +585,23 @@ def cli_command(module_name, name, operation,
     command_table[name] = cmd
 
 
-def get_op_handler(operation):
-    """ Import and load the operation handler """
-    # Patch the unversioned sdk path to include the appropriate API version for the
-    # resource type in question.
+def get_versioned_operation(operation):
+    """ Patch the unversioned sdk path to include the appropriate API version for the
+    resource type in question. """
     from azure.cli.core._profile import CLOUD
-    import types
 
     for rt in ResourceType:
         if operation.startswith(rt.import_prefix):
             operation = operation.replace(rt.import_prefix,
                                           get_versioned_sdk_path(CLOUD.profile, rt))
+    return operation
+
+
+def get_op_handler(operation):
+    """ Import and load the operation handler """
+    import types
+
+    operation = get_versioned_operation(operation)
     try:
         mod_to_import, attr_path = operation.split('#')
         op = import_module(mod_to_import)
@@ -596,7 +666,7 @@ def create_command(module_name, name, operation,
             raise CLIError('Operation cancelled.')
 
         client = client_factory(kwargs) if client_factory else None
-        try:
+        with _handle_command_errors():
             op = get_op_handler(operation)
             try:
                 result = op(client, **kwargs) if client else op(**kwargs)
@@ -605,19 +675,37 @@ def create_command(module_name, name, operation,
 
                 # apply results transform if specified
                 if transform_result:
-                    return transform_result(result)
-
+                    result = transform_result(result)
                 # otherwise handle based on return type of results
-                if _is_poller(result):
+                elif _is_poller(result):
                     return LongRunningOperation('Starting {}'.format(name))(result)
-                elif _is_paged(result):
-                    return list(result)
+
+                if _is_paged(result) or isinstance(result, types.GeneratorType):
+                    # the later pages are only fetched as the items are consumed
+                    return _iterate_result(result)
                 return result
             except Exception as ex:  # pylint: disable=broad-except
                 if exception_handler:
                     exception_handler(ex)
                 else:
                     reraise(*sys.exc_info())
+
+    def _iterate_result(result):
+        # errors raised while fetching a later page are handled like the errors of the command
+        with _handle_command_errors():
+            try:
+                for item in result:
+                    yield item
+            except Exception as ex:  # pylint: disable=broad-except
+                if exception_handler:
+                    exception_handler(ex)
+                else:
+                    reraise(*sys.exc_info())
+
+    @contextmanager
+    def _handle_command_errors():
+        try:
+            yield
         except _load_validation_error_class() as validation_error:
             fault_type = name.replace(' ', '-') + '-validation-error'
             telemetry.set_exception(validation_error, fault_type=fault_type,
@@ -643,15 +731,33 @@ def create_command(module_name, name, operation,
     command_module_map[name] = module_name
     name = ' '.join(name.split())
 
+    def _get_manifest_entry():
+        # The argument manifest shipped with the module avoids importing the SDK operation
+        # just to introspect its signature and docstring
+        from azure.cli.core.commands._argument_manifest import get_manifest_entry
+        try:
+            return get_manifest_entry(module_name, name, get_versioned_operation(operation))
+        except Exception:  # pylint: disable=broad-except
+            logger.debug("Unable to load argument manifest entry for '%s'.", name)
+            return None
+
     def arguments_loader():
+        entry = _get_manifest_entry()
+        if entry:
+            from azure.cli.core.commands._argument_manifest import get_manifest_arguments
+            return get_manifest_arguments(entry)
         return extract_args_from_signature(get_op_handler(operation), no_wait_param=no_wait_param)
 
     def description_loader():
+        entry = _get_manifest_entry()
+        if entry:
+            return entry['summary']
         return extract_full_summary_from_signature(get_op_handler(operation))
 
     cmd = CliCommand(name, _execute_command, table_transformer=table_transformer,
                      arguments_loader=arguments_loader, description_loader=description_loader,
-                     formatter_class=formatter_class, deprecate_info=deprecate_info)
+                     formatter_class=formatter_class, deprecate_info=deprecate_info,
+                     operation=operation)
     if confirmation:
         cmd.add_argument(CONFIRM_PARAM_NAME, '--yes', '-y',
                          action='store_true',
@@ -0,0 +1,132 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import sys
+from codecs import open as codecs_open
+
+import azure.cli.core.azlogging as azlogging
+from azure.cli.core.commands._command_index import COMMAND_MODULES_PREFIX, get_command_module_name
+
+logger = azlogging.get_az_logger(__name__)
+
+ARGUMENT_MANIFEST_FILE_NAME = '_argument_manifest.json'
+
+# The introspected argument settings that are persisted in the manifest
+MANIFEST_ARGUMENT_SETTINGS = ('options_list', 'required', 'default', 'help', 'action')
+
+_loaded_manifests = {}
+
+
+def get_argument_manifest_path(command_module):
+    '''Return the path of the argument manifest shipped with the command module `command_module`
+    (e.g. 'vm') or None if the command module has not been imported.
+    '''
+    package = sys.modules.get(COMMAND_MODULES_PREFIX + command_module, None)
+    if package is None or not getattr(package, '__file__', None):
+        return None
+    return os.path.join(os.path.dirname(package.__file__), ARGUMENT_MANIFEST_FILE_NAME)
+
+
+def _load_argument_manifest(command_module):
+    if command_module not in _loaded_manifests:
+        manifest = {}
+        path = get_argument_manifest_path(command_module)
+        if path and os.path.isfile(path):
+            try:
+                with codecs_open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, IOError, ValueError):
+                logger.debug("Unable to read argument manifest '%s'.", path)
+        _loaded_manifests[command_module] = manifest
+    return _loaded_manifests[command_module]
+
+
+def get_manifest_entry(module_name, name, versioned_operation):
+    '''Return the manifest entry of command `name` registered from `module_name`.
+
+    The entry is only returned if it was generated for `versioned_operation`, the operation
+    path with the API version of the current profile applied. Otherwise None is returned and
+    the arguments have to be introspected from the operation.
+    '''
+    command_module = get_command_module_name(module_name)
+    if not command_module:
+        return None
+    entry = _load_argument_manifest(command_module).get(name, None)
+    if not entry or entry.get('operation') != versioned_operation:
+        return None
+    return entry
+
+
+def get_manifest_arguments(entry):
+    from azure.cli.core.commands import CliCommandArgument
+    return [(arg_name, CliCommandArgument(arg_name, **settings)) for arg_name, settings in entry['arguments']]
+
+
+def build_manifest_entry(versioned_operation, summary, arguments):
+    '''Build the manifest entry for a command from its introspected `arguments`.
+
+    Returns None if an argument setting can't be serialized.
+    '''
+    entry_arguments = []
+    for arg_name, argument in arguments:
+        settings = {key: argument.type.settings[key] for key in MANIFEST_ARGUMENT_SETTINGS
+                    if key in argument.type.settings}
+        settings['options_list'] = list(settings.get('options_list', []))
+        entry_arguments.append([arg_name, settings])
+    entry = {
+        'operation': versioned_operation,
+        'summary': summary,
+        'arguments': entry_arguments
+    }
+    try:
+        json.dumps(entry)
+    except (TypeError, ValueError):
+        return None
+    return entry
+
+
+def build_argument_manifests(command_table, command_module_map):
+    '''Introspect the operations of the commands in `command_table` and return a dict of
+    command module name -> argument manifest.
+    '''
+    from azure.cli.core.commands import get_op_handler, get_versioned_operation
+    from azure.cli.core.commands._introspection import extract_full_summary_from_signature
+    for module_name in command_module_map.values():
+        # ignore the manifests already on disk so the arguments are introspected
+        command_module = get_command_module_name(module_name)
+        if command_module:
+            _loaded_manifests[command_module] = {}
+
+    manifests = {}
+    for name, command in command_table.items():
+        command_module = get_command_module_name(command_module_map.get(name, None))
+        if not command_module or not getattr(command, 'operation', None) or not command.arguments_loader:
+            continue
+        try:
+            summary = extract_full_summary_from_signature(get_op_handler(command.operation))
+            entry = build_manifest_entry(get_versioned_operation(command.operation), summary,
+                                         list(command.arguments_loader()))
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to introspect the arguments of '%s'.", name)
+            continue
+        if entry is None:
+            logger.warning("Unable to serialize the arguments of '%s'.", name)
+            continue
+        manifests.setdefault(command_module, {})[name] = entry
+    return manifests
+
+
+def write_argument_manifests(manifests):
+    '''Write the argument manifests, a dict of command module name -> manifest.'''
+    for command_module, manifest in manifests.items():
+        path = get_argument_manifest_path(command_module)
+        if not path:
+            continue
+        with codecs_open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        _loaded_manifests.pop(command_module, None)
+        logger.debug("Wrote argument manifest for %d commands to '%s'.", len(manifest), path)
@@ -0,0 +1,85 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+
+import azure.cli.core.azlogging as azlogging
+from azure.cli.core._session import INDEX
+
+logger = azlogging.get_az_logger(__name__)
+
+COMMAND_MODULES_PREFIX = 'azure.cli.command_modules.'
+
+_INDEX_VERSION_KEY = 'version'
+_INDEX_COMMANDS_KEY = 'commands'
+
+
+def _get_path_stamp(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def get_index_version(installed_command_modules, extension_paths):
+    '''Compute the stamp the command index is valid for.
+
+    `installed_command_modules` is a dict of module name -> package directory and
+    `extension_paths` a dict of extension name -> extension directory. Installing,
+    upgrading or removing a module or an extension changes the stamp.
+    '''
+    from azure.cli.core import __version__ as core_version
+    return {
+        'core': core_version,
+        'modules': {name: _get_path_stamp(path) for name, path in installed_command_modules.items()},
+        'extensions': {name: _get_path_stamp(path) for name, path in extension_paths.items()}
+    }
+
+
+def get_command_module_name(module_name):
+    '''Return the command module name (e.g. 'vm') that owns the python module `module_name`
+    (e.g. 'azure.cli.command_modules.vm.commands') or None if it is not a command module.
+    '''
+    if module_name and module_name.startswith(COMMAND_MODULES_PREFIX):
+        return module_name[len(COMMAND_MODULES_PREFIX):].split('.')[0]
+    return None
+
+
+def get_indexed_command_modules(first_word, index_version):
+    '''Look up the command modules that own commands starting with `first_word`.
+
+    Returns None if the index is missing or stale for `index_version`.
+    '''
+    if not INDEX.get(_INDEX_COMMANDS_KEY) or INDEX.get(_INDEX_VERSION_KEY) != index_version:
+        logger.debug('Command index is missing or out of date.')
+        return None
+    modules = set()
+    for name, entry in INDEX[_INDEX_COMMANDS_KEY].items():
+        if name.split()[0] == first_word:
+            modules.add(entry['module'])
+    return sorted(modules)
+
+
+def update_command_index(command_table, command_module_map, index_version):
+    '''Persist the command name -> owning module map built from a full command table load.
+
+    Commands contributed by extensions are not indexed as extensions are always loaded.
+    '''
+    commands = {}
+    for name, command in command_table.items():
+        module = get_command_module_name(command_module_map.get(name, None))
+        if not module:
+            continue
+        commands[name] = {
+            'module': module,
+            'handler': getattr(command, 'operation', None),
+            'deprecate_info': command.deprecate_info
+        }
+    if INDEX.get(_INDEX_VERSION_KEY) == index_version and INDEX.get(_INDEX_COMMANDS_KEY) == commands:
+        return
+    INDEX.data[_INDEX_VERSION_KEY] = index_version
+    INDEX.data[_INDEX_COMMANDS_KEY] = commands
+    INDEX.save_with_retry()
+    logger.debug('Updated command index with %d commands.', len(commands))
@@ -0,0 +1,62 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+The connections shared by the management clients: msrest opens a new session, with a new
+HTTPAdapter, for every request and closes it afterwards. The sessions of the CLI send their
+requests through one pool of keep-alive connections per endpoint instead, so that a request
+reuses the TLS connection of the previous ones.
+"""
+
+import threading
+
+from requests.adapters import HTTPAdapter
+from msrest.configuration import default_session_configuration_callback
+
+# the endpoints kept in the pool, and the idle connections kept per endpoint
+POOL_ENDPOINTS = 10
+POOL_CONNECTIONS_PER_ENDPOINT = 32
+
+_pool_manager = None
+_pool_manager_lock = threading.Lock()
+
+
+def get_pool_manager():
+    ''' Returns the urllib3 PoolManager shared by the sessions of the process. '''
+    global _pool_manager  # pylint: disable=global-statement
+    with _pool_manager_lock:
+        if _pool_manager is None:
+            from requests.packages.urllib3.poolmanager import PoolManager  # pylint: disable=import-error
+            _pool_manager = PoolManager(num_pools=POOL_ENDPOINTS, maxsize=POOL_CONNECTIONS_PER_ENDPOINT)
+        return _pool_manager
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    ''' An HTTPAdapter which sends its requests through the shared pool of connections, and
+    leaves them open when its session is closed. '''
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_manager = get_pool_manager()
+        if pool_manager is None:
+            super(PooledHTTPAdapter, self).init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        else:
+            self._pool_connections = connections
+            self._pool_maxsize = maxsize
+            self._pool_block = block
+            self.poolmanager = pool_manager
+
+    def close(self):
+        if self.poolmanager is not get_pool_manager():
+            self.poolmanager.clear()
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+
+def configure_session(session, global_config, local_config, **kwargs):
+    ''' A session_configuration_callback of msrest which mounts a PooledHTTPAdapter, with the
+    retries msrest configured, in place of the adapters of `session`. '''
+    for prefix, adapter in list(session.adapters.items()):
+        session.mount(prefix, PooledHTTPAdapter(max_retries=adapter.max_retries))
+    return default_session_configuration_callback(session, global_config, local_config, **kwargs)
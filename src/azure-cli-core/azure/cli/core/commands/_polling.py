@@ -0,0 +1,114 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+The polling shared by the long running operations and the generic wait commands: the delay
+between two polls grows exponentially, with jitter, up to a ceiling, unless the service asks
+for a delay with Retry-After. The polls of many operations run on one thread.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+
+
+def get_retry_after(response):
+    ''' Returns the seconds to wait before the next request asked by the Retry-After header of
+    `response`, or None. '''
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        from email.utils import parsedate_tz, mktime_tz
+        date = parsedate_tz(value)
+        return max(mktime_tz(date) - time.time(), 0) if date else None
+
+
+class PollingBackoff(object):  # pylint: disable=too-few-public-methods
+    ''' The delays between the polls of an operation. They double from `initial` seconds up to
+    `ceiling` seconds, half of each delay being random so that concurrent pollers spread out, and
+    never go past the `deadline` timestamp. '''
+
+    def __init__(self, initial=1.0, ceiling=30.0, deadline=None):
+        self.initial = initial
+        self.ceiling = max(ceiling, initial)
+        self.deadline = deadline
+        self._attempts = 0
+
+    def next_delay(self, retry_after=None):
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            limit = min(self.ceiling, self.initial * 2 ** self._attempts)
+            if limit < self.ceiling:
+                self._attempts += 1
+            delay = limit / 2 + random.uniform(0, limit / 2)
+        if self.deadline is not None:
+            delay = min(delay, max(self.deadline - time.time(), 0))
+        return delay
+
+
+class PollingEngine(object):
+    ''' Runs the polls of many operations on one thread, each one when its delay expires. '''
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._polls = []
+        self._sequence = itertools.count()
+        self._thread = None
+
+    def submit(self, poll, backoff=None, delay=0):
+        ''' Calls `poll()` until the operation completes, and returns a Future of its result.
+
+        `poll` returns whether the operation completed, its result, and the seconds the service
+        asked to wait before the next poll or None. An exception raised by `poll` completes the
+        operation with the exception. '''
+        from concurrent.futures import Future
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self._schedule(time.time() + delay, poll, backoff or PollingBackoff(), future)
+        return future
+
+    def _schedule(self, due, poll, backoff, future):
+        with self._condition:
+            heapq.heappush(self._polls, (due, next(self._sequence), poll, backoff, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='PollingEngine')
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._polls or self._polls[0][0] > time.time():
+                    self._condition.wait(self._polls[0][0] - time.time() if self._polls else None)
+                _, _, poll, backoff, future = heapq.heappop(self._polls)
+            try:
+                done, result, retry_after = poll()
+            except Exception as ex:  # pylint: disable=broad-except
+                future.set_exception(ex)
+                continue
+            if done:
+                future.set_result(result)
+            else:
+                self._schedule(time.time() + backoff.next_delay(retry_after), poll, backoff, future)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_polling_engine():
+    global _engine  # pylint: disable=global-statement
+    with _engine_lock:
+        if _engine is None:
+            _engine = PollingEngine()
+        return _engine
@@ -219,6 +219,10 @@ def add_id_parameters(command_table):
                         parts = parse_resource_id(value)
                         for arg in [arg for arg in arguments.values() if arg.id_part]:
                             self.set_argument_value(namespace, arg, parts)
+                        # the id itself is kept to report the errors of each id
+                        ids = getattr(namespace, '_ids', None) or IterateValue()
+                        ids.append(value)
+                        setattr(namespace, '_ids', ids)
                 except Exception as ex:
                     raise ValueError(ex)
 
@@ -510,6 +514,7 @@ def cli_generic_wait_command(module_name, name, getter_op, factory=None, excepti
     def handler(args):
         from msrest.exceptions import ClientException
         import time
+        from azure.cli.core.commands._polling import PollingBackoff, get_polling_engine, get_retry_after
         try:
             client = factory() if factory else None
         except TypeError:
@@ -532,41 +537,59 @@ def cli_generic_wait_command(module_name, name, getter_op, factory=None, excepti
             raise CLIError(
                 "incorrect usage: --created | --updated | --deleted | --exists | --custom JMESPATH")
 
-        for _ in range(0, timeout, interval):
+        if interval < 1:
+            raise CLIError('incorrect usage: --interval must be at least 1 second')
+
+        deadline = time.time() + timeout
+        # the polls run on the polling thread, which sends the requests with the headers of this command
+        request_headers = APPLICATION.get_request_headers()
+
+        def _poll():
+            retry_after = None
             try:
-                instance = getter(client, **getterargs) if client else getter(**getterargs)
+                with APPLICATION.use_request_headers(request_headers):
+                    instance = getter(client, **getterargs) if client else getter(**getterargs)
                 if wait_for_exists:
-                    return
+                    return True, None, None
                 provisioning_state = get_provisioning_state(instance)
                 # until we have any needs to wait for 'Failed', let us bail out on this
                 if provisioning_state == 'Failed':
                     raise CLIError('The operation failed')
                 if wait_for_created or wait_for_updated:
                     if provisioning_state == 'Succeeded':
-                        return
+                        return True, None, None
                 if custom_condition and bool(verify_property(instance, custom_condition)):
-                    return
+                    return True, None, None
             except ClientException as ex:
                 if getattr(ex, 'status_code', None) == 404:
                     if wait_for_deleted:
-                        return
+                        return True, None, None
                     if not any([wait_for_created, wait_for_exists, custom_condition]):
                         _handle_exception(ex)
+                elif getattr(ex, 'status_code', None) == 429:
+                    # throttled, poll again once the service allows it
+                    retry_after = get_retry_after(getattr(ex, 'response', None))
+                    logger.debug('Throttled while waiting, retry after %s seconds', retry_after)
                 else:
                     _handle_exception(ex)
             except Exception as ex:  # pylint: disable=broad-except
                 _handle_exception(ex)
 
-            time.sleep(interval)
+            if time.time() >= deadline:
+                return True, CLIError('Wait operation timed-out after {} seconds'.format(timeout)), None
+            return False, None, retry_after
 
-        return CLIError('Wait operation timed-out after {} seconds'.format(timeout))
+        # polls start at a short interval which grows up to --interval, and the polls of the
+        # concurrent waits for --ids share one thread
+        backoff = PollingBackoff(initial=min(2, interval), ceiling=interval, deadline=deadline)
+        return get_polling_engine().submit(_poll, backoff).result()
 
     cmd = CliCommand(name, handler, arguments_loader=arguments_loader)
     group_name = 'Wait Condition'
     cmd.add_argument('timeout', '--timeout', default=3600, arg_group=group_name, type=int,
                      help='maximum wait in seconds')
     cmd.add_argument('interval', '--interval', default=30, arg_group=group_name, type=int,
-                     help='polling interval in seconds')
+                     help='maximum polling interval in seconds')
     cmd.add_argument('deleted', '--deleted', action='store_true', arg_group=group_name,
                      help='wait till deleted')
     cmd.add_argument('created', '--created', action='store_true', arg_group=group_name,
@@ -4,6 +4,9 @@
 # --------------------------------------------------------------------------------------------
 
 import os
+import threading
+from collections import OrderedDict
+
 from azure.cli.core import __version__ as core_version
 from azure.cli.core._profile import Profile, CLOUD
 import azure.cli.core._debug as _debug
@@ -18,6 +21,11 @@ logger = azlogging.get_az_logger(__name__)
 UA_AGENT = "AZURECLI/{}".format(core_version)
 ENV_ADDITIONAL_USER_AGENT = 'AZURE_HTTP_USER_AGENT'
 
+# the most recently used management clients, see _get_mgmt_service_client
+MAX_CACHED_CLIENTS = 32
+_client_cache = OrderedDict()
+_client_cache_lock = threading.Lock()
+
 
 def get_mgmt_service_client(client_or_resource_type, subscription_id=None, api_version=None,
                             **kwargs):
@@ -48,7 +56,7 @@ def configure_common_settings(client):
     except KeyError:
         pass
 
-    for header, value in APPLICATION.session['headers'].items():
+    for header, value in APPLICATION.get_request_headers().items():
         # We are working with the autorest team to expose the add_header functionality of the generated client to avoid
         # having to access private members
         client._client.add_header(header, value)  # pylint: disable=protected-access
@@ -56,7 +64,26 @@ def configure_common_settings(client):
     command_name_suffix = ';completer-request' if APPLICATION.session['completer_active'] else ''
     client._client.add_header('CommandName',  # pylint: disable=protected-access
                               "{}{}".format(APPLICATION.session['command'], command_name_suffix))
-    client.config.generate_client_request_id = 'x-ms-client-request-id' not in APPLICATION.session['headers']
+    client.config.generate_client_request_id = 'x-ms-client-request-id' not in APPLICATION.get_request_headers()
+
+    from azure.cli.core.commands._connection_pool import configure_session
+    client.config.session_configuration_callback = configure_session
+
+
+def _get_client_cache_key(client_type, account, client_kwargs):
+    # the headers configure_common_settings adds are part of the key, so that a client is only
+    # shared by the requests of one command
+    headers = dict(APPLICATION.get_request_headers())
+    headers['CommandName'] = APPLICATION.session['command']
+    key = (client_type, account['user']['name'], account['tenantId'], str(account['id']),
+           tuple(sorted(client_kwargs.items())), tuple(sorted(headers.items())),
+           APPLICATION.session['completer_active'], os.environ.get(ENV_ADDITIONAL_USER_AGENT),
+           _debug.should_disable_connection_verify(), os.environ.get(_debug.REQUESTS_CA_BUNDLE))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
 
 
 def _get_mgmt_service_client(client_type,
@@ -66,10 +93,15 @@ def _get_mgmt_service_client(client_type,
                              base_url_bound=True,
                              resource=CLOUD.endpoints.active_directory_resource_id,
                              **kwargs):
+    """
+    Returns a management client of `client_type` and its subscription id. The clients are cached
+    per type, account, subscription, arguments and request headers, so that the clients a command
+    creates for the same subscription are created once. All clients send their requests through a
+    shared pool of connections.
+    """
     logger.debug('Getting management service client client_type=%s', client_type.__name__)
     profile = Profile()
-    cred, subscription_id, _ = profile.get_login_credentials(subscription_id=subscription_id,
-                                                             resource=resource)
+    account = profile.get_subscription(subscription_id)
     client_kwargs = {}
     if base_url_bound:
         client_kwargs = {'base_url': CLOUD.endpoints.resource_manager}
@@ -78,6 +110,16 @@ def _get_mgmt_service_client(client_type,
     if kwargs:
         client_kwargs.update(kwargs)
 
+    key = _get_client_cache_key(client_type, account, dict(client_kwargs, resource=resource,
+                                                           subscription_bound=subscription_bound))
+    with _client_cache_lock:
+        cached = _client_cache.pop(key, None) if key else None
+        if cached:
+            _client_cache[key] = cached
+            return cached
+
+    cred, subscription_id, _ = profile.get_login_credentials(subscription_id=subscription_id,
+                                                             resource=resource)
     if subscription_bound:
         client = client_type(cred, subscription_id, **client_kwargs)
     else:
@@ -85,6 +127,11 @@ def _get_mgmt_service_client(client_type,
 
     configure_common_settings(client)
 
+    if key:
+        with _client_cache_lock:
+            _client_cache[key] = (client, subscription_id)
+            while len(_client_cache) > MAX_CACHED_CLIENTS:
+                _client_cache.popitem(last=False)
     return (client, subscription_id)
 
 
@@ -126,6 +173,6 @@ def _add_headers(request):
     request.headers['User-Agent'] = ' '.join(agents)
 
     try:
-        request.headers.update(APPLICATION.session['headers'])
+        request.headers.update(APPLICATION.get_request_headers())
     except KeyError:
         pass
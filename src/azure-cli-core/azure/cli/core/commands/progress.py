@@ -166,6 +166,18 @@ class DeterminateStandardOut(ProgressViewBase):
         self.out.flush()
 
 
+class NoOpView(ProgressViewBase):
+    """ discards the progress, e.g. of a part of an operation whose progress is reported as a whole """
+    def __init__(self, out=None):
+        super(NoOpView, self).__init__(out)
+
+    def write(self, args):
+        pass
+
+    def flush(self):
+        pass
+
+
 def get_progress_view(determinant=False, outstream=sys.stderr):
     """ gets your view """
     if determinant:
@@ -9,7 +9,5 @@ helps = {}
 
 
 def _load_help_file(delimiters):
-    import yaml
-    if delimiters in helps:
-        return yaml.load(helps[delimiters])
-    return None
+    from azure.cli.core._help_index import get_help_data
+    return get_help_data(delimiters)
@@ -40,6 +40,48 @@ def enable_autocomplete(parser):
                              default_completer=lambda _: ())
 
 
+class _PendingCommandParser(object):  # pylint: disable=too-few-public-methods
+    """The parser of a command which is created when it is first looked up."""
+
+    def __init__(self, parser, subparser, command_name, metadata):
+        self.parser = parser
+        self.subparser = subparser
+        self.command_name = command_name
+        self.metadata = metadata
+
+    def create(self):
+        return self.parser._create_command_parser(  # pylint: disable=protected-access
+            self.subparser, self.command_name, self.metadata)
+
+
+class _CommandParserMap(dict):
+    """The parsers of the groups and commands of a group by name, which creates the parser of a
+    command when it is looked up."""
+
+    def __getitem__(self, name):
+        parser = dict.__getitem__(self, name)
+        if isinstance(parser, _PendingCommandParser):
+            parser = parser.create()
+            dict.__setitem__(self, name, parser)
+        return parser
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+
+def _add_command_subparsers(parser, dest):
+    subparsers = parser.add_subparsers(dest=dest)
+    subparsers.required = True
+    subparsers._name_parser_map = subparsers.choices = _CommandParserMap()  # pylint: disable=protected-access
+    return subparsers
+
+
 class AzCliCommandParser(argparse.ArgumentParser):
     """ArgumentParser implementation specialized for the
     Azure CLI utility.
@@ -58,65 +100,68 @@ class AzCliCommandParser(argparse.ArgumentParser):
 
     def load_command_table(self, command_table):
         """Load a command table into our parser.
+
+        The parser of a command is only created when it is looked up, e.g. by the parser once the
+        command is selected, or to show help or completions.
         """
         # If we haven't already added a subparser, we
         # better do it.
         if not self.subparsers:
-            sp = self.add_subparsers(dest='_command_package')
-            sp.required = True
-            self.subparsers = {(): sp}
+            self.subparsers = {(): _add_command_subparsers(self, '_command_package')}
 
         for command_name, metadata in command_table.items():
             subparser = self._get_subparser(command_name.split())
             command_verb = command_name.split()[-1]
-            # To work around http://bugs.python.org/issue9253, we artificially add any new
-            # parsers we add to the "choices" section of the subparser.
-            subparser.choices[command_verb] = command_verb
-
-            # inject command_module designer's help formatter -- default is HelpFormatter
-            fc = metadata.formatter_class or argparse.HelpFormatter
-
-            command_parser = subparser.add_parser(command_verb,
-                                                  description=metadata.description,
-                                                  parents=self.parents,
-                                                  conflict_handler='error',
-                                                  help_file=metadata.help,
-                                                  formatter_class=fc,
-                                                  _command_source=metadata.command_source)
-
-            argument_validators = []
-            argument_groups = {}
-            for arg in metadata.arguments.values():
-                if arg.validator:
-                    argument_validators.append(arg.validator)
-                if arg.arg_group:
-                    try:
-                        group = argument_groups[arg.arg_group]
-                    except KeyError:
-                        # group not found so create
-                        group_name = '{} Arguments'.format(arg.arg_group)
-                        group = command_parser.add_argument_group(
-                            arg.arg_group, group_name)
-                        argument_groups[arg.arg_group] = group
-                    param = group.add_argument(
+            # Adding the verb to the choices also works around http://bugs.python.org/issue9253
+            subparser.choices[command_verb] = _PendingCommandParser(self, subparser, command_name, metadata)
+
+    def _create_command_parser(self, subparser, command_name, metadata):
+        command_verb = command_name.split()[-1]
+        # inject command_module designer's help formatter -- default is HelpFormatter
+        fc = metadata.formatter_class or argparse.HelpFormatter
+
+        command_parser = subparser.add_parser(command_verb,
+                                              description=metadata.description,
+                                              parents=self.parents,
+                                              conflict_handler='error',
+                                              help_file=metadata.help,
+                                              formatter_class=fc,
+                                              _command_source=metadata.command_source)
+
+        argument_validators = []
+        argument_groups = {}
+        for arg in metadata.arguments.values():
+            if arg.validator:
+                argument_validators.append(arg.validator)
+            if arg.arg_group:
+                try:
+                    group = argument_groups[arg.arg_group]
+                except KeyError:
+                    # group not found so create
+                    group_name = '{} Arguments'.format(arg.arg_group)
+                    group = command_parser.add_argument_group(
+                        arg.arg_group, group_name)
+                    argument_groups[arg.arg_group] = group
+                param = group.add_argument(
+                    *arg.options_list, **arg.options)
+            else:
+                try:
+                    param = command_parser.add_argument(
                         *arg.options_list, **arg.options)
-                else:
-                    try:
-                        param = command_parser.add_argument(
-                            *arg.options_list, **arg.options)
-                    except argparse.ArgumentError:
-                        dest = arg.options['dest']
-                        if dest in ['no_wait', 'raw']:
-                            pass
-                        else:
-                            raise
-                param.completer = arg.completer
-
-            command_parser.set_defaults(
-                func=metadata,
-                command=command_name,
-                _validators=argument_validators,
-                _parser=command_parser)
+                except argparse.ArgumentError:
+                    dest = arg.options['dest']
+                    if dest in ['no_wait', 'raw']:
+                        pass
+                    else:
+                        raise
+            param.completer = arg.completer
+
+        command_parser.set_defaults(
+            func=metadata,
+            command=command_name,
+            _validators=argument_validators,
+            _parser=command_parser)
+        return command_parser
 
     def _get_subparser(self, path):
         """For each part of the path, walk down the tree of
@@ -139,8 +184,7 @@ class AzCliCommandParser(argparse.ArgumentParser):
                 # Due to http://bugs.python.org/issue9253, we have to give the subparser
                 # a destination and set it to required in order to get a
                 # meaningful error
-                parent_subparser = new_parser.add_subparsers(dest='subcommand')
-                parent_subparser.required = True
+                parent_subparser = _add_command_subparsers(new_parser, 'subcommand')
                 self.subparsers[tuple(path[0:length])] = parent_subparser
         return parent_subparser
 
@@ -3,11 +3,16 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import logging
 import unittest
 
 import os
 import tempfile
 
+import mock
+from six import StringIO
+
+from azure.cli.core import application
 from azure.cli.core.application import Application, Configuration, IterateAction
 from azure.cli.core.commands import CliCommand
 from azure.cli.core.util import CLIError
@@ -74,6 +79,68 @@ class TestApplication(unittest.TestCase):
 
         app.raise_event('other_handler_called', args='secret sauce')
 
+    def test_application_event_data_formatted_lazily(self):
+        class _Payload(object):
+            formatted = 0
+
+            def __repr__(self):
+                _Payload.formatted += 1
+                return 'payload'
+
+        app = Application()
+        app.register('timed_event', lambda **kwargs: None)
+
+        # the data is not formatted while no handler emits debug records
+        test_logger = logging.getLogger('test_application_event_data')
+        test_logger.propagate = False
+        test_logger.setLevel(logging.DEBUG)
+        test_logger.addHandler(logging.NullHandler())
+        with mock.patch.object(application, 'logger', test_logger):
+            app.raise_event('timed_event', payload=_Payload())
+            app.raise_event('timed_event', payload=_Payload())
+            self.assertEqual(_Payload.formatted, 0)
+
+            stream = StringIO()
+            test_logger.addHandler(logging.StreamHandler(stream))
+            app.raise_event('timed_event', payload=_Payload())
+            self.assertEqual(_Payload.formatted, 1)
+            self.assertIn("'payload': payload", stream.getvalue())
+
+        timings = [t for t in app.get_event_timings() if t[0] == 'timed_event']
+        self.assertEqual(len(timings), 1)
+        self.assertEqual(timings[0][2], 3)
+
+    def test_paged_result_streamed(self):
+        fetched = []
+
+        def handler(args):
+            for i in range(3):
+                fetched.append(i)
+                yield {'id': '/subscriptions/sub/resourceGroups/rg{}/providers/x/y/z'.format(i)}
+
+        def _execute(argv, stream_result):
+            config = Configuration()
+            config.get_command_table = lambda *_: {'test': CliCommand('test', handler)}
+            application = Application(config)
+            return application.execute(argv, stream_result=stream_result)
+
+        result = _execute(['test'], stream_result=True)
+        self.assertTrue(result.is_streamed)
+        self.assertEqual(fetched, [])
+        self.assertEqual(next(result.result)['resourceGroup'], 'rg0')
+        self.assertEqual(fetched, [0])
+        self.assertEqual(len(list(result.result)), 2)
+
+        # the result is collected when it isn't streamed, or can't be written out item by item
+        for argv, stream_result in [(['test'], False),
+                                    (['test', '--query', '[].id'], True),
+                                    (['test', '-o', 'table'], True)]:
+            del fetched[:]
+            result = _execute(argv, stream_result)
+            self.assertFalse(result.is_streamed)
+            self.assertEqual(len(result.result), 3)
+            self.assertEqual(fetched, [0, 1, 2])
+
     def test_list_value_parameter(self):
         hellos = []
 
@@ -97,6 +164,44 @@ class TestApplication(unittest.TestCase):
         self.assertEqual(hellos[1]['hello'], 'sir')
         self.assertEqual(hellos[1]['something'], 'else')
 
+    def test_list_value_parameter_executed_concurrently(self):
+        import threading
+        import time
+        import mock
+        lock = threading.Lock()
+        running = [0, 0]
+        request_ids = {}
+
+        def handler(args):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            request_ids[args['hello']] = application.get_request_headers()['x-ms-client-request-id']
+            if args['hello'] == 'fail':
+                raise CLIError('failed')
+            return args['hello']
+
+        command = CliCommand('test command', handler)
+        command.add_argument('hello', '--hello', nargs='+', action=IterateAction)
+        config = Configuration()
+        config.get_command_table = lambda argv: {'test command': command}
+        application = Application(config)
+
+        with mock.patch.dict('os.environ', {'AZURE_CORE_MAX_CONCURRENT_IDS': '3'}), \
+                mock.patch('azure.cli.core.commands.progress.get_progress_view', autospec=True):
+            result = application.execute('test command --hello a b c d'.split())
+            self.assertEqual(result.result, ['a', 'b', 'c', 'd'])
+            self.assertTrue(1 < running[1] <= 3)
+            self.assertEqual(len(set(request_ids.values())), 4)
+            self.assertNotIn(application.session['headers']['x-ms-client-request-id'], request_ids.values())
+
+            with self.assertRaises(CLIError) as err:
+                application.execute('test command --hello a fail c'.split())
+            self.assertEqual(str(err.exception), '1 of 3 operations failed.')
+
     def test_case_insensitive_command_path(self):
         import argparse
 
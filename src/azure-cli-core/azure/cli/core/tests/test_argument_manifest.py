@@ -0,0 +1,86 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+import mock
+
+import azure.cli.core.commands._argument_manifest as argument_manifest
+from azure.cli.core.commands import create_command, CliCommandArgument
+from azure.cli.core.commands._argument_manifest import build_argument_manifests, build_manifest_entry
+
+TEST_MODULE_NAME = 'azure.cli.command_modules.testmanifest.commands'
+
+
+def sample_vm_get(resource_group_name, vm_name, expand=None, force=False):
+    """
+    The operation to get a virtual machine.
+
+    :param resource_group_name: The name of the resource group.
+    :type resource_group_name: str
+    :param vm_name: The name of the virtual machine.
+    :type vm_name: str
+    """
+    pass
+
+
+class TestArgumentManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.operation = '{}#sample_vm_get'.format(__name__)
+
+    def tearDown(self):
+        argument_manifest._loaded_manifests.pop('testmanifest', None)
+
+    def _create_command(self):
+        return create_command(TEST_MODULE_NAME, 'test manifest vm-get', self.operation, None, None, None)
+
+    def test_build_manifest_entry(self):
+        command = self._create_command()
+        argument_manifest._loaded_manifests['testmanifest'] = {}
+        manifests = build_argument_manifests({'test manifest vm-get': command},
+                                             {'test manifest vm-get': TEST_MODULE_NAME})
+        entry = manifests['testmanifest']['test manifest vm-get']
+        self.assertEqual(entry['operation'], self.operation)
+        self.assertEqual(entry['summary'], 'The operation to get a virtual machine.')
+        arguments = dict(entry['arguments'])
+        self.assertEqual([name for name, _ in entry['arguments']],
+                         ['resource_group_name', 'vm_name', 'expand', 'force'])
+        self.assertEqual(arguments['vm_name'], {'options_list': ['--vm-name'], 'required': True, 'default': None,
+                                                'help': 'The name of the virtual machine.', 'action': None})
+        self.assertEqual(arguments['force']['action'], 'store_true')
+
+    def test_build_manifest_entry_not_serializable(self):
+        arguments = [('value', CliCommandArgument('value', default=object()))]
+        self.assertIsNone(build_manifest_entry(self.operation, '', arguments))
+
+    def test_arguments_loaded_from_manifest(self):
+        command = self._create_command()
+        entry = build_manifest_entry(self.operation, 'From the manifest.',
+                                     [('vm_name', CliCommandArgument('vm_name', options_list=['--vm-name'],
+                                                                     required=True, help='VM name.'))])
+        argument_manifest._loaded_manifests['testmanifest'] = {'test manifest vm-get': entry}
+
+        with mock.patch('azure.cli.core.commands.get_op_handler', autospec=True) as get_op_handler:
+            arguments = dict(command.arguments_loader())
+            self.assertEqual(command.description(), 'From the manifest.')
+            get_op_handler.assert_not_called()
+        self.assertEqual(list(arguments), ['vm_name'])
+        self.assertEqual(arguments['vm_name'].options_list, ['--vm-name'])
+        self.assertEqual(arguments['vm_name'].type.settings['help'], 'VM name.')
+        self.assertTrue(arguments['vm_name'].type.settings['required'])
+
+    def test_stale_manifest_entry_ignored(self):
+        command = self._create_command()
+        entry = build_manifest_entry('{}#other_operation'.format(__name__), 'Stale.', [])
+        argument_manifest._loaded_manifests['testmanifest'] = {'test manifest vm-get': entry}
+
+        arguments = dict(command.arguments_loader())
+        self.assertEqual(sorted(arguments), ['expand', 'force', 'resource_group_name', 'vm_name'])
+        self.assertEqual(command.description(), 'The operation to get a virtual machine.')
+
+
+if __name__ == '__main__':
+    unittest.main()
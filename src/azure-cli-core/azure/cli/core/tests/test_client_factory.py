@@ -0,0 +1,119 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+
+import mock
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler  # pylint: disable=import-error
+from six.moves.socketserver import ThreadingMixIn  # pylint: disable=import-error
+
+from azure.cli.core.application import APPLICATION
+from azure.cli.core.commands import client_factory
+from azure.cli.core.commands.client_factory import _get_mgmt_service_client
+
+
+# pylint: disable=protected-access
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = []
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        _KeepAliveHandler.connections.append(self.client_address)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class _KeepAliveServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class TestClientFactory(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(client_factory, '_client_cache', client_factory.OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(client_factory, 'Profile', autospec=True)
+        profile = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        profile.get_subscription.side_effect = lambda subscription_id=None: {
+            'id': subscription_id or 'sub1', 'tenantId': 'tenant1', 'user': {'name': 'user1'}}
+        profile.get_login_credentials.side_effect = \
+            lambda subscription_id=None, resource=None: (mock.MagicMock(), subscription_id or 'sub1', 'tenant1')
+        patcher = mock.patch.dict(APPLICATION.session, {'headers': {'x-ms-client-request-id': 'request1'},
+                                                        'command': 'vm list'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clients_are_cached_per_command(self):
+        client_type = mock.MagicMock(side_effect=lambda *args, **kwargs: mock.MagicMock())
+        client_type.__name__ = 'FakeClient'
+
+        client, subscription_id = _get_mgmt_service_client(client_type)
+        self.assertEqual(subscription_id, 'sub1')
+        self.assertIs(_get_mgmt_service_client(client_type)[0], client)
+        self.assertEqual(client_type.call_count, 1)
+        client._client.add_header.assert_any_call('x-ms-client-request-id', 'request1')
+
+        # another subscription or api version gets its own client
+        self.assertIsNot(_get_mgmt_service_client(client_type, subscription_id='sub2')[0], client)
+        self.assertIsNot(_get_mgmt_service_client(client_type, api_version='2017-03-30')[0], client)
+        self.assertEqual(client_type.call_count, 3)
+
+        # so does the next command, or a value of --ids executed concurrently
+        APPLICATION.session['headers'] = {'x-ms-client-request-id': 'request2'}
+        self.assertIsNot(_get_mgmt_service_client(client_type)[0], client)
+        results = []
+        with mock.patch.object(APPLICATION, 'get_request_headers', return_value={'x-ms-client-request-id': 'r3'}):
+            worker = threading.Thread(target=lambda: results.append(_get_mgmt_service_client(client_type)[0]))
+            worker.start()
+            worker.join()
+        self.assertIsNot(results[0], client)
+        results[0]._client.add_header.assert_any_call('x-ms-client-request-id', 'r3')
+        self.assertEqual(client_type.call_count, 5)
+
+        with mock.patch.object(client_factory, 'MAX_CACHED_CLIENTS', 2):
+            _get_mgmt_service_client(client_type, subscription_id='sub3')
+        self.assertEqual(len(client_factory._client_cache), 2)
+
+    def test_clients_share_connections(self):
+        from msrest.service_client import ServiceClient
+        from msrest import Configuration
+        server = _KeepAliveServer(('127.0.0.1', 0), _KeepAliveHandler)
+        self.addCleanup(server.server_close)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.addCleanup(server.shutdown)
+        _KeepAliveHandler.connections = []
+
+        base_url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+        for _ in range(2):
+            client = mock.MagicMock()
+            client._client = ServiceClient(None, Configuration(base_url))
+            client.config = client._client.config
+            client_factory.configure_common_settings(client)
+            for _ in range(2):
+                response = client._client.send(client._client.get('/'))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), {})
+        self.assertEqual(len(_KeepAliveHandler.connections), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
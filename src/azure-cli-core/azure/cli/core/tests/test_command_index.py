@@ -0,0 +1,101 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core._session import INDEX
+from azure.cli.core.commands import CliCommand
+from azure.cli.core.commands._command_index import (get_command_module_name, get_indexed_command_modules,
+                                                    update_command_index)
+
+
+class TestCommandIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        INDEX.load(os.path.join(self.temp_dir, 'commandIndex.json'))
+        self.version = {'core': '2.0.0', 'modules': {'resource': 1.0, 'vm': 2.0}, 'extensions': {}}
+        self.command_table = {
+            'group create': CliCommand('group create', None, operation='mod#create_group'),
+            'vm list': CliCommand('vm list', None, deprecate_info='vm show'),
+            'vm image list': CliCommand('vm image list', None),
+            'myext hello': CliCommand('myext hello', None)
+        }
+        self.command_module_map = {
+            'group create': 'azure.cli.command_modules.resource.commands',
+            'vm list': 'azure.cli.command_modules.vm.commands',
+            'vm image list': 'azure.cli.command_modules.vm.commands',
+            'myext hello': 'azext_myext.commands'
+        }
+
+    def tearDown(self):
+        INDEX.filename = None
+        INDEX.data = {}
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_command_module_name(self):
+        self.assertEqual(get_command_module_name('azure.cli.command_modules.vm.custom'), 'vm')
+        self.assertEqual(get_command_module_name('azure.cli.command_modules.vm'), 'vm')
+        self.assertIsNone(get_command_module_name('azext_myext.commands'))
+        self.assertIsNone(get_command_module_name(None))
+
+    def test_command_index_lookup(self):
+        self.assertIsNone(get_indexed_command_modules('group', self.version))
+
+        update_command_index(self.command_table, self.command_module_map, self.version)
+
+        self.assertEqual(get_indexed_command_modules('group', self.version), ['resource'])
+        self.assertEqual(get_indexed_command_modules('vm', self.version), ['vm'])
+        self.assertEqual(get_indexed_command_modules('typo', self.version), [])
+        # extension commands are not indexed as extensions are always loaded
+        self.assertEqual(get_indexed_command_modules('myext', self.version), [])
+        entry = INDEX['commands']['vm list']
+        self.assertEqual(entry['deprecate_info'], 'vm show')
+        self.assertEqual(INDEX['commands']['group create']['handler'], 'mod#create_group')
+
+    def test_command_index_persisted(self):
+        update_command_index(self.command_table, self.command_module_map, self.version)
+        INDEX.load(INDEX.filename)
+        self.assertEqual(get_indexed_command_modules('group', self.version), ['resource'])
+
+    def test_command_index_invalidated_by_version(self):
+        update_command_index(self.command_table, self.command_module_map, self.version)
+        upgraded = {'core': '2.0.0', 'modules': {'resource': 1.0, 'vm': 3.0}, 'extensions': {}}
+        self.assertIsNone(get_indexed_command_modules('group', upgraded))
+        with_extension = {'core': '2.0.0', 'modules': {'resource': 1.0, 'vm': 2.0}, 'extensions': {'ext': 1.0}}
+        self.assertIsNone(get_indexed_command_modules('group', with_extension))
+
+    def test_command_index_not_rewritten_when_unchanged(self):
+        update_command_index(self.command_table, self.command_module_map, self.version)
+        with mock.patch.object(INDEX, 'save_with_retry') as save_mock:
+            update_command_index(self.command_table, self.command_module_map, self.version)
+            save_mock.assert_not_called()
+
+    @mock.patch('azure.cli.core.commands._get_command_table_from_extensions', autospec=True)
+    @mock.patch('azure.cli.core.commands._load_command_modules', autospec=True)
+    @mock.patch('azure.cli.core.commands._command_index.get_indexed_command_modules', autospec=True)
+    def test_get_command_table_loads_owning_module(self, indexed_mock, load_mock, _):
+        from azure.cli.core.commands import get_command_table
+        indexed_mock.return_value = ['resource']
+        get_command_table('group')
+        load_mock.assert_called_once_with(['resource'])
+
+        load_mock.reset_mock()
+        indexed_mock.return_value = None
+        with mock.patch('azure.cli.core.commands._command_index.update_command_index', autospec=True) as update:
+            get_command_table('grop')
+            self.assertTrue(update.called)
+        loaded_modules = load_mock.call_args[0][0]
+        self.assertIn('resource', loaded_modules)
+        self.assertIn('vm', loaded_modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
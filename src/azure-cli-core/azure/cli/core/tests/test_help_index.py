@@ -0,0 +1,89 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+import mock
+
+import azure.cli.core._help_index as help_index
+from azure.cli.core._help_index import build_help_indexes, write_help_indexes, get_help_data
+from azure.cli.core.help_files import helps
+
+TEST_MODULE_NAME = 'azure.cli.command_modules.testhelpindex'
+
+TEST_GROUP_HELP = """
+    type: group
+    short-summary: Manage test resources.
+"""
+
+TEST_COMMAND_HELP = """
+    type: command
+    short-summary: Show a test resource.
+    examples:
+        - name: Show a test resource.
+          text: az testhelpindex show -n MyResource
+          min_profile: 2017-03-09
+"""
+
+
+def _get_test_module():
+    module = types.ModuleType(TEST_MODULE_NAME)
+    module.__file__ = os.path.join(tempfile.mkdtemp(), '__init__.py')
+    return module
+
+
+def _import_test_module(name, module):
+    # importing the command module registers its help
+    assert name == TEST_MODULE_NAME
+    sys.modules[TEST_MODULE_NAME] = module
+    helps['testhelpindex'] = TEST_GROUP_HELP
+    helps['testhelpindex show'] = TEST_COMMAND_HELP
+    return module
+
+
+class TestHelpIndex(unittest.TestCase):
+
+    @mock.patch.object(help_index, '_loaded_modules', new_callable=set)
+    @mock.patch.object(help_index, '_loaded_entries', new_callable=dict)
+    @mock.patch.dict(helps)
+    @mock.patch.dict(sys.modules)
+    @mock.patch.object(help_index, 'import_module', autospec=True)
+    def test_help_loaded_from_index(self, import_module, *_):
+        module = _get_test_module()
+        import_module.side_effect = lambda name: _import_test_module(name, module)
+
+        indexes = build_help_indexes(['testhelpindex'])
+        self.assertEqual(sorted(indexes['testhelpindex']), ['testhelpindex', 'testhelpindex show'])
+        write_help_indexes(indexes)
+        self.assertTrue(os.path.isfile(os.path.join(os.path.dirname(module.__file__), '_help_index.json')))
+
+        with mock.patch.object(help_index, 'parse_help_text', autospec=True) as parse_help_text:
+            self.assertEqual(get_help_data('testhelpindex'), {'type': 'group',
+                                                              'short-summary': 'Manage test resources.'})
+            data = get_help_data('testhelpindex show')
+            parse_help_text.assert_not_called()
+        self.assertEqual(data['examples'][0]['min_profile'], '2017-03-09')
+        self.assertIsNone(get_help_data('testhelpindex list'))
+
+    @mock.patch.object(help_index, '_loaded_modules', new_callable=set)
+    @mock.patch.object(help_index, '_loaded_entries', new_callable=dict)
+    @mock.patch.dict(helps)
+    @mock.patch.dict(sys.modules)
+    @mock.patch.object(help_index, 'import_module', autospec=True)
+    def test_changed_help_parsed_again(self, import_module, *_):
+        module = _get_test_module()
+        import_module.side_effect = lambda name: _import_test_module(name, module)
+
+        write_help_indexes(build_help_indexes(['testhelpindex']))
+        helps['testhelpindex'] = 'short-summary: Manage other test resources.'
+        self.assertEqual(get_help_data('testhelpindex'), {'short-summary': 'Manage other test resources.'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,8 @@ import unittest
 from collections import OrderedDict
 from six import StringIO
 
-from azure.cli.core._output import OutputProducer, format_json, format_table, format_tsv, CommandResultItem
+from azure.cli.core._output import (OutputProducer, format_json, format_jsonl, format_table, format_tsv,
+                                    CommandResultItem)
 import azure.cli.core.util as util
 
 
@@ -176,6 +177,42 @@ qwerty  0b1f6472qwerty  True
         result = format_tsv(CommandResultItem([obj1, obj2]))
         self.assertEqual(result, '1\t2\n3\t4\n')
 
+    # Streamed output tests
+    def test_out_json_streamed_matches_json(self):
+        items = [{'name': 'a', 'tags': {'x': [1, 2]}}, OrderedDict([('name', 'b')]), 'c']
+        for result in (items, items[:1], []):
+            output_producer = OutputProducer(formatter=format_json, file=self.io)
+            output_producer.out(CommandResultItem(iter(result), is_streamed=True))
+            self.assertEqual(self.io.getvalue(), format_json(CommandResultItem(result)))
+            self.io.seek(0)
+            self.io.truncate()
+
+    def test_out_streamed_consumes_items_as_written(self):
+        written = []
+
+        def _items():
+            for i in range(3):
+                # everything before this item has already been written out
+                written.append(self.io.getvalue())
+                yield {'id': i}
+
+        output_producer = OutputProducer(formatter=format_jsonl, file=self.io)
+        output_producer.out(CommandResultItem(_items(), is_streamed=True))
+        self.assertEqual(written, ['', '{"id":0}\n', '{"id":0}\n{"id":1}\n'])
+        self.assertEqual(self.io.getvalue(), '{"id":0}\n{"id":1}\n{"id":2}\n')
+
+    def test_output_format_jsonl(self):
+        self.assertEqual(format_jsonl(CommandResultItem([{'b': 1, 'a': 'x'}, [1, 2]])),
+                         '{"a":"x","b":1}\n[1,2]\n')
+        self.assertEqual(format_jsonl(CommandResultItem({'a': True})), '{"a":true}\n')
+
+    def test_output_format_tsv_streamed(self):
+        obj = OrderedDict()
+        obj['B'] = 1
+        obj['A'] = 2
+        result = format_tsv(CommandResultItem(iter([obj, {'B': 3, 'A': 4}]), is_streamed=True))
+        self.assertEqual(list(result), ['1\t2\n', '4\t3\n'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -105,6 +105,40 @@ class TestParser(unittest.TestCase):
         args = parser.parse_args('test command --opt sNake_CASE'.split())
         self.assertEqual(args.opt, 'snake_case')
 
+    def test_command_parsers_are_created_when_used(self):
+        from azure.cli.core.parser import _PendingCommandParser
+
+        def test_handler():
+            pass
+
+        commands = {name: CliCommand(name, test_handler) for name in
+                    ['group show', 'group list', 'group sub show', 'other show']}
+        for command in commands.values():
+            command.add_argument('name', '--name')
+
+        parser = AzCliCommandParser(prog='az')
+        parser.load_command_table(commands)
+        group = parser.subparsers[('group',)]
+        self.assertIsInstance(dict.__getitem__(group.choices, 'show'), _PendingCommandParser)
+
+        args = parser.parse_args('group show --name n1'.split())
+        self.assertIs(args.func, commands['group show'])
+        self.assertEqual(args.name, 'n1')
+        self.assertNotIsInstance(dict.__getitem__(group.choices, 'show'), _PendingCommandParser)
+        self.assertIsInstance(dict.__getitem__(group.choices, 'list'), _PendingCommandParser)
+        self.assertIsInstance(dict.__getitem__(parser.subparsers[('other',)].choices, 'show'),
+                              _PendingCommandParser)
+
+        # listing the commands of a group, e.g. for help, creates their parsers
+        self.assertEqual(sorted(p.prog for p in group.choices.values()),
+                         ['az group list', 'az group show', 'az group sub'])
+
+        # loading the table again replaces the parsers with the new arguments
+        commands['group show'].add_argument('tags', '--tags')
+        parser.load_command_table({'group show': commands['group show']})
+        args = parser.parse_args('group show --tags t1'.split())
+        self.assertEqual(args.tags, 't1')
+
 
 class VerifyError(object):  # pylint: disable=too-few-public-methods
 
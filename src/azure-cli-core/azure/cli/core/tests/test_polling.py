@@ -0,0 +1,95 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import time
+import unittest
+
+import mock
+
+from azure.cli.core.application import APPLICATION
+from azure.cli.core.commands import command_table
+from azure.cli.core.commands._polling import PollingBackoff, PollingEngine, get_retry_after
+from azure.cli.core.commands.arm import cli_generic_wait_command
+from azure.cli.core.util import CLIError
+
+
+def sample_get(resource_group_name, name):  # pylint: disable=unused-argument
+    sample_get.requests.append((threading.current_thread().name, APPLICATION.get_request_headers()))
+    return mock.MagicMock(provisioning_state='Succeeded')
+
+
+class TestPolling(unittest.TestCase):
+
+    def test_backoff_grows_with_jitter_up_to_ceiling(self):
+        backoff = PollingBackoff(initial=1, ceiling=8)
+        delays = [backoff.next_delay() for _ in range(6)]
+        for delay, limit in zip(delays, [1, 2, 4, 8, 8, 8]):
+            self.assertTrue(limit / 2.0 <= delay <= limit, (delay, limit))
+        self.assertEqual(backoff.next_delay(retry_after=20), 20)
+
+    def test_backoff_stops_at_deadline(self):
+        backoff = PollingBackoff(initial=10, ceiling=10, deadline=time.time() + 1)
+        self.assertTrue(backoff.next_delay() <= 1)
+        self.assertTrue(backoff.next_delay(retry_after=30) <= 1)
+
+    def test_get_retry_after(self):
+        self.assertEqual(get_retry_after(mock.Mock(headers={'Retry-After': '15'})), 15)
+        self.assertIsNone(get_retry_after(mock.Mock(headers={})))
+        self.assertIsNone(get_retry_after(None))
+        date = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 60))
+        self.assertTrue(50 < get_retry_after(mock.Mock(headers={'Retry-After': date})) <= 60)
+
+    def test_engine_polls_many_operations_on_one_thread(self):
+        engine = PollingEngine()
+        threads = set()
+
+        def _poller(index):
+            polls = [0]
+
+            def _poll():
+                threads.add(threading.current_thread().name)
+                polls[0] += 1
+                if index == 3:
+                    raise ValueError('poll failed')
+                return polls[0] == index + 1, index, None
+            return _poll
+
+        futures = [engine.submit(_poller(i), PollingBackoff(initial=0.01, ceiling=0.02)) for i in range(5)]
+        self.assertEqual([f.result(timeout=10) for i, f in enumerate(futures) if i != 3], [0, 1, 2, 4])
+        with self.assertRaises(ValueError):
+            futures[3].result(timeout=10)
+        self.assertEqual(threads, {'PollingEngine'})
+
+    def test_engine_honors_retry_after(self):
+        engine = PollingEngine()
+        polled = []
+
+        def _poll():
+            polled.append(time.time())
+            return len(polled) == 2, None, 0.2 if len(polled) == 1 else None
+
+        engine.submit(_poll, PollingBackoff(initial=0.01, ceiling=0.01)).result(timeout=10)
+        self.assertTrue(polled[1] - polled[0] >= 0.2)
+
+    def test_wait_polls_with_the_headers_of_the_command(self):
+        cli_generic_wait_command(__name__, 'test polling wait', '{}#sample_get'.format(__name__))
+        self.addCleanup(command_table.pop, 'test polling wait')
+        handler = command_table['test polling wait'].handler
+        args = {'resource_group_name': 'rg1', 'name': 'name1', 'timeout': 10, 'interval': 1, 'created': True,
+                'deleted': False, 'updated': False, 'exists': False, 'custom': None}
+
+        sample_get.requests = []
+        headers = {'x-ms-client-request-id': 'request1'}
+        with APPLICATION.use_request_headers(headers):
+            handler(dict(args))
+        self.assertEqual(sample_get.requests, [('PollingEngine', headers)])
+
+        with self.assertRaises(CLIError):
+            handler(dict(args, interval=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -786,6 +786,54 @@ class Test_Profile(unittest.TestCase):
         self.assertEqual([], subs)
         mock_logger.warning.assert_called_once_with(mock.ANY, mock.ANY, mock.ANY)
 
+    @mock.patch('adal.AuthenticationContext', autospec=True)
+    @mock.patch('azure.cli.core._profile.logger', autospec=True)
+    def test_find_subscriptions_in_many_tenants_concurrently(self, mock_logger, mock_auth_context):
+        import threading
+        tenant_ids = ['tenant{}'.format(i) for i in range(20)]
+        started = threading.Condition()
+        threads = set()
+
+        def _create_auth_context(tenant_id, _):
+            if tenant_id is None:
+                return mock_auth_context
+
+            def _acquire_token(*_):
+                with started:
+                    threads.add(threading.current_thread().name)
+                    started.notify_all()
+                    # the first tenants are found at the same time, one on each worker
+                    if tenant_id in tenant_ids[:4]:
+                        while len(threads) < 4:
+                            started.wait(5)
+                if tenant_id == 'tenant3':
+                    raise AdalError('Account is disabled')
+                return {'accessToken': tenant_id}
+            context = mock.MagicMock()
+            context.acquire_token.side_effect = _acquire_token
+            return context
+
+        def _create_arm_client(credentials):
+            client = mock.MagicMock()
+            client.tenants.list.return_value = [TenantStub(t) for t in tenant_ids]
+            token = credentials.token['access_token']
+            client.subscriptions.list.side_effect = lambda: [SubscriptionStub('subscriptions/' + token, token,
+                                                                              self.state1, None)]
+            return client
+
+        mock_auth_context.acquire_token_with_username_password.return_value = self.token_entry1
+        finder = SubscriptionFinder(_create_auth_context, None, _create_arm_client)
+        with mock.patch.dict('os.environ', {'AZURE_CORE_MAX_CONCURRENT_TENANTS': '4'}):
+            subs = finder.find_from_user_account(self.user1, 'bar', None, 'https://management.core.windows.net/')
+
+        # the failed tenant is skipped, the others keep their order
+        expected = [t for t in tenant_ids if t != 'tenant3']
+        self.assertEqual([s.id for s in subs], ['subscriptions/' + t for t in expected])
+        self.assertEqual([s.tenant_id for s in subs], expected)
+        self.assertEqual(finder.tenants, expected)
+        self.assertEqual(len(threads), 4)
+        mock_logger.warning.assert_called_once_with(mock.ANY, 'tenant3', mock.ANY)
+
     @mock.patch('adal.AuthenticationContext', autospec=True)
     def test_find_subscriptions_from_particular_tenent(self, mock_auth_context):
         def just_raise(ex):
@@ -0,0 +1,139 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from codecs import open as codecs_open
+
+import mock
+
+from azure.cli.core._session import Session, CacheSession
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'az.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read_file(self):
+        with codecs_open(self.filename, 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+
+    def test_session_load_creates_file(self):
+        session = Session()
+        session.load(self.filename)
+        self.assertEqual(self._read_file(), {})
+        self.assertEqual(len(session), 0)
+
+    def test_session_save_and_load(self):
+        session = Session()
+        session.load(self.filename)
+        session['a'] = {'b': [1, 2]}
+        session['c'] = 'd'
+        del session['c']
+
+        reloaded = Session()
+        reloaded.load(self.filename)
+        self.assertEqual(reloaded.data, {'a': {'b': [1, 2]}})
+        self.assertEqual(self._read_file(), {'a': {'b': [1, 2]}})
+        self.assertEqual([f for f in os.listdir(self.temp_dir) if f.endswith('.tmp')], [])
+
+    def test_session_indirect_modification(self):
+        session = Session()
+        session.load(self.filename)
+        session['a'] = {'b': 1}
+        session['a']['b'] = 2
+        session.save()
+        self.assertEqual(self._read_file(), {'a': {'b': 2}})
+
+    def test_session_skips_unchanged_writes(self):
+        session = Session()
+        session.load(self.filename)
+        session['a'] = 1
+        with mock.patch('azure.cli.core._session._atomic_write', autospec=True) as write_mock:
+            session['a'] = 1
+            session.save()
+            write_mock.assert_not_called()
+            session['a'] = 2
+            self.assertEqual(write_mock.call_count, 1)
+
+    def test_session_concurrent_writers_do_not_clobber(self):
+        first, second = Session(), Session()
+        first.load(self.filename)
+        second.load(self.filename)
+        first['a'] = 1
+        second['b'] = 2
+        self.assertEqual(self._read_file(), {'a': 1, 'b': 2})
+        # keys written by another process are picked up on save
+        self.assertEqual(second.data, {'a': 1, 'b': 2})
+
+        del first['a']
+        self.assertEqual(self._read_file(), {'b': 2})
+
+    def test_session_transaction_writes_once(self):
+        session = Session()
+        session.load(self.filename)
+        with mock.patch('azure.cli.core._session._atomic_write', autospec=True) as write_mock:
+            with session.transaction():
+                session['a'] = 1
+                session['b'] = 2
+                with session.transaction():
+                    del session['a']
+                write_mock.assert_not_called()
+            self.assertEqual(write_mock.call_count, 1)
+            self.assertEqual(json.loads(write_mock.call_args[0][1]), {'b': 2})
+
+    def test_session_transaction_saves_on_error(self):
+        session = Session()
+        session.load(self.filename)
+        with self.assertRaises(ValueError):
+            with session.transaction():
+                session['a'] = 1
+                raise ValueError()
+        self.assertEqual(self._read_file(), {'a': 1})
+
+    def test_session_max_age(self):
+        session = Session()
+        session.load(self.filename)
+        session['a'] = 1
+
+        session.load(self.filename, max_age=3600)
+        self.assertEqual(session.data, {'a': 1})
+
+        expired = time.time() - 7200
+        os.utime(self.filename, (expired, expired))
+        session.load(self.filename, max_age=3600)
+        self.assertEqual(session.data, {})
+        self.assertEqual(self._read_file(), {})
+
+    def test_cache_session_values_expire(self):
+        cache = CacheSession(max_age=3600)
+        cache.load(self.filename)
+        cache.set_value('a', [1])
+        cache.set_value('b', 2)
+        self.assertEqual(cache.get_value('a'), [1])
+        self.assertIsNone(cache.get_value('c'))
+
+        cache.data['a']['time'] -= 7200
+        cache.save()
+        self.assertIsNone(cache.get_value('a'))
+        self.assertEqual(cache.get_value('a', 'default'), 'default')
+
+        reloaded = CacheSession(max_age=3600)
+        reloaded.load(self.filename)
+        self.assertEqual(sorted(reloaded), ['b'])
+        self.assertEqual(sorted(self._read_file()), ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -56,7 +56,7 @@ DEPENDENCIES = [
     'colorama',
     'humanfriendly',
     'jmespath',
-    'msrest>=0.4.4',
+    'msrest>=0.4.15',
     'msrestazure>=0.4.7',
     'paramiko',
     'pip',
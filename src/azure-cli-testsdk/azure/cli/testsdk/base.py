@@ -19,7 +19,7 @@ from azure_devtools.scenario_tests.const import MOCKED_SUBSCRIPTION_ID, ENV_SKIP
 
 from .patches import (patch_load_cached_subscriptions, patch_main_exception_handler,
                       patch_retrieve_token_for_user, patch_long_run_operation_delay,
-                      patch_progress_controller)
+                      patch_progress_controller, patch_cache_session, patch_connection_pool)
 from .exceptions import CliExecutionError
 from .utilities import find_recording_dir
 
@@ -47,7 +47,8 @@ class ScenarioTest(ReplayableTest):
                 DeploymentNameReplacer(),
                 RequestUrlNormalizer(),
             ],
-            recording_patches=recording_patches or [patch_main_exception_handler],
+            recording_patches=recording_patches or [patch_main_exception_handler, patch_cache_session,
+                                                    patch_connection_pool],
             replay_patches=replay_patches or [
                 patch_main_exception_handler,
                 patch_time_sleep_api,
@@ -55,6 +56,8 @@ class ScenarioTest(ReplayableTest):
                 patch_load_cached_subscriptions,
                 patch_retrieve_token_for_user,
                 patch_progress_controller,
+                patch_cache_session,
+                patch_connection_pool,
             ],
             recording_dir=find_recording_dir(inspect.getfile(self.__class__)),
             recording_name=recording_name
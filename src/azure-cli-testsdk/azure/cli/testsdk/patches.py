@@ -75,3 +75,19 @@ def patch_long_run_operation_delay(unit_test):
     mock_in_unit_test(unit_test,
                       'azure.cli.core.commands.LongRunningOperation._delay',
                       _shortcut_long_run_operation)
+    mock_in_unit_test(unit_test,
+                      'azure.cli.core.commands._polling.PollingBackoff.next_delay',
+                      lambda *args, **kwargs: 0)
+
+
+def patch_cache_session(unit_test):
+    def _get_value(self, key, default=None):  # pylint: disable=unused-argument
+        # every request has to be recorded and played back, so nothing is served from local caches
+        return default
+
+    mock_in_unit_test(unit_test, 'azure.cli.core._session.CacheSession.get_value', _get_value)
+
+
+def patch_connection_pool(unit_test):
+    # the pooled connections are bound to the cassette they were opened with, so every test opens its own
+    mock_in_unit_test(unit_test, 'azure.cli.core.commands._connection_pool.get_pool_manager', lambda: None)
@@ -121,11 +121,20 @@ def _mock_user_access_token(_, _1, _2, _3):  # pylint: disable=unused-argument
     return 'Bearer', 'top-secret-token-for-you', None
 
 
+def _mock_get_cached_value(self, key, default=None):  # pylint: disable=unused-argument
+    # every request has to be recorded and played back, so nothing is served from local caches
+    return default
+
+
 def _mock_operation_delay(_):
     # don't run time.sleep()
     return
 
 
+def _mock_next_poll_delay(self, retry_after=None):  # pylint: disable=unused-argument
+    return 0
+
+
 class _MockOutstream(object):
     """ mock outstream for testing """
 
@@ -415,6 +424,7 @@ class VCRTestBase(unittest.TestCase):  # pylint: disable=too-many-instance-attri
     @mock.patch('azure.cli.main.handle_exception', _mock_handle_exceptions)
     @mock.patch('azure.cli.core.commands.client_factory._get_mgmt_service_client',
                 _mock_get_mgmt_service_client)
+    @mock.patch('azure.cli.core._session.CacheSession.get_value', _mock_get_cached_value)
     def _execute_live_or_recording(self):
         # pylint: disable=no-member
         try:
@@ -446,8 +456,10 @@ class VCRTestBase(unittest.TestCase):  # pylint: disable=too-many-instance-attri
     @mock.patch('msrestazure.azure_operation.AzureOperationPoller._delay', _mock_operation_delay)
     @mock.patch('time.sleep', _mock_operation_delay)
     @mock.patch('azure.cli.core.commands.LongRunningOperation._delay', _mock_operation_delay)
+    @mock.patch('azure.cli.core.commands._polling.PollingBackoff.next_delay', _mock_next_poll_delay)
     @mock.patch('azure.cli.core.commands.validators.generate_deployment_name',
                 _mock_generate_deployment_name)
+    @mock.patch('azure.cli.core._session.CacheSession.get_value', _mock_get_cached_value)
     def _execute_playback(self):
         # pylint: disable=no-member
         with self.my_vcr.use_cassette(self.cassette_path):
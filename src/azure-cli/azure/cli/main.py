@@ -8,7 +8,7 @@ import sys
 
 from azure.cli.core import configure_logging, get_az_logger
 from azure.cli.core.application import APPLICATION, Configuration
-from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
+from azure.cli.core._session import ACCOUNT, CONFIG, SESSION, INDEX
 from azure.cli.core.util import (show_version_info_exit, handle_exception)
 from azure.cli.core._environment import get_config_dir
 import azure.cli.core.telemetry as telemetry
@@ -29,11 +29,14 @@ def main(args, output=sys.stdout, logging_stream=None):
     ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
     CONFIG.load(os.path.join(azure_folder, 'az.json'))
     SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+    INDEX.load(os.path.join(azure_folder, 'commandIndex.json'))
 
     APPLICATION.initialize(Configuration())
 
     try:
-        cmd_result = APPLICATION.execute(args)
+        # Changes to the session files are written once, after the command has executed
+        with ACCOUNT.transaction(), CONFIG.transaction(), SESSION.transaction(), INDEX.transaction():
+            cmd_result = APPLICATION.execute(args, stream_result=True)
 
         # Commands can return a dictionary/list of results
         # If they do, we print the results.
@@ -50,3 +53,6 @@ def main(args, output=sys.stdout, logging_stream=None):
 
         error_code = handle_exception(ex)
         return error_code
+    finally:
+        for name, handler, calls, seconds in APPLICATION.get_event_timings()[:10]:
+            logger.debug("Event '%s' handler %s: %d calls in %.3f seconds.", name, handler, calls, seconds)
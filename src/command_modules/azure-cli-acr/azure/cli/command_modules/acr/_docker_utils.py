@@ -9,6 +9,11 @@ except ImportError:
     from urllib import urlencode
     from urlparse import urlparse, urlunparse
 
+import os
+import threading
+import time
+from base64 import urlsafe_b64decode
+from contextlib import contextmanager
 from json import loads
 import requests
 
@@ -23,9 +28,203 @@ from .credential import acr_credential_show
 
 logger = azlogging.get_az_logger(__name__)
 
+_TOKEN_CACHE_FILE_NAME = 'acrTokenCache.json'
+# a cached token is not used in the last minutes before it expires
+_TOKEN_EXPIRY_MARGIN = 300
+
+_session = None
+_session_lock = threading.Lock()
+_token_cache = None
+_token_cache_lock = threading.RLock()
+# the account the tokens are cached for, resolved once by the outermost token cache transaction
+_token_identity = None
+_refresh_token_lock = threading.Lock()
+
+
+def get_max_concurrent_requests():
+    from azure.cli.core._config import az_config
+    return max(az_config.getint('acr', 'max_concurrent_requests', fallback=10), 1)
+
+
+def get_registry_session():
+    """Returns the requests session shared by the calls to the registries, which keeps their
+    connections open between the calls."""
+    global _session  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is None:
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            _session.mount('https://', HTTPAdapter(pool_maxsize=get_max_concurrent_requests()))
+        return _session
+
+
+def _get_token_cache():
+    """Returns the refresh and access tokens of the registries cached in the configuration
+    directory. The caller holds `_token_cache_lock`."""
+    global _token_cache  # pylint: disable=global-statement
+    from azure.cli.core._config import az_config
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import CacheSession
+    filename = os.path.join(get_config_dir(), _TOKEN_CACHE_FILE_NAME)
+    if _token_cache is None or _token_cache.filename != filename:
+        _token_cache = CacheSession(max_age=az_config.getint('acr', 'token_cache_max_age', fallback=10800))
+        _token_cache.load(filename)
+    return _token_cache
+
+
+@contextmanager
+def token_cache_transaction():
+    """A context in which the tokens obtained, e.g. by concurrent requests, are saved once at the
+    end, and are cached for the account resolved once at the start."""
+    global _token_identity  # pylint: disable=global-statement
+    # the lock is only held while entering and leaving the transaction, as the tokens are
+    # obtained by other threads within it
+    with _token_cache_lock:
+        outermost = _token_identity is None
+        if outermost:
+            _token_identity = _resolve_token_identity()
+        transaction = _get_token_cache().transaction()
+        transaction.__enter__()
+    try:
+        yield
+    finally:
+        with _token_cache_lock:
+            if outermost:
+                _token_identity = None
+            transaction.__exit__(None, None, None)
+
+
+def _get_token_expiry(token):
+    """Returns the expiry timestamp of a JWT token, or None if it can't be read."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return int(loads(urlsafe_b64decode(payload.encode('ascii')).decode('utf-8'))['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _resolve_token_identity():
+    from azure.cli.core._profile import Profile
+    profile = Profile()
+    return '{}@{}'.format(profile.get_current_account_user(), profile.get_subscription()['tenantId'])
+
+
+def _get_token_identity():
+    """Returns the account the tokens are cached for: the one of the current token cache
+    transaction, if any."""
+    return _token_identity or _resolve_token_identity()
+
+
+def _get_token_cache_key(kind, login_server, identity, scope=None):
+    return '|'.join(x for x in (kind, login_server.lower(), identity, scope) if x)
+
+
+def _get_cached_token(key):
+    with _token_cache_lock:
+        entry = _get_token_cache().get_value(key)
+    if entry and entry['expiresOn'] - _TOKEN_EXPIRY_MARGIN > time.time():
+        return entry
+    return None
+
+
+def _cache_token(key, token, **kwargs):
+    expires_on = _get_token_expiry(token)
+    if expires_on is None:
+        return
+    entry = {'token': token, 'expiresOn': expires_on}
+    entry.update(kwargs)
+    with _token_cache_lock:
+        _get_token_cache().set_value(key, entry)
+
+
+def invalidate_cached_token(token):
+    """Removes `token` from the cache, e.g. once a registry refused it."""
+    with _token_cache_lock:
+        cache = _get_token_cache()
+        keys = [key for key in cache if (cache.get_value(key) or {}).get('token') == token]
+        if keys:
+            with cache.transaction():
+                for key in keys:
+                    del cache[key]
+
+
+def _get_refresh_token(login_server, identity):
+    """Returns a refresh token for `login_server` and the URL of its authorization server."""
+    key = _get_token_cache_key('refresh', login_server, identity)
+    cached = _get_cached_token(key)
+    if cached:
+        return cached['token'], cached['realm']
+
+    # concurrent requests for access tokens wait for a single exchange
+    with _refresh_token_lock:
+        cached = _get_cached_token(key)
+        if cached:
+            return cached['token'], cached['realm']
+
+        challenge = get_registry_session().get('https://' + login_server + '/v2/')
+        if challenge.status_code not in [401] or 'WWW-Authenticate' not in challenge.headers:
+            raise CLIError("Registry '{}' did not issue a challenge.".format(login_server))
+
+        authenticate = challenge.headers['WWW-Authenticate']
+
+        tokens = authenticate.split(' ', 2)
+        if len(tokens) < 2 or tokens[0].lower() != 'bearer':
+            raise CLIError("Registry '{}' does not support AAD login.".format(login_server))
+
+        params = {y[0]: y[1].strip('"') for y in
+                  (x.strip().split('=', 2) for x in tokens[1].split(','))}
+        if 'realm' not in params or 'service' not in params:
+            raise CLIError("Registry '{}' does not support AAD login.".format(login_server))
+
+        authurl = urlparse(params['realm'])
+        authhost = urlunparse((authurl[0], authurl[1], '/oauth2/exchange', '', '', ''))
+
+        from azure.cli.core._profile import Profile
+        profile = Profile()
+        sp_id, refresh, access, tenant = profile.get_refresh_token()
+
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        if not sp_id:
+            if not refresh:
+                content = {
+                    'grant_type': 'access_token',
+                    'service': params['service'],
+                    'tenant': tenant,
+                    'access_token': access
+                }
+            else:
+                content = {
+                    'grant_type': 'access_token_refresh_token',
+                    'service': params['service'],
+                    'tenant': tenant,
+                    'access_token': access,
+                    'refresh_token': refresh
+                }
+        else:
+            content = {
+                'grant_type': 'spn',
+                'service': params['service'],
+                'tenant': tenant,
+                'username': sp_id,
+                'password': refresh
+            }
+
+        response = get_registry_session().post(authhost, urlencode(content), headers=headers)
+
+        if response.status_code not in [200]:
+            raise CLIError(
+                "Access to registry '{}' was denied. Response code: {}.".format(
+                    login_server, response.status_code))
+
+        refresh_token = loads(response.content.decode("utf-8"))["refresh_token"]
+        _cache_token(key, refresh_token, realm=params['realm'])
+        return refresh_token, params['realm']
+
 
 def _get_aad_token(login_server, only_refresh_token, repository=None, permission='*'):
-    """Obtains refresh and access tokens for an AAD-enabled registry.
+    """Obtains refresh and access tokens for an AAD-enabled registry. The tokens are cached by
+    login server and scope until shortly before they expire.
     :param str login_server: The registry login server URL to log in to
     :param bool only_refresh_token: Whether to ask for only refresh token, or for both refresh and access tokens
     :param str repository: Repository for which the access token is requested
@@ -33,84 +232,44 @@ def _get_aad_token(login_server, only_refresh_token, repository=None, permission
     """
     login_server = login_server.rstrip('/')
 
-    challenge = requests.get('https://' + login_server + '/v2/')
-    if challenge.status_code not in [401] or 'WWW-Authenticate' not in challenge.headers:
-        raise CLIError("Registry '{}' did not issue a challenge.".format(login_server))
-
-    authenticate = challenge.headers['WWW-Authenticate']
-
-    tokens = authenticate.split(' ', 2)
-    if len(tokens) < 2 or tokens[0].lower() != 'bearer':
-        raise CLIError("Registry '{}' does not support AAD login.".format(login_server))
-
-    params = {y[0]: y[1].strip('"') for y in
-              (x.strip().split('=', 2) for x in tokens[1].split(','))}
-    if 'realm' not in params or 'service' not in params:
-        raise CLIError("Registry '{}' does not support AAD login.".format(login_server))
+    if repository is None:
+        scope = 'registry:catalog:*'
+    else:
+        scope = 'repository:{}:{}'.format(repository, permission)
 
-    authurl = urlparse(params['realm'])
-    authhost = urlunparse((authurl[0], authurl[1], '/oauth2/exchange', '', '', ''))
+    identity = _get_token_identity()
+    key = _get_token_cache_key('access', login_server, identity, scope)
+    if not only_refresh_token:
+        cached = _get_cached_token(key)
+        if cached:
+            return cached['token']
 
-    from azure.cli.core._profile import Profile
-    profile = Profile()
-    sp_id, refresh, access, tenant = profile.get_refresh_token()
-
-    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-    if not sp_id:
-        if not refresh:
-            content = {
-                'grant_type': 'access_token',
-                'service': params['service'],
-                'tenant': tenant,
-                'access_token': access
-            }
-        else:
-            content = {
-                'grant_type': 'access_token_refresh_token',
-                'service': params['service'],
-                'tenant': tenant,
-                'access_token': access,
-                'refresh_token': refresh
-            }
-    else:
-        content = {
-            'grant_type': 'spn',
-            'service': params['service'],
-            'tenant': tenant,
-            'username': sp_id,
-            'password': refresh
-        }
-
-    response = requests.post(authhost, urlencode(content), headers=headers)
-
-    if response.status_code not in [200]:
-        raise CLIError(
-            "Access to registry '{}' was denied. Response code: {}.".format(
-                login_server, response.status_code))
-
-    refresh_token = loads(response.content.decode("utf-8"))["refresh_token"]
+    refresh_token, realm = _get_refresh_token(login_server, identity)
     if only_refresh_token:
         return refresh_token
 
+    authurl = urlparse(realm)
     authhost = urlunparse((authurl[0], authurl[1], '/oauth2/token', '', '', ''))
 
-    if repository is None:
-        scope = 'registry:catalog:*'
-    else:
-        scope = 'repository:{}:{}'.format(repository, permission)
-
     content = {
         'grant_type': 'refresh_token',
         'service': login_server,
         'scope': scope,
         'refresh_token': refresh_token
     }
-    response = requests.post(authhost, urlencode(content), headers=headers)
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    response = get_registry_session().post(authhost, urlencode(content), headers=headers)
     access_token = loads(response.content.decode("utf-8"))["access_token"]
+    _cache_token(key, access_token)
 
     return access_token
 
 
+def get_repository_access_token(login_server, repository, permission):
+    """Returns an AAD access token for `repository` of a registry accessed with AAD tokens."""
+    return _get_aad_token(login_server, False, repository, permission)
+
+
 def _get_credentials(registry_name,
                      resource_group_name,
                      username,
@@ -146,6 +146,9 @@ helps['acr repository list'] = """
         - name: List repositories in a given container registry.
           text:
             az acr repository list -n MyRegistry
+        - name: List repositories and their tags in a container registry.
+          text:
+            az acr repository list -n MyRegistry --show-tags
 """
 
 helps['acr repository show-tags'] = """
@@ -184,6 +187,22 @@ helps['acr repository delete'] = """
             az acr repository delete -n MyRegistry --repository MyRepository --manifest MyManifest
 """
 
+helps['acr repository purge'] = """
+    type: command
+    short-summary: Delete the manifests which match filters, and all their tags, from a container registry.
+    long-summary: Specify the manifests to delete with --tag-filter, --untagged or both. The manifests of each repository are listed once and the matching ones are deleted concurrently. The number of concurrent requests is set by `max_concurrent_requests` in the `acr` section of the configuration.
+    examples:
+        - name: List the manifests of a repository whose tags all start with 'ci-' and which are older than 30 days, without deleting them.
+          text:
+            az acr repository purge -n MyRegistry --repository MyRepository --tag-filter "ci-.*" --older-than 30 --dry-run
+        - name: Delete the manifests of all the repositories whose tags all start with 'ci-', except the 10 most recent ones of each repository.
+          text:
+            az acr repository purge -n MyRegistry --tag-filter "ci-.*" --keep 10 --yes
+        - name: Delete the untagged manifests of a repository.
+          text:
+            az acr repository purge -n MyRegistry --repository MyRepository --untagged
+"""
+
 helps['acr webhook list'] = """
     type: command
     short-summary: List all of the webhooks for a container registry.
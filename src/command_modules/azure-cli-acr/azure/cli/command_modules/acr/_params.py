@@ -40,8 +40,17 @@ register_cli_argument('acr update', 'admin_enabled', help='Indicates whether the
 register_cli_argument('acr', 'username', options_list=('--username', '-u'), help='The username used to log into a container registry')
 register_cli_argument('acr', 'password', options_list=('--password', '-p'), help='The password used to log into a container registry')
 
+register_cli_argument('acr repository list', 'show_tags', action='store_true', help='List the tags of each repository. The tags of the repositories are listed concurrently.')
 register_cli_argument('acr repository delete', 'manifest', nargs='?', required=False, const='', default=None, help='The sha256 based digest of manifest to delete')
 register_cli_argument('acr repository delete', 'yes', options_list=('--yes', '-y'), action='store_true', help='Do not prompt for confirmation')
+register_cli_argument('acr repository purge', 'repository', help='The repository to purge. All the repositories of the registry are purged if omitted.')
+register_cli_argument('acr repository purge', 'tag_filter', help='A regular expression which all the tags of a manifest must match for the manifest to be deleted, e.g. "ci-.*".')
+register_cli_argument('acr repository purge', 'older_than', type=int, help='Only delete the manifests last updated more than this number of days ago.')
+register_cli_argument('acr repository purge', 'keep', type=int, help='The number of most recent matching manifests to keep in each repository.')
+register_cli_argument('acr repository purge', 'untagged', action='store_true', help='Delete the manifests without tags.')
+register_cli_argument('acr repository purge', 'dry_run', action='store_true', help='List the manifests which would be deleted without deleting them.')
+register_cli_argument('acr repository purge', 'rate_limit', type=float, help='The maximum number of manifests deleted per second. 0 for no limit.')
+register_cli_argument('acr repository purge', 'yes', options_list=('--yes', '-y'), action='store_true', help='Do not prompt for confirmation')
 
 register_cli_argument('acr create', 'registry_name', completer=None, validator=validate_registry_name)
 register_cli_argument('acr create', 'deployment_name', deployment_name_type, validator=None)
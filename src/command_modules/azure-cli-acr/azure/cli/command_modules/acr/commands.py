@@ -48,6 +48,8 @@ if not supported_api_version(PROFILE_TYPE, max_api='2017-03-09-profile'):
                 'azure.cli.command_modules.acr.repository#acr_repository_show_manifests')
     cli_command(__name__, 'acr repository delete',
                 'azure.cli.command_modules.acr.repository#acr_repository_delete')
+    cli_command(__name__, 'acr repository purge',
+                'azure.cli.command_modules.acr.repository#acr_repository_purge')
 
     cli_command(__name__, 'acr webhook list',
                 'azure.cli.command_modules.acr.webhook#acr_webhook_list',
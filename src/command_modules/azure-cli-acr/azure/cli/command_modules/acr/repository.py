@@ -3,9 +3,11 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import calendar
+import re
+import threading
 import time
 from base64 import b64encode
-import requests
 from requests.utils import to_native_string
 
 from azure.cli.core.prompting import NoTTYException, prompt_y_n
@@ -13,11 +15,19 @@ import azure.cli.core.azlogging as azlogging
 from azure.cli.core.util import CLIError
 
 from ._utils import validate_managed_registry
-from ._docker_utils import get_access_credentials
+from ._docker_utils import (
+    get_access_credentials,
+    get_max_concurrent_requests,
+    get_registry_session,
+    get_repository_access_token,
+    invalidate_cached_token,
+    token_cache_transaction
+)
 
 
 logger = azlogging.get_az_logger(__name__)
 DELETE_NOT_SUPPORTED = 'Delete is only supported for managed registries.'
+PURGE_NOT_SUPPORTED = 'Purge is only supported for managed registries.'
 LIST_MANIFESTS_NOT_SUPPORTED = 'List manifests is only supported for managed registries.'
 
 
@@ -48,19 +58,41 @@ def _get_pagination_params(count):
     return {'n': count}
 
 
+def _get_page_size():
+    from azure.cli.core._config import az_config
+    return az_config.getint('acr', 'page_size', fallback=100)
+
+
+def _raise_unauthorized(response, username, password):
+    if username is None:
+        # the cached token was refused, e.g. as its permissions were revoked
+        invalidate_cached_token(password)
+    raise CLIError(response.text)
+
+
 def _delete_data_from_registry(login_server, path, username, password, retry_times=3, retry_interval=5):
     for i in range(0, retry_times):
         errorMessage = None
         try:
-            response = requests.delete(
+            response = get_registry_session().delete(
                 'https://{}/{}'.format(login_server, path),
                 headers=_get_authorization_header(username, password)
             )
 
             if response.status_code == 200 or response.status_code == 202:
                 return
-            elif response.status_code == 401 or response.status_code == 404:
+            elif response.status_code == 401:
+                _raise_unauthorized(response, username, password)
+            elif response.status_code == 404:
                 raise CLIError(response.text)
+            elif response.status_code == 429:
+                # the registry throttles the requests, wait as long as it asks
+                from azure.cli.core.commands._polling import get_retry_after
+                errorMessage = response.text
+                delay = get_retry_after(response)
+                logger.debug('Retrying %s after throttling', i + 1)
+                time.sleep(retry_interval if delay is None else delay)
+                continue
             else:
                 raise Exception(response.text)
         except CLIError:
@@ -79,14 +111,16 @@ def _get_manifest_digest(login_server, path, username, password, retry_times=3,
         try:
             headers = _get_authorization_header(username, password)
             headers.update(_get_manifest_v2_header())
-            response = requests.get(
+            response = get_registry_session().get(
                 'https://{}/{}'.format(login_server, path),
                 headers=headers
             )
 
             if response.status_code == 200 and response.headers and 'Docker-Content-Digest' in response.headers:
                 return response.headers['Docker-Content-Digest']
-            elif response.status_code == 401 or response.status_code == 404:
+            elif response.status_code == 401:
+                _raise_unauthorized(response, username, password)
+            elif response.status_code == 404:
                 raise CLIError(response.text)
             else:
                 raise Exception(response.text)
@@ -107,16 +141,17 @@ def _obtain_data_from_registry(login_server,
                                result_index,
                                retry_times=3,
                                retry_interval=5,
-                               pagination=20):
+                               pagination=None):
     resultList = []
     executeNextHttpCall = True
+    pagination = pagination or _get_page_size()
 
     while executeNextHttpCall:
         executeNextHttpCall = False
         for i in range(0, retry_times):
             errorMessage = None
             try:
-                response = requests.get(
+                response = get_registry_session().get(
                     'https://{}/{}'.format(login_server, path),
                     headers=_get_authorization_header(username, password),
                     params=_get_pagination_params(pagination)
@@ -125,7 +160,7 @@ def _obtain_data_from_registry(login_server,
                 if response.status_code == 200:
                     result = response.json()[result_index]
                     if result:
-                        resultList += response.json()[result_index]
+                        resultList += result
                     if 'link' in response.headers and response.headers['link']:
                         linkHeader = response.headers['link']
                         # The registry is telling us there's more items in the list,
@@ -135,7 +170,9 @@ def _obtain_data_from_registry(login_server,
                         path = linkHeader[(linkHeader.index('<') + 1):linkHeader.index('>')]
                         executeNextHttpCall = True
                     break
-                elif response.status_code == 401 or response.status_code == 404:
+                elif response.status_code == 401:
+                    _raise_unauthorized(response, username, password)
+                elif response.status_code == 404:
                     raise CLIError(response.text)
                 else:
                     raise Exception(response.text)
@@ -151,28 +188,58 @@ def _obtain_data_from_registry(login_server,
     return resultList
 
 
+def _obtain_tags_of_repositories(login_server, username, password, repositories):
+    """Lists the tags of `repositories` concurrently and returns them by repository. A registry
+    accessed with AAD tokens is accessed with a token of each repository."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _obtain_tags(repository):
+        repository_password = password
+        if username is None:
+            repository_password = get_repository_access_token(login_server, repository, 'pull')
+        return _obtain_data_from_registry(
+            login_server=login_server,
+            path='/v2/{}/tags/list'.format(repository),
+            username=username,
+            password=repository_password,
+            result_index='tags')
+
+    with ThreadPoolExecutor(max_workers=get_max_concurrent_requests()) as executor:
+        return dict(zip(repositories, executor.map(_obtain_tags, repositories)))
+
+
 def acr_repository_list(registry_name,
                         resource_group_name=None,
                         username=None,
-                        password=None):
+                        password=None,
+                        show_tags=False):
     """Lists repositories in the specified container registry.
     :param str registry_name: The name of container registry
     :param str resource_group_name: The name of resource group
     :param str username: The username used to log into the container registry
     :param str password: The password used to log into the container registry
+    :param bool show_tags: Whether to list the tags of each repository
     """
-    login_server, username, password = get_access_credentials(
-        registry_name=registry_name,
-        resource_group_name=resource_group_name,
-        username=username,
-        password=password)
+    # the tokens of the repositories are saved once all the tags are listed
+    with token_cache_transaction():
+        login_server, username, password = get_access_credentials(
+            registry_name=registry_name,
+            resource_group_name=resource_group_name,
+            username=username,
+            password=password)
 
-    return _obtain_data_from_registry(
-        login_server=login_server,
-        path='/v2/_catalog',
-        username=username,
-        password=password,
-        result_index='repositories')
+        repositories = _obtain_data_from_registry(
+            login_server=login_server,
+            path='/v2/_catalog',
+            username=username,
+            password=password,
+            result_index='repositories')
+
+        if not show_tags:
+            return repositories
+
+        tags = _obtain_tags_of_repositories(login_server, username, password, repositories)
+        return [{'name': repository, 'tags': tags[repository]} for repository in repositories]
 
 
 def acr_repository_show_tags(registry_name,
@@ -328,8 +395,7 @@ def _delete_manifest_confirmation(login_server,
         path='/v2/_acr/{}/manifests/list'.format(repository),
         username=username,
         password=password,
-        result_index='manifests',
-        pagination=20
+        result_index='manifests'
     )
     filter_by_manifest = [x for x in manifests if manifest == x['digest']]
 
@@ -358,3 +424,180 @@ def _user_confirmation(message, yes=False):
             raise CLIError('Operation cancelled.')
     except NoTTYException:
         raise CLIError('Unable to prompt for confirmation as no tty available. Use --yes.')
+
+
+class _RateLimiter(object):  # pylint: disable=too-few-public-methods
+    """Spaces out the calls of `wait`, from any thread, to at most `rate` per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = time.time()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(self._next, now) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _get_manifest_timestamp(manifest):
+    """Returns the timestamp of the last update of a manifest listed by the registry, or None."""
+    value = manifest.get('lastUpdateTime') or manifest.get('timestamp') or manifest.get('createdTime')
+    try:
+        return calendar.timegm(time.strptime(value[:19], '%Y-%m-%dT%H:%M:%S'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _filter_manifests_to_purge(manifests, tag_filter=None, older_than=None, keep=0, untagged=False):
+    """Returns the manifests to purge from the manifests of a repository.
+
+    A tagged manifest matches if all its tags match the regular expression `tag_filter`, so a
+    manifest which is also referenced by another tag is kept. An untagged manifest matches if
+    `untagged` is set. The `keep` most recent matching manifests are kept, and the others
+    only match if they were last updated more than `older_than` days ago.
+    """
+    pattern = re.compile('(?:{})$'.format(tag_filter)) if tag_filter else None
+    matches = []
+    for manifest in manifests:
+        tags = manifest.get('tags') or []
+        if (not tags and untagged) or (tags and pattern and all(pattern.match(tag) for tag in tags)):
+            matches.append(manifest)
+
+    matches.sort(key=lambda m: _get_manifest_timestamp(m) or 0, reverse=True)
+    matches = matches[keep:] if keep else matches
+    if older_than is not None:
+        limit = time.time() - older_than * 24 * 3600
+        matches = [m for m in matches if (_get_manifest_timestamp(m) or limit) < limit]
+    return matches
+
+
+def acr_repository_purge(registry_name,
+                         repository=None,
+                         tag_filter=None,
+                         older_than=None,
+                         keep=0,
+                         untagged=False,
+                         dry_run=False,
+                         rate_limit=10,
+                         resource_group_name=None,
+                         username=None,
+                         password=None,
+                         yes=False):
+    """Deletes the manifests, and all their tags, which match the filters from a repository, or from
+    all the repositories, of the specified container registry.
+    :param str registry_name: The name of container registry
+    :param str repository: The repository to purge. All the repositories are purged if omitted
+    :param str tag_filter: The regular expression all the tags of a manifest must match
+    :param int older_than: The minimum number of days since a manifest was last updated
+    :param int keep: The number of most recent matching manifests to keep in each repository
+    :param bool untagged: Whether to purge the manifests without tags
+    :param bool dry_run: Whether to only list the manifests which would be deleted
+    :param float rate_limit: The maximum number of deletes per second
+    :param str resource_group_name: The name of resource group
+    :param str username: The username used to log into the container registry
+    :param str password: The password used to log into the container registry
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not tag_filter and not untagged:
+        raise CLIError('Please specify the manifests to delete with --tag-filter, --untagged or both.')
+    if keep < 0 or (older_than is not None and older_than < 0):
+        raise CLIError('--keep and --older-than must not be negative.')
+    if tag_filter:
+        try:
+            re.compile(tag_filter)
+        except re.error as e:
+            raise CLIError("Invalid --tag-filter '{}': {}".format(tag_filter, e))
+
+    _, resource_group_name = validate_managed_registry(
+        registry_name, resource_group_name, PURGE_NOT_SUPPORTED)
+
+    max_workers = get_max_concurrent_requests()
+    # the tokens of the repositories are saved once the manifests are purged
+    with token_cache_transaction():
+        login_server, username, password = get_access_credentials(
+            registry_name=registry_name,
+            resource_group_name=resource_group_name,
+            username=username,
+            password=password,
+            repository=repository,
+            permission='*')
+
+        if repository:
+            repositories = [repository]
+        else:
+            repositories = _obtain_data_from_registry(
+                login_server=login_server,
+                path='/v2/_catalog',
+                username=username,
+                password=password,
+                result_index='repositories')
+
+        def _get_password(repository):
+            # a registry accessed with AAD tokens is accessed with a token of each repository
+            if username is None and len(repositories) > 1:
+                return get_repository_access_token(login_server, repository, '*')
+            return password
+
+        def _list_manifests_to_purge(repository):
+            manifests = _obtain_data_from_registry(
+                login_server=login_server,
+                path='/v2/_acr/{}/manifests/list'.format(repository),
+                username=username,
+                password=_get_password(repository),
+                result_index='manifests')
+            return [dict(manifest, repository=repository) for manifest in
+                    _filter_manifests_to_purge(manifests, tag_filter, older_than, keep, untagged)]
+
+        # the manifests of each repository are listed once
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            to_purge = [m for manifests in executor.map(_list_manifests_to_purge, repositories) for m in manifests]
+        results = [{'repository': m['repository'], 'digest': m['digest'], 'tags': m.get('tags') or [],
+                    'timestamp': m.get('lastUpdateTime') or m.get('timestamp') or m.get('createdTime')}
+                   for m in to_purge]
+        if dry_run or not results:
+            logger.warning('%d manifests match the filters.', len(results))
+            return results
+
+        _user_confirmation("Are you sure you want to delete {} manifests, and all their tags, from {}?".format(
+            len(results), "the repository '{}'".format(repository) if repository else 'the registry'), yes)
+
+        from azure.cli.core.application import APPLICATION
+        progress = APPLICATION.get_progress_controller(True)
+        limiter = _RateLimiter(rate_limit)
+        completed = [0]
+        lock = threading.Lock()
+
+        def _purge(manifest):
+            limiter.wait()
+            _delete_data_from_registry(
+                login_server=login_server,
+                path='/v2/{}/manifests/{}'.format(manifest['repository'], manifest['digest']),
+                username=username,
+                password=_get_password(manifest['repository']))
+            with lock:
+                completed[0] += 1
+                progress.add(message='Deleting manifests', value=completed[0], total_val=len(results))
+
+        def _try_purge(manifest):
+            try:
+                _purge(manifest)
+                return None
+            except Exception as e:  # pylint: disable=broad-except
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            errors = [(m, e) for m, e in zip(results, executor.map(_try_purge, results)) if e]
+        progress.end()
+
+    if errors:
+        for manifest, e in errors:
+            logger.error("%s@%s: %s", manifest['repository'], manifest['digest'], e)
+        raise CLIError('{} of {} manifests failed to delete.'.format(len(errors), len(results)))
+    return results
@@ -0,0 +1,191 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import json
+import tempfile
+import time
+import unittest
+
+import mock
+
+from azure.cli.command_modules.acr import _docker_utils
+from azure.cli.command_modules.acr.repository import (acr_repository_list, acr_repository_purge,
+                                                      _filter_manifests_to_purge)
+from azure.cli.core.util import CLIError
+
+
+def _get_token(name, expires_in=3600):
+    payload = json.dumps({'name': name, 'exp': int(time.time()) + expires_in}).encode('utf-8')
+    return 'header.{}.signature'.format(base64.urlsafe_b64encode(payload).decode('ascii').rstrip('='))
+
+
+def _get_token_name(authorization):
+    payload = authorization.split('.')[1]
+    return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)).decode('utf-8'))['name']
+
+
+def _get_timestamp(days_ago):
+    return time.strftime('%Y-%m-%dT%H:%M:%S.1234567Z', time.gmtime(time.time() - days_ago * 24 * 3600))
+
+
+def _get_response(status_code=200, body=None, headers=None):
+    response = mock.MagicMock(status_code=status_code, headers=headers or {})
+    response.json.return_value = body
+    response.content = json.dumps(body).encode('utf-8')
+    return response
+
+
+def _registry_get(url, headers=None, params=None):  # pylint: disable=unused-argument
+    if url.endswith('/v2/'):
+        return _get_response(401, headers={
+            'WWW-Authenticate': 'Bearer realm="https://myregistry.azurecr.io/oauth2/token",'
+                                'service="myregistry.azurecr.io"'})
+    if url.endswith('/v2/_catalog'):
+        return _get_response(body={'repositories': ['repo0', 'repo1']},
+                             headers={'link': '</v2/_catalog?last=repo1&n=2>; rel="next"'})
+    if url.endswith('/v2/_catalog?last=repo1&n=2'):
+        return _get_response(body={'repositories': ['repo2']})
+    if '/_acr/' in url:
+        repository = url.split('/_acr/')[1].split('/')[0]
+        return _get_response(body={'manifests': [
+            {'digest': 'sha256:{}{}'.format(repository, i), 'tags': ['ci-{}'.format(i)],
+             'timestamp': _get_timestamp(i * 2)} for i in range(5)]})
+    # the tags of a repository are listed with a token of the repository
+    repository = url.split('/v2/')[1].split('/')[0]
+    if _get_token_name(headers['Authorization']) != repository:
+        return _get_response(401)
+    return _get_response(body={'tags': ['{}-v1'.format(repository), '{}-v2'.format(repository)]})
+
+
+def _registry_post(url, content, headers=None):  # pylint: disable=unused-argument
+    if url.endswith('/oauth2/exchange'):
+        return _get_response(body={'refresh_token': _get_token('refresh')})
+    scope = dict(x.split('=') for x in content.split('&'))['scope']
+    repository = scope.split('%3A')[1] if scope.startswith('repository') else 'catalog'
+    return _get_response(body={'access_token': _get_token(repository)})
+
+
+def _set_up_registry(profile_class, get_registry_by_name, validate_managed_registry, *get_registry_sessions):
+    """Sets up the mocks of a registry accessed with AAD tokens and returns its session."""
+    profile = profile_class.return_value
+    profile.get_current_account_user.return_value = 'user@contoso.com'
+    profile.get_subscription.return_value = {'tenantId': 'tenant'}
+    profile.get_refresh_token.return_value = (None, 'aad_refresh', 'aad_access', 'tenant')
+
+    registry = mock.MagicMock(login_server='myregistry.azurecr.io')
+    registry.sku.name = 'Basic'
+    get_registry_by_name.return_value = (registry, 'rg')
+    validate_managed_registry.return_value = (registry, 'rg')
+
+    session = mock.MagicMock()
+    session.get.side_effect = _registry_get
+    session.post.side_effect = _registry_post
+    session.delete.return_value = _get_response(202)
+    for get_registry_session in get_registry_sessions:
+        get_registry_session.return_value = session
+    return session
+
+
+class TestAcrRepository(unittest.TestCase):
+
+    def test_filter_manifests_to_purge(self):
+        manifests = [
+            {'digest': 'a', 'tags': ['ci-1'], 'timestamp': _get_timestamp(1)},
+            {'digest': 'b', 'tags': ['ci-2', 'latest'], 'timestamp': _get_timestamp(10)},
+            {'digest': 'c', 'tags': [], 'timestamp': _get_timestamp(20)},
+            {'digest': 'd', 'tags': ['ci-3'], 'lastUpdateTime': _get_timestamp(30)},
+            {'digest': 'e', 'tags': ['ci-4'], 'timestamp': _get_timestamp(2)},
+        ]
+
+        def _purged(**kwargs):
+            return [m['digest'] for m in _filter_manifests_to_purge(manifests, **kwargs)]
+
+        self.assertEqual(_purged(tag_filter='ci-.*'), ['a', 'e', 'd'])
+        self.assertEqual(_purged(tag_filter='ci-'), [])
+        self.assertEqual(_purged(tag_filter='ci-.*', untagged=True), ['a', 'e', 'c', 'd'])
+        self.assertEqual(_purged(untagged=True), ['c'])
+        self.assertEqual(_purged(tag_filter='ci-.*', keep=2), ['d'])
+        self.assertEqual(_purged(tag_filter='.*', older_than=5), ['b', 'd'])
+
+    @mock.patch.object(_docker_utils, '_token_cache', None)
+    @mock.patch('azure.cli.command_modules.acr.repository.get_registry_session', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr._docker_utils.get_registry_session', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr.repository.validate_managed_registry', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr._docker_utils.get_registry_by_name', autospec=True)
+    @mock.patch('azure.cli.core._profile.Profile', autospec=True)
+    def test_repository_purge(self, *mocks):
+        session = _set_up_registry(*mocks)
+
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': tempfile.mkdtemp()}):
+            with self.assertRaises(CLIError):
+                acr_repository_purge('myregistry', repository='repo0')
+
+            # the manifests of every repository are listed once
+            results = acr_repository_purge('myregistry', tag_filter='ci-.*', keep=1, older_than=3, dry_run=True)
+            self.assertEqual([(r['repository'], r['digest']) for r in results],
+                             [('repo{}'.format(i), 'sha256:repo{}{}'.format(i, j))
+                              for i in range(3) for j in (2, 3, 4)])
+            self.assertEqual(len([c for c in session.get.call_args_list if '/_acr/' in c[0][0]]), 3)
+            session.delete.assert_not_called()
+
+            # the deletes use the token of their repository and report failures once all are done
+            responses = {'sha256:repo04': _get_response(404)}
+            session.delete.side_effect = lambda url, headers: responses.get(url.split('/')[-1], _get_response(202))
+            with mock.patch('azure.cli.core.application.APPLICATION.get_progress_controller', autospec=True):
+                with self.assertRaises(CLIError) as ex:
+                    acr_repository_purge('myregistry', tag_filter='ci-.*', keep=1, older_than=3, rate_limit=0,
+                                         yes=True)
+        self.assertEqual(str(ex.exception), '1 of 9 manifests failed to delete.')
+        deleted = sorted((c[0][0].split('//v2/')[1], _get_token_name(c[1]['headers']['Authorization']))
+                         for c in session.delete.call_args_list)
+        self.assertEqual(deleted, [('repo{}/manifests/sha256:repo{}{}'.format(i, i, j), 'repo{}'.format(i))
+                                   for i in range(3) for j in (2, 3, 4)])
+
+    @mock.patch.object(_docker_utils, '_token_cache', None)
+    @mock.patch('azure.cli.command_modules.acr.repository.get_registry_session', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr._docker_utils.get_registry_session', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr.repository.validate_managed_registry', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr._docker_utils.get_registry_by_name', autospec=True)
+    @mock.patch('azure.cli.core._profile.Profile', autospec=True)
+    def test_repository_list_with_tags_caches_tokens(self, profile_class, *mocks):
+        session = _set_up_registry(profile_class, *mocks)
+        expected = [{'name': 'repo{}'.format(i), 'tags': ['repo{}-v1'.format(i), 'repo{}-v2'.format(i)]}
+                    for i in range(3)]
+
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': tempfile.mkdtemp()}):
+            self.assertEqual(acr_repository_list('myregistry', show_tags=True), expected)
+            # the page size is requested from the registry
+            self.assertEqual(session.get.call_args_list[1][1]['params'], {'n': 100})
+            # a single challenge and exchange, and an access token per scope
+            self.assertEqual(len([c for c in session.post.call_args_list if c[0][0].endswith('exchange')]), 1)
+            self.assertEqual(len(session.post.call_args_list), 5)
+            # the account of the tokens is resolved once
+            self.assertEqual(profile_class.return_value.get_current_account_user.call_count, 1)
+
+            # the cached tokens are used by the next command
+            session.reset_mock()
+            with mock.patch.object(_docker_utils, '_token_cache', None):
+                self.assertEqual(acr_repository_list('myregistry', show_tags=True), expected)
+        session.post.assert_not_called()
+        self.assertFalse([c for c in session.get.call_args_list if c[0][0].endswith('/v2/')])
+
+    @mock.patch.object(_docker_utils, '_token_cache', None)
+    def test_expired_and_refused_tokens_are_not_reused(self):
+        key = _docker_utils._get_token_cache_key('access', 'myregistry.azurecr.io', 'user@contoso.com@tenant',
+                                                 'registry:catalog:*')
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': tempfile.mkdtemp()}):
+            _docker_utils._cache_token(key, _get_token('expired', expires_in=60))
+            self.assertIsNone(_docker_utils._get_cached_token(key))
+
+            token = _get_token('catalog')
+            _docker_utils._cache_token(key, token)
+            self.assertEqual(_docker_utils._get_cached_token(key)['token'], token)
+            _docker_utils.invalidate_cached_token(token)
+            self.assertIsNone(_docker_utils._get_cached_token(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -58,6 +58,6 @@ setup(
         'azure.cli.command_modules.acr',
     ],
     install_requires=DEPENDENCIES,
-    package_data={'azure.cli.command_modules.acr': ['template.json', 'template_new_storage.json', 'template_existing_storage.json']},
+    package_data={'azure.cli.command_modules.acr': ['template.json', 'template_new_storage.json', 'template_existing_storage.json', '_argument_manifest.json', '_help_index.json']},
     cmdclass=cmdclass
 )
@@ -63,6 +63,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.acs'
     ],
+    package_data={'azure.cli.command_modules.acs': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )
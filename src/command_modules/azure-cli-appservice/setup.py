@@ -61,6 +61,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.appservice'
     ],
+    package_data={'azure.cli.command_modules.appservice': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )
@@ -305,6 +305,7 @@ helps['batch job-schedule reset'] = """
 helps['batch task create'] = """
     type: command
     short-summary: Create Batch tasks.
+    long-summary: The tasks of a JSON file which holds an array of tasks are submitted in chunks of 100, 10 chunks at a time. The number of concurrent chunks is set by `max_concurrent_task_requests` in the `batch` section of the configuration. Tasks which fail with a server error, e.g. as the service is busy, are resubmitted.
 """
 
 helps['batch task reset'] = """
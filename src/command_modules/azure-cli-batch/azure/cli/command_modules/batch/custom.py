@@ -5,6 +5,8 @@
 
 import json
 import base64
+import time
+import types
 from six.moves.urllib.parse import urlsplit  # pylint: disable=import-error
 
 from msrest.exceptions import DeserializationError, ValidationError, ClientRequestError
@@ -17,7 +19,7 @@ from azure.mgmt.batch.operations import (ApplicationPackageOperations)
 from azure.batch.models import (CertificateAddParameter, PoolStopResizeOptions, PoolResizeParameter,
                                 PoolResizeOptions, JobListOptions, JobListFromJobScheduleOptions,
                                 TaskAddParameter, TaskConstraints, PoolUpdatePropertiesParameter,
-                                StartTask, BatchErrorException)
+                                StartTask, BatchErrorException, TaskAddStatus)
 
 from azure.cli.core.util import CLIError
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
@@ -26,6 +28,9 @@ import azure.cli.core.azlogging as azlogging
 
 logger = azlogging.get_az_logger(__name__)
 MAX_TASKS_PER_REQUEST = 100
+# the attempts to add a task which fails with a server error, e.g. when the service is busy
+MAX_TASK_ADD_ATTEMPTS = 5
+_JSON_READ_SIZE = 64 * 1024
 
 
 def transfer_doc(source_func, *additional_source_funcs):
@@ -297,6 +302,135 @@ def list_job(client, job_schedule_id=None, filter=None,  # pylint: disable=redef
     return _handle_batch_exception(action)
 
 
+def _iter_json_array(f):
+    """Returns the JSON value of the file `f`, or a generator of the elements of the array if the
+    value is an array. The elements are read from the file as they are consumed, so a huge array
+    is never held in memory."""
+    decoder = json.JSONDecoder()
+    buffer = f.read(_JSON_READ_SIZE).lstrip()
+    if not buffer.startswith('['):
+        return json.loads(buffer + f.read())
+
+    def _elements(buffer):
+        index = 1
+        expect_element = True
+        while True:
+            while index < len(buffer) and buffer[index] in ' \t\r\n':
+                index += 1
+            if index < len(buffer) and buffer[index] == ']':
+                return
+            if index < len(buffer) and buffer[index] == ',' and not expect_element:
+                index += 1
+                expect_element = True
+                continue
+            if index < len(buffer) and not expect_element:
+                raise ValueError("Expecting ',' delimiter in JSON array.")
+            try:
+                if index == len(buffer):
+                    raise ValueError('Unterminated JSON array.')
+                element, index = decoder.raw_decode(buffer, index)
+            except ValueError:
+                # the element continues in the next chunk
+                chunk = f.read(_JSON_READ_SIZE)
+                if not chunk:
+                    raise
+                buffer, index = buffer[index:] + chunk, 0
+                continue
+            expect_element = False
+            yield element
+
+    return _elements(buffer)
+
+
+def _get_max_concurrent_task_requests():
+    from azure.cli.core._config import az_config
+    return max(az_config.getint('batch', 'max_concurrent_task_requests', fallback=10), 1)
+
+
+def _add_task_chunk(client, job_id, tasks):
+    """Adds `tasks` to the job with one request, or more if the request is too large, and
+    resubmits the tasks which fail with a server error. Returns the results of the tasks."""
+    results = {}
+    pending = tasks
+    for attempt in range(MAX_TASK_ADD_ATTEMPTS):
+        if attempt:
+            time.sleep(min(2 ** attempt, 30))
+            logger.info("Resubmitting %d tasks after server errors.", len(pending))
+        try:
+            submission = client.add_collection(job_id=job_id, value=pending)
+        except BatchErrorException as ex:
+            code = getattr(getattr(ex, 'error', None), 'code', None)
+            if code == 'RequestBodyTooLarge' and len(pending) > 1:
+                middle = len(pending) // 2
+                for half in (pending[:middle], pending[middle:]):
+                    results.update((r.task_id, r) for r in _add_task_chunk(client, job_id, half))
+                pending = []
+                break
+            if code not in ('ServerBusy', 'OperationTimedOut', 'InternalError') \
+                    or attempt == MAX_TASK_ADD_ATTEMPTS - 1:
+                raise
+            continue
+        retry_ids = set()
+        for result in submission.value:  # pylint: disable=no-member
+            results[result.task_id] = result
+            if result.status == TaskAddStatus.server_error:
+                retry_ids.add(result.task_id)
+        pending = [task for task in pending if task.id in retry_ids]
+        if not pending:
+            break
+    if pending:
+        logger.warning("%d tasks failed to be added after %d attempts.", len(pending), MAX_TASK_ADD_ATTEMPTS)
+    return [results[task.id] for task in tasks if task.id in results]
+
+
+def _add_task_collection(client, job_id, tasks, total=None):
+    """Adds the tasks of the iterable `tasks` to the job in chunks of MAX_TASKS_PER_REQUEST,
+    submitted concurrently. Only a bounded number of chunks is read ahead of the requests.
+    Returns the results of the tasks in the order of `tasks`."""
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from azure.cli.core.application import APPLICATION
+
+    def _chunks():
+        chunk = []
+        for task in tasks:
+            chunk.append(task)
+            if len(chunk) == MAX_TASKS_PER_REQUEST:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    max_workers = _get_max_concurrent_task_requests()
+    progress = APPLICATION.get_progress_controller(total is not None)
+    results = {}
+    running = {}
+    added = 0
+    chunks = enumerate(_chunks())
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while True:
+                while len(running) < max_workers * 2:
+                    index, chunk = next(chunks, (None, None))
+                    if chunk is None:
+                        break
+                    running[executor.submit(_add_task_chunk, client, job_id, chunk)] = index
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    results[index] = future.result()
+                    added += len(results[index])
+                    progress.add(message='Adding tasks', value=added, total_val=total)
+        except BaseException:
+            for future in running:
+                future.cancel()
+            progress.stop()
+            raise
+    progress.end()
+    return [result for index in sorted(results) for result in results[index]]
+
+
 @transfer_doc(TaskAddParameter, TaskConstraints)
 def create_task(client,
                 job_id, json_file=None, task_id=None, command_line=None, resource_files=None,
@@ -308,28 +442,31 @@ def create_task(client,
             client.add(job_id=job_id, task=task)
             return client.get(job_id=job_id, task_id=task.id)
 
-        submitted_tasks = []
-        for i in range(0, len(tasks), MAX_TASKS_PER_REQUEST):
-            submission = client.add_collection(
-                job_id=job_id,
-                value=tasks[i:i + MAX_TASKS_PER_REQUEST])
-            submitted_tasks.extend(submission.value)  # pylint: disable=no-member
-        return submitted_tasks
+        with open(json_file) as f:
+            return _add_task_collection(client, job_id, (_deserialize_task(t) for t in _iter_json_array(f)),
+                                        total=task_count)
+
+    def _deserialize_task(task_json):
+        try:
+            return client._deserialize('TaskAddParameter', task_json)  # pylint: disable=protected-access
+        except DeserializationError:
+            raise ValueError("JSON file '{}' is not formatted correctly.".format(json_file))
 
     task = None
-    tasks = []
+    task_count = 0
     if json_file:
         with open(json_file) as f:
-            json_obj = json.load(f)
-            try:
-                task = client._deserialize(  # pylint: disable=protected-access
-                    'TaskAddParameter', json_obj)
-            except DeserializationError:
-                try:
-                    tasks = client._deserialize(  # pylint: disable=protected-access
-                        '[TaskAddParameter]', json_obj)
-                except DeserializationError:
-                    raise ValueError("JSON file '{}' is not formatted correctly.".format(json_file))
+            json_obj = _iter_json_array(f)
+            if not isinstance(json_obj, types.GeneratorType):
+                task = _deserialize_task(json_obj)
+            else:
+                # the file is checked before any task is submitted, and read again as the tasks are
+                # submitted
+                for task_json in json_obj:
+                    if not isinstance(task_json, dict):
+                        raise ValueError("JSON file '{}' is not formatted correctly.".format(json_file))
+                    _deserialize_task(task_json)
+                    task_count += 1
     else:
         if command_line is None or task_id is None:
             raise ValueError("Missing required arguments.\nEither --json-file, "
@@ -3,11 +3,15 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import json
 import os
+import shutil
+import tempfile
 import unittest
 import datetime
 import isodate
 import mock
+from six import StringIO
 
 from msrest.exceptions import ValidationError, ClientRequestError
 from azure.batch import models, operations, BatchServiceClient
@@ -16,6 +20,7 @@ from azure.cli.core.util import CLIError
 
 from azure.cli.command_modules.batch import _validators
 from azure.cli.command_modules.batch import _command_type
+from azure.cli.command_modules.batch import custom
 
 
 class TestObj(object):  # pylint: disable=too-few-public-methods
@@ -685,3 +690,89 @@ class TestBatchLoader(unittest.TestCase):  # pylint: disable=protected-access
         with mock.patch.object(_command_type, 'get_op_handler', get_op_handler):
             result = self.command_pool.cmd.execute(kwargs=kwargs)
             self.assertEqual(result, "Pool Created")
+
+
+class TestBatchTaskCreate(unittest.TestCase):
+
+    def setUp(self):
+        creds = SharedKeyCredentials('test1', 'ZmFrZV9hY29jdW50X2tleQ==')
+        self.client = BatchServiceClient(creds, 'https://test1.westus.batch.azure.com/').task
+        self.submitted = []
+        self.attempts = {}
+
+        patcher = mock.patch('azure.cli.core.application.APPLICATION.get_progress_controller', autospec=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(custom.time, 'sleep')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        self.json_file = os.path.join(temp_dir, 'tasks.json')
+
+    def _write_tasks(self, count):
+        with open(self.json_file, 'w') as f:
+            json.dump([{'id': 'task{}'.format(i), 'commandLine': 'echo [{}]'.format(i)} for i in range(count)], f)
+
+    def _add_collection(self, job_id, value):
+        self.assertEqual(job_id, 'job')
+        self.submitted.append([t.id for t in value])
+        if len(value) > 60:
+            error = models.BatchError(code='RequestBodyTooLarge',
+                                      message=models.ErrorMessage('en-US', 'The request body is too large'))
+            raise models.BatchErrorException(lambda *_: error, None)
+        results = []
+        for task in value:
+            # every tenth task is throttled on its first submission
+            self.attempts[task.id] = self.attempts.get(task.id, 0) + 1
+            busy = task.id.endswith('0') and self.attempts[task.id] == 1
+            results.append(models.TaskAddResult(
+                status=models.TaskAddStatus.server_error if busy else models.TaskAddStatus.success,
+                task_id=task.id))
+        return models.TaskAddCollectionResult(value=results)
+
+    def test_batch_iter_json_array(self):
+        with mock.patch.object(custom, '_JSON_READ_SIZE', 7):
+            self._write_tasks(30)
+            with open(self.json_file) as f:
+                self.assertEqual([t['id'] for t in custom._iter_json_array(f)],
+                                 ['task{}'.format(i) for i in range(30)])
+            for content in ['[{"id": "a"} {"id": "b"}]', '[{"id": "a"},', '[{"id": "a"']:
+                with self.assertRaises(ValueError):
+                    list(custom._iter_json_array(StringIO(content)))
+            self.assertEqual(custom._iter_json_array(StringIO('{"id": "a"}')), {'id': 'a'})
+
+    def test_batch_create_tasks_from_json_file(self):
+        self._write_tasks(250)
+        with mock.patch.object(self.client, 'add_collection', side_effect=self._add_collection):
+            results = custom.create_task(self.client, 'job', json_file=self.json_file)
+
+        self.assertEqual([r.task_id for r in results], ['task{}'.format(i) for i in range(250)])
+        self.assertTrue(all(r.status == models.TaskAddStatus.success for r in results))
+        # the chunks too large are split, and the throttled tasks are resubmitted
+        first_submissions = [s for s in self.submitted if len(s) >= 50]
+        self.assertEqual(sorted(len(s) for s in first_submissions), [50, 50, 50, 50, 50, 100, 100])
+        retried = sorted(t for s in self.submitted if len(s) < 50 for t in s)
+        self.assertEqual(retried, sorted('task{}'.format(i) for i in range(0, 250, 10)))
+
+    def test_batch_create_tasks_invalid_json_file(self):
+        with open(self.json_file, 'w') as f:
+            f.write('[{"id": "task0", "commandLine": "echo"}, 1]')
+        with mock.patch.object(self.client, 'add_collection') as add_collection:
+            with self.assertRaises(ValueError):
+                custom.create_task(self.client, 'job', json_file=self.json_file)
+            add_collection.assert_not_called()
+
+    def test_batch_create_tasks_invalid_task_in_json_file(self):
+        # the file is rejected before the tasks of the first chunks are added to the job
+        self._write_tasks(250)
+        with open(self.json_file) as f:
+            tasks = json.load(f)
+        tasks[-1]['constraints'] = {'maxWallClockTime': 'one hour'}
+        with open(self.json_file, 'w') as f:
+            json.dump(tasks, f)
+        with mock.patch.object(self.client, 'add_collection') as add_collection:
+            with self.assertRaises(ValueError):
+                custom.create_task(self.client, 'job', json_file=self.json_file)
+            add_collection.assert_not_called()
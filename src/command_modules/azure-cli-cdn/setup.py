@@ -59,6 +59,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.cdn',
     ],
+    package_data={'azure.cli.command_modules.cdn': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass,
 )
@@ -55,6 +55,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.configure',
     ],
+    package_data={'azure.cli.command_modules.configure': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass,
 )
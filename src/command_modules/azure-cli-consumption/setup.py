@@ -58,6 +58,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.consumption',
     ],
+    package_data={'azure.cli.command_modules.consumption': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass,
 )
@@ -60,6 +60,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.cosmosdb',
     ],
+    package_data={'azure.cli.command_modules.cosmosdb': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass,
 )
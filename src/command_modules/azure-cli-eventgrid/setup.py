@@ -57,6 +57,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.eventgrid'
     ],
+    package_data={'azure.cli.command_modules.eventgrid': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )
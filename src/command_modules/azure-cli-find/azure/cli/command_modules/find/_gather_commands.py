@@ -3,8 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-import yaml
-
+from azure.cli.core._help_index import get_help_data
 from azure.cli.core.commands import _update_command_definitions
 from azure.cli.core.help_files import helps
 
@@ -48,7 +47,7 @@ def build_command_table():
         data[cmd] = com_descip
 
     for cmd in helps:
-        diction_help = yaml.load(helps[cmd])
+        diction_help = get_help_data(cmd)
         if cmd not in data:
             data[cmd] = {
                 'short-summary': diction_help.get(
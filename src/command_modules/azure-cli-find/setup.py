@@ -56,6 +56,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.find',
     ],
+    package_data={'azure.cli.command_modules.find': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass,
 )
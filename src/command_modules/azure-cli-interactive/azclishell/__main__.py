@@ -19,7 +19,7 @@ from azclishell.color_styles import style_factory
 from azclishell.frequency_heuristic import frequent_user
 
 from azure.cli.core.application import APPLICATION
-from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
+from azure.cli.core._session import ACCOUNT, CONFIG, SESSION, INDEX
 from azure.cli.core._environment import get_config_dir as cli_config_dir
 from azure.cli.core.commands.client_factory import ENV_ADDITIONAL_USER_AGENT
 import azure.cli.core.azlogging as azlogging
@@ -41,6 +41,7 @@ def main(style=None):
     ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
     CONFIG.load(os.path.join(azure_folder, 'az.json'))
     SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+    INDEX.load(os.path.join(azure_folder, 'commandIndex.json'))
 
     config = azclishell.configuration.CONFIGURATION
     shell_config_dir = azclishell.configuration.get_config_dir
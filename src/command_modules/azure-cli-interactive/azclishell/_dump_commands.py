@@ -9,8 +9,8 @@ from importlib import import_module
 import json
 import os
 import pkgutil
-import yaml
 
+from azure.cli.core._help_index import get_help_data
 from azure.cli.core.application import APPLICATION, Configuration
 from azure.cli.core.commands import _update_command_definitions, BLACKLISTED_MODS
 from azure.cli.core.help_files import helps
@@ -52,7 +52,7 @@ class LoadFreshTable(object):
     def load_help_files(self, data):
         """ loads all the extra information from help files """
         for cmd in helps:
-            diction_help = yaml.load(helps[cmd])
+            diction_help = get_help_data(cmd)
             # extra descriptions
             if "short-summary" in diction_help:
                 if cmd in data:
@@ -22,7 +22,7 @@ GLOBAL_PARAM_DESCRIPTIONS = {
     '--help': 'Get more information about a command',
     '-h': "Get more information about a command"
 }
-OUTPUT_CHOICES = ['json', 'tsv', 'table', 'jsonc']
+OUTPUT_CHOICES = ['json', 'tsv', 'table', 'jsonc', 'jsonl']
 OUTPUT_OPTIONS = ['--output', '-o']
 GLOBAL_PARAM = list(GLOBAL_PARAM_DESCRIPTIONS.keys())
 
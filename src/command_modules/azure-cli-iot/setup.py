@@ -62,6 +62,7 @@ setup(
         'azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.models',
         'azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.operations',
     ],
+    package_data={'azure.cli.command_modules.iot': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )
@@ -61,6 +61,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.keyvault'
     ],
+    package_data={'azure.cli.command_modules.keyvault': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass,
 )
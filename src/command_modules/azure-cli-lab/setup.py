@@ -54,6 +54,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.lab'
     ],
+    package_data={'azure.cli.command_modules.lab': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )
@@ -55,7 +55,8 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.monitor'
     ],
-    package_data={'azure.cli.command_modules.monitor': ['autoscale-parameters-template.json']},
+    package_data={'azure.cli.command_modules.monitor': ['autoscale-parameters-template.json', '_argument_manifest.json',
+                                                        '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )
@@ -725,10 +725,17 @@ helps['network dns zone export'] = """
 helps['network dns zone import'] = """
     type: command
     short-summary: Create a DNS zone using a DNS zone file.
+    long-summary: >
+        Only the record sets which differ from the existing record sets of the zone are imported.
+        Set `dns_max_concurrent_requests` in the `network` section of the configuration to change
+        the number of concurrent requests (10 by default).
     examples:
         - name: Import a local zone file into a DNS zone resource.
           text: >
             az network dns zone import -g MyResourceGroup -n MyZone -f /path/to/zone/file
+        - name: Show the record sets the import of a zone file would change.
+          text: >
+            az network dns zone import -g MyResourceGroup -n MyZone -f /path/to/zone/file --dry-run
 """
 
 helps['network dns zone list'] = """
@@ -759,6 +759,7 @@ register_cli_argument('network dns zone', 'resolution_vnets', ignore_type)
 # register_cli_argument('network dns zone', 'resolution_vnets', arg_group='Private Zone', nargs='+', help='Space separated names or IDs of virtual networks that resolve records in this DNS zone.', validator=get_vnet_validator('resolution_vnets'))
 
 register_cli_argument('network dns zone import', 'file_name', options_list=('--file-name', '-f'), type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to import')
+register_cli_argument('network dns zone import', 'dry_run', action='store_true', help='Show the record sets which would be created or updated, without importing them.')
 register_cli_argument('network dns zone export', 'file_name', options_list=('--file-name', '-f'), type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to save')
 register_cli_argument('network dns zone update', 'if_none_match', ignore_type)
 
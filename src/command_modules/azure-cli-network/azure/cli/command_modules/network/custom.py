@@ -2804,7 +2804,7 @@ def _build_record(data):
         elif record_type == 'cname':
             return CnameRecord(data['alias'])
         elif record_type == 'mx':
-            return MxRecord(data['preference'], data['host'])
+            return MxRecord(int(data['preference']), data['host'])
         elif record_type == 'ns':
             return NsRecord(data['host'])
         elif record_type == 'ptr':
@@ -2822,8 +2822,94 @@ def _build_record(data):
                        .format(record_type, data['name'], ke))
 
 
+MAX_RECORD_SET_ATTEMPTS = 5
+
+
+def _get_max_concurrent_dns_requests():
+    from azure.cli.core._config import az_config
+    return max(az_config.getint('network', 'dns_max_concurrent_requests', fallback=10), 1)
+
+
+def _get_record_count(record_set):
+    records = getattr(record_set, _type_to_property_name(record_set.type))
+    if records is None:
+        return 0
+    return len(records) if isinstance(records, list) else 1
+
+
+def _get_record_set_data(record_set):
+    """ The TTL and records of a record set, in a form which can be compared. """
+    if record_set is None:
+        return None
+    records = getattr(record_set, _type_to_property_name(record_set.type)) or []
+    if not isinstance(records, list):
+        records = [records]
+    return record_set.ttl, sorted(str(sorted(vars(r).items())) for r in records)
+
+
+def _create_or_update_record_set(client, resource_group_name, zone_name, record_set):
+    """ Puts the record set, retrying with backoff while the requests are throttled. """
+    import time
+    from azure.cli.core.commands._polling import PollingBackoff, get_retry_after
+    backoff = PollingBackoff(initial=1, ceiling=30)
+    for attempt in range(1, MAX_RECORD_SET_ATTEMPTS + 1):
+        try:
+            return client.record_sets.create_or_update(
+                resource_group_name, zone_name, record_set.name, record_set.type, record_set)
+        except CloudError as ex:
+            if attempt == MAX_RECORD_SET_ATTEMPTS or getattr(ex.response, 'status_code', None) != 429:
+                raise
+            delay = backoff.next_delay(get_retry_after(ex.response))
+            logger.debug("Retrying record set '%s' of type '%s' in %.1f seconds after throttling",
+                         record_set.name, record_set.type, delay)
+            time.sleep(delay)
+
+
+def _import_record_sets(client, resource_group_name, zone_name, record_sets):
+    """ Puts the record sets on a bounded pool of workers. Returns the number of records
+    imported; the failures are logged. """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from azure.cli.core.application import APPLICATION
+
+    total_records = sum(_get_record_count(rs) for rs in record_sets)
+    max_workers = _get_max_concurrent_dns_requests()
+    progress = APPLICATION.get_progress_controller(True)
+    imported = 0
+    running = {}
+    queued = iter(record_sets)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while True:
+                while len(running) < max_workers * 2:
+                    rs = next(queued, None)
+                    if rs is None:
+                        break
+                    running[executor.submit(
+                        _create_or_update_record_set, client, resource_group_name, zone_name, rs)] = rs
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    rs = running.pop(future)
+                    try:
+                        future.result()
+                    except CloudError as ex:
+                        logger.error("Failed to import record set '%s' of type '%s': %s", rs.name, rs.type, ex)
+                        continue
+                    imported += _get_record_count(rs)
+                    progress.add(message='Importing records', value=imported, total_val=total_records)
+        except BaseException:
+            for future in running:
+                future.cancel()
+            progress.stop()
+            raise
+    progress.end()
+    return imported
+
+
 # pylint: disable=too-many-statements
-def import_zone(resource_group_name, zone_name, file_name):
+def import_zone(resource_group_name, zone_name, file_name, dry_run=False):
+    from copy import deepcopy
     from azure.cli.core.util import read_file_content
     import sys
     file_text = read_file_content(file_name)
@@ -2867,47 +2953,56 @@ def import_zone(resource_group_name, zone_name, file_name):
                 _add_record(record_set, record, record_set_type,
                             is_list=record_set_type.lower() not in ['soa', 'cname'])
 
-    total_records = 0
-    for rs in record_sets.values():
-        try:
-            record_count = len(getattr(rs, _type_to_property_name(rs.type)))
-        except TypeError:
-            record_count = 1
-        total_records += record_count
-    cum_records = 0
-
     client = get_mgmt_service_client(DnsManagementClient)
-    print('== BEGINNING ZONE IMPORT: {} ==\n'.format(zone_name), file=sys.stderr)
-    client.zones.create_or_update(resource_group_name, zone_name, Zone('global'))
+    if not dry_run:
+        print('== BEGINNING ZONE IMPORT: {} ==\n'.format(zone_name), file=sys.stderr)
+        client.zones.create_or_update(resource_group_name, zone_name, Zone('global'))
+
+    # list the existing record sets once, and only put the record sets which change
+    existing_record_sets = {}
+    try:
+        for rs in client.record_sets.list_by_dns_zone(resource_group_name, zone_name):
+            rs.type = rs.type.rsplit('/', 1)[1]
+            existing_record_sets[(rs.name.lower(), rs.type.lower())] = rs
+    except CloudError:
+        if not dry_run:
+            raise
+
+    total_records = 0
+    changes = []
     for rs in record_sets.values():
 
         rs.type = rs.type.lower()
         rs.name = '@' if rs.name == origin else rs.name
-
-        try:
-            record_count = len(getattr(rs, _type_to_property_name(rs.type)))
-        except TypeError:
-            record_count = 1
-        if rs.name == '@' and rs.type == 'soa':
-            root_soa = client.record_sets.get(resource_group_name, zone_name, '@', 'SOA')
-            rs.soa_record.host = root_soa.soa_record.host
-            rs.name = '@'
-        elif rs.name == '@' and rs.type == 'ns':
-            root_ns = client.record_sets.get(resource_group_name, zone_name, '@', 'NS')
+        existing = existing_record_sets.get((rs.name.lower(), rs.type))
+        if existing and rs.name == '@' and rs.type == 'soa':
+            rs.soa_record.host = existing.soa_record.host
+        elif existing and rs.name == '@' and rs.type == 'ns':
+            root_ns = deepcopy(existing)
             root_ns.ttl = rs.ttl
             rs = root_ns
-            rs.type = rs.type.rsplit('/', 1)[1]
-        try:
-            client.record_sets.create_or_update(
-                resource_group_name, zone_name, rs.name, rs.type, rs)
-            cum_records += record_count
-            print("({}/{}) Imported {} records of type '{}' and name '{}'"
-                  .format(cum_records, total_records, record_count, rs.type, rs.name),
-                  file=sys.stderr)
-        except CloudError as ex:
-            logger.error(ex)
+
+        total_records += _get_record_count(rs)
+        if _get_record_set_data(rs) != _get_record_set_data(existing):
+            changes.append((rs, existing))
+
+    if dry_run:
+        return [OrderedDict([
+            ('name', rs.name),
+            ('type', rs.type),
+            ('change', 'update' if existing else 'create'),
+            ('ttl', rs.ttl),
+            ('records', _get_record_count(rs)),
+            ('currentTtl', existing.ttl if existing else None),
+            ('currentRecords', _get_record_count(existing) if existing else None)
+        ]) for rs, existing in changes]
+
+    unchanged_records = total_records - sum(_get_record_count(rs) for rs, _ in changes)
+    print('{} of {} records are unchanged, importing {} record sets.'
+          .format(unchanged_records, total_records, len(changes)), file=sys.stderr)
+    imported = _import_record_sets(client, resource_group_name, zone_name, [rs for rs, _ in changes])
     print("\n== {}/{} RECORDS IMPORTED SUCCESSFULLY: '{}' =="
-          .format(cum_records, total_records, zone_name), file=sys.stderr)
+          .format(unchanged_records + imported, total_records, zone_name), file=sys.stderr)
 
 
 def add_dns_aaaa_record(resource_group_name, zone_name, record_set_name, ipv6_address):
@@ -7,6 +7,7 @@ import os
 import unittest
 
 from azure.cli.command_modules.network.zone_file import parse_zone_file
+from azure.cli.core.util import CLIError
 
 TEST_DIR = os.path.abspath(os.path.join(os.path.abspath(__file__), '..'))
 
@@ -287,8 +288,23 @@ class TestDnsZoneImport(unittest.TestCase):
         self._check_cname(zone, 'record.' + zn, 3600, 'bar.foo.com.')
         self._check_a(zone, 'test.' + zn, [(3600, '7.8.9.0')])
 
+    def test_zone_file_many_records(self):
+        zn = 'example.com.'
+        lines = ['$ORIGIN example.com.', '@ IN SOA ns1.example.com. hostmaster ( 1', '    12h 15m 3w 3h )']
+        for i in range(1000):
+            lines.append('host{} 300 IN A 10.0.{}.{} ; comment "'.format(i, i // 256, i % 256))
+            lines.append('\tIN TXT ( "v=spf1 ~all;" \\"{}\\"'.format(i))
+            lines.append('\t         "x y" )')
+        zone = parse_zone_file('\n'.join(lines), zn)
+        self.assertEqual(len(zone), 1001)
+        self._check_a(zone, 'host999.' + zn, [(300, '10.0.3.231')])
+        self._check_txt(zone, 'host999.' + zn, [(3600, 20, None)])
+        self.assertEqual(zone['host999.' + zn]['txt'][0]['txt'], ['v=spf1 ~all;"999"x y'])
+
+        with self.assertRaises(CLIError):
+            parse_zone_file('\n'.join(lines[:-1]), zn)
+
     def test_zone_import_errors(self):
-        from azure.cli.core.util import CLIError
         for f in ['fail1', 'fail2', 'fail3', 'fail4', 'fail5']:
             with self.assertRaises(CLIError):
                 self._get_zone_object('{}.txt'.format(f), 'example.com')
@@ -0,0 +1,113 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import tempfile
+import unittest
+from copy import deepcopy
+
+import mock
+from msrestazure.azure_exceptions import CloudError
+
+from azure.mgmt.dns.models import ARecord, MxRecord, NsRecord, RecordSet, SoaRecord, SrvRecord
+
+from azure.cli.command_modules.network.custom import import_zone
+
+
+def _write_zone_file(lines):
+    fd, file_name = tempfile.mkstemp()
+    with os.fdopen(fd, 'w') as f:
+        f.write('\n'.join(lines))
+    return file_name
+
+
+def _record_set(name, record_type, ttl, **kwargs):
+    return RecordSet(name=name, type='Microsoft.Network/dnszones/' + record_type, ttl=ttl, **kwargs)
+
+
+def _get_dns_client(*record_sets):
+    client = mock.MagicMock()
+    existing = [
+        _record_set('@', 'SOA', 3600, soa_record=SoaRecord('ns1-01.azure-dns.com.', 'hostmaster.example.com.',
+                                                           1, 3600, 300, 2419200, 300)),
+        _record_set('@', 'NS', 172800, ns_records=[NsRecord('ns1-01.azure-dns.com.')]),
+        _record_set('www', 'A', 3600, arecords=[ARecord('1.2.3.5'), ARecord('1.2.3.4')])] + list(record_sets)
+    # the import changes the record sets it lists
+    client.record_sets.list_by_dns_zone.side_effect = lambda rg, zone: deepcopy(existing)
+    return client
+
+
+ZONE_FILE_LINES = [
+    '@ 3600 IN SOA ns1.example.com. hostmaster.example.com. ( 1 3600 300 2419200 300 )',
+    '@ 172800 NS ns1.example.com.',
+    'www 3600 A 1.2.3.4',
+    '    3600 A 1.2.3.5',
+    'mail 3600 MX 10 mail1.example.com.',
+    '_sip._tcp 3600 SRV 10 20 5060 sip.example.com.',
+    'new 300 A 5.6.7.8']
+
+
+class TestDnsZoneImportCommand(unittest.TestCase):
+
+    @mock.patch('azure.cli.core.application.APPLICATION.get_progress_controller', autospec=True)
+    @mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client', autospec=True)
+    def test_zone_import_dry_run(self, client_factory, _):
+        client = _get_dns_client(
+            _record_set('mail', 'MX', 3600, mx_records=[MxRecord(20, 'mail1.example.com.')]),
+            _record_set('_sip._tcp', 'SRV', 3600, srv_records=[SrvRecord(10, 20, 5060, 'sip.example.com.')]))
+        client_factory.return_value = client
+
+        changes = import_zone('rg', 'example.com', _write_zone_file(ZONE_FILE_LINES), dry_run=True)
+
+        self.assertEqual([(c['name'], c['type'], c['change']) for c in changes],
+                         [('mail', 'mx', 'update'), ('new', 'a', 'create')])
+        self.assertEqual(changes[0]['currentRecords'], 1)
+        client.zones.create_or_update.assert_not_called()
+        client.record_sets.create_or_update.assert_not_called()
+
+    @mock.patch('azure.cli.core.application.APPLICATION.get_progress_controller', autospec=True)
+    @mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client', autospec=True)
+    def test_zone_import_skips_unchanged_record_sets(self, client_factory, _):
+        client = _get_dns_client(
+            _record_set('mail', 'MX', 3600, mx_records=[MxRecord(10, 'mail1.example.com.')]),
+            _record_set('_sip._tcp', 'SRV', 3600, srv_records=[SrvRecord(10, 20, 5060, 'sip.example.com.')]),
+            _record_set('new', 'A', 300, arecords=[ARecord('5.6.7.8')]))
+        client_factory.return_value = client
+
+        changes = import_zone('rg', 'example.com', _write_zone_file(ZONE_FILE_LINES), dry_run=True)
+        self.assertEqual(changes, [])
+
+        import_zone('rg', 'example.com', _write_zone_file(ZONE_FILE_LINES))
+        client.record_sets.create_or_update.assert_not_called()
+
+    @mock.patch('time.sleep', autospec=True)
+    @mock.patch('azure.cli.core.application.APPLICATION.get_progress_controller', autospec=True)
+    @mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client', autospec=True)
+    def test_zone_import_puts_changed_record_sets(self, client_factory, _, sleep):
+        client = _get_dns_client(
+            _record_set('mail', 'MX', 3600, mx_records=[MxRecord(20, 'mail1.example.com.')]))
+        client_factory.return_value = client
+        throttled = mock.MagicMock(status_code=429, headers={'Retry-After': '1'}, text='throttled')
+        throttled.json.side_effect = ValueError()
+        responses = {'mail': [CloudError(throttled), None]}
+
+        def _create_or_update(rg, zone, name, record_type, record_set):
+            response = responses.get(name, [None]).pop(0)
+            if response:
+                raise response
+            return record_set
+
+        client.record_sets.create_or_update.side_effect = _create_or_update
+        import_zone('rg', 'example.com', _write_zone_file(ZONE_FILE_LINES))
+
+        sleep.assert_called_once_with(1)
+        client.zones.create_or_update.assert_called_once()
+        self.assertEqual(client.record_sets.list_by_dns_zone.call_count, 1)
+        self.assertEqual(sorted(c[0][2] for c in client.record_sets.create_or_update.call_args_list),
+                         ['_sip._tcp', 'mail', 'mail', 'new'])
+
+
+if __name__ == '__main__':
+    unittest.main()
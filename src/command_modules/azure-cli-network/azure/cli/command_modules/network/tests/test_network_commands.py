@@ -8,6 +8,8 @@
 import os
 import unittest
 
+import mock
+
 from azure.cli.core.util import CLIError
 from azure.cli.core.commands.arm import resource_id
 from azure.cli.core.commands.client_factory import get_subscription_id
@@ -1960,6 +1962,7 @@ class NetworkZoneImportExportTest(ResourceGroupVCRTestBase):
     def __init__(self, test_method):
         super(NetworkZoneImportExportTest, self).__init__(__file__, test_method, resource_group='cli_dns_zone_import_export')
 
+    @mock.patch('azure.cli.command_modules.network.custom._get_max_concurrent_dns_requests', lambda: 1)
     def test_network_dns_zone_import_export(self):
         self.execute()
 
@@ -35,12 +35,9 @@ Known limitations:
     'TXT', 'SRV', 'SPF', 'URI'
 """
 
-import copy
-import datetime
-import time
-import argparse
-from collections import OrderedDict
+import io
 import re
+from collections import OrderedDict
 
 import azure.cli.core.azlogging as azlogging
 from azure.cli.core.util import CLIError
@@ -49,7 +46,6 @@ from azure.cli.command_modules.network.zone_file.configs import SUPPORTED_RECORD
 from azure.cli.command_modules.network.zone_file.exceptions import InvalidLineException
 
 logger = azlogging.get_az_logger(__name__)
-semicolon_regex = re.compile(r'(?:"[^"]*")*[^\\](;.*)')
 date_regex_dict = {
     'w': {'regex': re.compile(r'(\d*w)'), 'scale': 86400 * 7},
     'd': {'regex': re.compile(r'(\d*d)'), 'scale': 86400},
@@ -58,360 +54,273 @@ date_regex_dict = {
     's': {'regex': re.compile(r'(\d*s)'), 'scale': 1}
 }
 
-
-class ZonefileLineParser(argparse.ArgumentParser):
-    def error(self, message):
-        """
-        Silent error message
-        """
-        raise InvalidLineException(message)
-
-
-class IncorrectParserException(Exception):
-    pass
-
-
-def _make_record_parser(parsers, rec_type, arg_defs):
-    """
-    Make a parser for a given type of DNS record
-    """
-    parser = ZonefileLineParser(rec_type)
-    parser.add_argument('name', type=str)
-
-    for arg in arg_defs:
-        nargs = arg[2] if len(arg) > 2 else 1
-        parser.add_argument(arg[0], type=arg[1], nargs=nargs)
-
-    parsers.append(parser)
+# a token keeps its quotes until the parentheses are removed, and a quote ends the token
+quoted_token_regex = re.compile(r'[^\s";]*"[^"]*"|[^\s";]*"[^"]*$|[^\s";]+|;')
+
+supported_records = frozenset(SUPPORTED_RECORDS)
+
+# the fields of each record type following the optional TTL and the record type
+record_fields = {
+    'SOA': [('host', str), ('email', str), ('serial', int), ('refresh', str), ('retry', str),
+            ('expire', str), ('minimum', str)],
+    'NS': [('host', str)],
+    'A': [('ip', str)],
+    'AAAA': [('ip', str)],
+    'CNAME': [('alias', str)],
+    'MX': [('preference', str), ('host', str)],
+    'TXT': [('txt', str)],
+    'PTR': [('host', str)],
+    'SRV': [('priority', int), ('weight', int), ('port', int), ('target', str)],
+    'SPF': [('txt', str)],
+    'URI': [('priority', int), ('weight', int), ('target', str)]
+}
 
 
-def _make_parser():
-    """
-    Make an array of parsers that can process different DNS record types
-    """
-    parsers = []
-
-    # parse $ORIGIN
-    origin = ZonefileLineParser('$ORIGIN')
-    origin.add_argument('DELIM', type=str)
-    origin.add_argument('value', type=str)
-    parsers.append(origin)
-
-    # parse $TTL
-    ttl = ZonefileLineParser('$TTL')
-    ttl.add_argument('DELIM', type=str)
-    ttl.add_argument('value', type=str)
-    parsers.append(ttl)
-
-    # parse each RR
-    _make_record_parser(parsers, 'SOA', [
-        ('ttl', str), ('DELIM', str),
-        ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str), ('minimum', str)
-    ])
-    _make_record_parser(parsers, 'SOA', [
-        ('DELIM', str), ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str), ('minimum', str)
-    ])
-    _make_record_parser(parsers, 'SOA', [
-        ('DELIM', str), ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str)
-    ])
-    _make_record_parser(parsers, 'NS', [('ttl', str, '?'), ('DELIM', str), ('host', str)])
-    _make_record_parser(parsers, 'A', [('ttl', str, '?'), ('DELIM', str), ('ip', str)])
-    _make_record_parser(parsers, 'AAAA', [('ttl', str, '?'), ('DELIM', str), ('ip', str)])
-    _make_record_parser(parsers, 'CNAME', [('ttl', str, '?'), ('DELIM', str), ('alias', str)])
-    _make_record_parser(parsers, 'MX', [('ttl', str, '?'), ('DELIM', str), ('preference', str), ('host', str)])
-    _make_record_parser(parsers, 'TXT', [('ttl', str), ('DELIM', str), ('txt', str, '+')])
-    _make_record_parser(parsers, 'TXT', [('DELIM', str), ('txt', str, '+')])
-    _make_record_parser(parsers, 'PTR', [('ttl', str, '?'), ('DELIM', str), ('host', str)])
-    _make_record_parser(parsers, 'SRV', [('ttl', str, '?'), ('DELIM', str), ('priority', int), ('weight', int), ('port', int), ('target', str)])
-    _make_record_parser(parsers, 'SPF', [('ttl', str, '?'), ('DELIM', str), ('txt', str)])
-    _make_record_parser(parsers, 'URI', [('ttl', str, '?'), ('DELIM', str), ('priority', int), ('weight', int), ('target', str)])
-
-    return parsers
-
-
-def _tokenize_line(line, quote_strings=False, infer_name=True):
+def _tokenize_escaped_line(line):
     """
-    Tokenize a line:
-    * split tokens on whitespace
-    * treat quoted strings as a single token
+    Tokenize a line containing escapes, one character at a time:
+    * stop at the first unquoted, unescaped ;
+    * split tokens on whitespace, unless escaped or quoted
+    * keep the quotes of quoted strings, a quote ending the token
     """
     ret = []
     escape = False
     quote = False
-    tokbuf = ""
-    firstchar = True
-    ll = list(line)
-    while len(ll) > 0:
-        c = ll.pop(0)
-        if c.isspace():
-            if firstchar:
-                # used by the _add_record_names method
-                tokbuf += '$NAME' if infer_name else ' '
-
-            if not quote and not escape:
-                # end of token
-                if len(tokbuf) > 0:
-                    ret.append(tokbuf)
+    comment_escape = False
+    comment_quote = False
+    tokbuf = ''
+    for c in line:
+        # find the ; denoting a comment, ignoring escaped semicolons and semicolons inside quotes
+        if c == '\\':
+            comment_escape = True
+        elif c == '"':
+            if comment_escape:
+                comment_escape = False
+            else:
+                comment_quote = not comment_quote
+        elif c == ';' and not comment_quote:
+            if not comment_escape:
+                break
+            comment_escape = False
+        elif c != ';':
+            comment_escape = False
 
-                tokbuf = ''
-            elif quote:
-                # in quotes
-                tokbuf += c
+        if c.isspace():
+            if quote:
+                tokbuf += ' ' if c == '\t' else c
             elif escape:
-                # escaped space
-                tokbuf += c
+                # escaped space, split again when the quotes are removed
+                tokbuf += ' '
                 escape = False
-            else:
+            elif tokbuf:
+                ret.append(tokbuf)
                 tokbuf = ''
         elif c == '\\':
             escape = True
         elif c == '"':
-            if not escape:
-                if quote:
-                    # end of quote
-                    if quote_strings:
-                        tokbuf += '"'
-                    ret.append(tokbuf)
-                    tokbuf = ''
-                    quote = False
-                else:
-                    # beginning of quote
-                    if quote_strings:
-                        tokbuf += '"'
-                    quote = True
-            else:
-                # append the escaped quote
+            if escape:
+                # keep the escaped quote
                 tokbuf += '\\"'
                 escape = False
+            elif quote:
+                ret.append(tokbuf + '"')
+                tokbuf = ''
+                quote = False
+            else:
+                tokbuf += '"'
+                quote = True
         else:
-            # normal character
             tokbuf += c
             escape = False
-        firstchar = False
 
-    if len(tokbuf.strip(' \r\n\t')):
+    if tokbuf.strip(' \r\n\t'):
         ret.append(tokbuf)
-
-    if len(ret) == 1 and ret[0] == '$NAME':
-        return []
-    else:
-        return ret
+    return ret
 
 
-def _find_comment_index(line):
+def _tokenize_line(line):
     """
-    Finds the index of a ; denoting a comment.
-    Ignores escaped semicolons and semicolons inside quotes
+    Tokenize a line up to its comment, and return its tokens and whether it starts with
+    whitespace, in which case the record uses the name of the previous record.
     """
-    escape = False
-    quote = False
-    for i, char in enumerate(line):
-        if char == '\\':
-            escape = True
-            continue
-        elif char == '"':
-            if escape:
-                escape = False
-                continue
-            else:
-                quote = not quote
-        elif char == ';':
-            if quote:
-                continue
-            elif escape:
-                escape = False
-                continue
-            else:
-                # comment denoting semicolon found
-                return i
-        else:
-            escape = False
-            continue
-    # no unquoted, unescaped ; found
-    return -1
+    if '\\' in line:
+        tokens = _tokenize_escaped_line(line)
+    elif '"' in line:
+        tokens = []
+        for match in quoted_token_regex.finditer(line.replace('\t', ' ')):
+            token = match.group(0)
+            if token == ';':
+                break
+            tokens.append(token)
+    else:
+        index = line.find(';')
+        tokens = (line if index == -1 else line[:index]).split()
+    return tokens, line[:1].isspace()
 
 
-def _serialize(tokens):
+def _unquote(token):
     """
-    Serialize tokens:
-    * quote whitespace-containing tokens
-    * escape semicolons
+    Remove the quotes of a token, splitting it on the whitespace outside of the quotes.
     """
-    ret = []
-    for tok in tokens:
-        if " " in tok:
-            tok = '"%s"' % tok
+    if len(token) > 1 and token[0] == '"' and token[-1] == '"' and token.count('"') == 2:
+        return [token[1:-1]]
 
-        if ";" in tok:
-            tok = tok.replace(";", "\;")
-
-        ret.append(tok)
-
-    return " ".join(ret)
-
-
-def _remove_comments(text):
-    """
-    Remove comments from a zonefile
-    """
     ret = []
-    lines = text.split("\n")
-    for line in lines:
-        if not line:
-            continue
-
-        index = _find_comment_index(line)
-        if index != -1:
-            line = line[:index]
-        if line:
-            ret.append(line)
-
-    return "\n".join(ret)
+    quote = False
+    tokbuf = ''
+    index = 0
+    while index < len(token):
+        c = token[index]
+        if c == '\\':
+            # an escaped quote
+            tokbuf += token[index:index + 2]
+            index += 1
+        elif c == '"':
+            if quote:
+                ret.append(tokbuf)
+                tokbuf = ''
+            quote = not quote
+        elif c == ' ' and not quote:
+            if tokbuf:
+                ret.append(tokbuf)
+            tokbuf = ''
+        else:
+            tokbuf += c
+        index += 1
+    if tokbuf.strip(' \r\n\t'):
+        ret.append(tokbuf)
+    return ret
 
 
-def _flatten(text):
+def _iter_record_tokens(lines):
     """
-    Flatten the text:
-    * make sure each record is on one line.
-    * remove parenthesis
-    * remove Windows line endings
+    Go through the lines once and yield the tokens of each record:
+    * join the lines of a record grouped in parentheses and remove the parentheses
+    * remove the quotes of quoted strings
+    * remove the CLASS, if present. The only class that gets used today (for all intents
+      and purposes) is 'IN'.
+    * ensure that a name is defined. Use previous record name if there is none.
     """
-    lines = text.split('\n')
-    SENTINEL = '%%%'
-
-    # tokens: sequence of non-whitespace separated by '' where a newline was
-    tokens = []
-    for l in (x for x in lines if len(x) > 0):
-        l = l.replace('\t', ' ')
-        tokens += _tokenize_line(l, quote_strings=True, infer_name=False)
-        tokens.append(SENTINEL)
-
-    # find (...) and turn it into a single line ("capture" it)
     capturing = False
     captured = []
+    infer_name = False
+    previous_record_name = None
 
-    flattened = []
-    while len(tokens) > 0:
-        tok = tokens.pop(0)
-
-        if tok == '$NAME':
-            tok = ' '
-
-        if not capturing and tok == SENTINEL:
-            # normal end-of-line
-            if len(captured) > 0:
-                flattened.append(" ".join(captured))
-                captured = []
+    for line in lines:
+        if line.endswith('\n'):
+            line = line[:-1]
+        tokens, indented = _tokenize_line(line)
+        if not tokens:
             continue
 
-        if tok.startswith("("):
-            # begin grouping
-            tok = tok.lstrip("(")
-            capturing = True
+        if not captured:
+            infer_name = indented
+        if capturing or '(' in line:
+            for token in tokens:
+                if token.startswith('('):
+                    # begin grouping
+                    token = token.lstrip('(')
+                    capturing = True
+                if capturing and token.endswith(')'):
+                    # end grouping. the end of the line ends the record
+                    token = token.rstrip(')')
+                    capturing = False
+                captured.append(token)
+        else:
+            captured.extend(tokens)
+        if capturing:
+            continue
 
-        if capturing and tok.endswith(")"):
-            # end grouping.  next end-of-line will turn this sequence into a flat line
-            tok = tok.rstrip(")")
-            capturing = False
+        if not infer_name and (not captured[0] or captured[0][0] == ' ' or captured[0] == '""'):
+            infer_name = True
+        record_tokens = []
+        for token in captured:
+            if '"' in token or ' ' in token:
+                record_tokens.extend(x for x in _unquote(token) if x and x.upper() != 'IN')
+            elif token and token.upper() != 'IN':
+                record_tokens.append(token)
+        captured = []
+        if not record_tokens:
+            continue
 
-        if tok != SENTINEL:
-            captured.append(tok)
+        if infer_name:
+            if previous_record_name is None:
+                raise CLIError('Unable to parse: {}'.format(_serialize(record_tokens)))
+            record_tokens.insert(0, previous_record_name)
+        elif not record_tokens[0].startswith('$'):
+            previous_record_name = record_tokens[0]
+        yield record_tokens
 
-    return "\n".join(flattened)
+    if capturing:
+        raise CLIError('Unable to parse: {} (missing closing parenthesis)'.format(_serialize(captured)))
 
 
-def _remove_class(text):
-    """
-    Remove the CLASS from each DNS record, if present.
-    The only class that gets used today (for all intents
-    and purposes) is 'IN'.
-    """
-    # see RFC 1035 for list of classes
-    lines = text.split("\n")
-    ret = []
-    for line in lines:
-        original_tokens = _tokenize_line(line)
-        tokens = []
-        for token in original_tokens:
-            if token.upper() != 'IN':
-                tokens.append(token)
-        ret.append(_serialize(tokens))
-    return "\n".join(ret)
-
-
-def _add_record_names(text):
+def _serialize(tokens):
     """
-    Go through each line of the text and ensure that
-    a name is defined.  Use previous record name if there is none.
+    Serialize tokens:
+    * quote whitespace-containing tokens
+    * escape semicolons
     """
-    global SUPPORTED_RECORDS
-
-    lines = text.split("\n")
     ret = []
-    previous_record_name = None
-
-    for line in lines:
-        tokens = _tokenize_line(line)
-        if not tokens:
-            continue
-
-        record_name = tokens[0]
-        if record_name == '$NAME':
-            tokens = [previous_record_name] + tokens[1:]
-        elif not record_name.startswith('$'):
-            previous_record_name = record_name
+    for tok in tokens:
+        if " " in tok:
+            tok = '"%s"' % tok
 
-        ret.append(_serialize(tokens))
+        if ";" in tok:
+            tok = tok.replace(";", "\;")
 
-    return "\n".join(ret)
+        ret.append(tok)
 
+    return " ".join(ret)
 
-def _parse_record(parser, record_token):
-    global SUPPORTED_RECORDS
 
+def _parse_record(record_tokens):
     # match parser to record type
     record_type = None
-    for i in range(3):
-        try:
-            if record_token[i] in SUPPORTED_RECORDS:
-                record_type = record_token[i]
-                break
-        except KeyError:
+    for token in record_tokens[:3]:
+        if token in supported_records:
+            record_type = token
             break
 
     if not record_type:
-        from azure.cli.core.util import CLIError
-        raise CLIError('Unable to determine record type: {}'.format(' '.join(record_token)))
-
-    # move the record type to the front of the token list so it will conform to argparse
-    if record_type != parser.prog:
-        raise IncorrectParserException
-
-    try:
-        rr, unmatched = parser.parse_known_args(record_token)
-        assert len(unmatched) == 0, "Unmatched fields: %s" % unmatched
-    except (SystemExit, AssertionError, InvalidLineException):
-        # invalid argument
-        raise InvalidLineException(' '.join(record_token))
-
-    record = rr.__dict__
-    record['type'] = record_type
-
-    # remove emtpy fields
-    for field in list(record.keys()):
-        if record[field] is None:
-            del record[field]
-
-    for key in record:
+        raise CLIError('Unable to determine record type: {}'.format(' '.join(record_tokens)))
+
+    if record_type.startswith('$'):
+        if len(record_tokens) != 2 or record_tokens[0].lower() != record_type.lower():
+            raise InvalidLineException(' '.join(record_tokens))
+        return {'DELIM': record_tokens[0], 'value': record_tokens[1], 'type': record_type}
+
+    # the TTL is optional. TXT records have any number of strings
+    fields = record_fields[record_type]
+    values = record_tokens[1:]
+    if record_type == 'TXT':
+        has_ttl = len(values) > 2 and values[1].lower() == 'txt'
+        min_values = 3 if has_ttl else 2
+        if len(values) < min_values:
+            raise InvalidLineException(' '.join(record_tokens))
+    elif len(values) == len(fields) + 2:
+        has_ttl = True
+    elif len(values) == len(fields) + 1:
+        has_ttl = False
+    else:
+        raise InvalidLineException(' '.join(record_tokens))
+
+    record = {'name': record_tokens[0]}
+    if has_ttl:
+        record['ttl'] = values[0]
+        values = values[1:]
+    if values[0].lower() != record_type.lower():
+        raise InvalidLineException(' '.join(record_tokens))
+    record['DELIM'] = values[0]
+    if record_type == 'TXT':
+        record['txt'] = values[1:] if len(values) > 2 else values[1]
+    else:
         try:
-            if len(record[key]) == 1:
-                record[key] = record[key][0]
-        except TypeError:
-            continue
-
+            for (field, field_type), value in zip(fields, values[1:]):
+                record[field] = field_type(value)
+        except ValueError:
+            raise InvalidLineException(' '.join(record_tokens))
+    record['type'] = record_type
     return record
 
 
@@ -464,16 +373,6 @@ def _post_process_ttl(zone):
                     record['ttl'] = ttl
 
 
-def _pre_process_txt_records(text):
-    """ This looks only for the cases of multiple text records not surrounded by quotes.
-    This must be done after flattening but before any tokenization occurs, as this strips out
-    the quotes. """
-    lines = text.split('\n')
-    for line in lines:
-        pass
-    return text
-
-
 def _post_process_txt_record(record, current_ttl):
     if not isinstance(record['txt'], list):
         record['txt'] = [record['txt']]
@@ -509,37 +408,20 @@ def _post_check_names(zone):
 
 def parse_zone_file(text, zone_name, ignore_invalid=False):
     """
-    Parse a zonefile into a dict
+    Parse a zonefile into a dict, in a single pass over its lines
     """
-    parsers = _make_parser()
-
-    text = _remove_comments(text)
-    text = _flatten(text)
-    text = _remove_class(text)
-    text = _pre_process_txt_records(text)
-    text = _add_record_names(text)
-
     zone_obj = OrderedDict()
-    record_lines = text.split("\n")
     current_origin = zone_name.rstrip('.') + '.'
     current_ttl = 3600
     soa_processed = False
 
-    for record_line in record_lines:
-        parse_match = False
-        record = None
-        for parser in parsers:
-            record_tokens = _tokenize_line(record_line)
-            try:
-                record = _parse_record(parser, record_tokens)
-                if record['DELIM'].lower() != record['type'].lower():
-                    raise IncorrectParserException
-                parse_match = True
-                break
-            except (InvalidLineException, IncorrectParserException):
+    for record_tokens in _iter_record_tokens(io.StringIO(text)):
+        try:
+            record = _parse_record(record_tokens)
+        except InvalidLineException:
+            if ignore_invalid:
                 continue
-        if not parse_match and not ignore_invalid:
-            raise CLIError('Unable to parse: {}'.format(record_line))
+            raise CLIError('Unable to parse: {}'.format(_serialize(record_tokens)))
 
         record_type = record['type'].lower()
         if record_type.lower() == '$origin':
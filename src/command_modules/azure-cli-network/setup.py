@@ -60,6 +60,7 @@ setup(
         'azure.cli.command_modules.network',
         'azure.cli.command_modules.network.zone_file'
     ],
+    package_data={'azure.cli.command_modules.network': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )
@@ -53,6 +53,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.rdbms'
     ],
+    package_data={'azure.cli.command_modules.rdbms': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )
@@ -84,7 +84,7 @@ cli_command(__name__, 'resource lock update', 'azure.cli.command_modules.resourc
 
 # Resource provider commands
 cli_command(__name__, 'provider list', 'azure.mgmt.resource.resources.operations.providers_operations#ProvidersOperations.list', cf_providers)
-cli_command(__name__, 'provider show', 'azure.mgmt.resource.resources.operations.providers_operations#ProvidersOperations.get', cf_providers, exception_handler=empty_on_404)
+cli_command(__name__, 'provider show', 'azure.cli.command_modules.resource.custom#show_provider', exception_handler=empty_on_404)
 cli_command(__name__, 'provider register', 'azure.cli.command_modules.resource.custom#register_provider')
 cli_command(__name__, 'provider unregister', 'azure.cli.command_modules.resource.custom#unregister_provider')
 cli_command(__name__, 'provider operation list', 'azure.cli.command_modules.resource.custom#list_provider_operations')
@@ -546,50 +546,116 @@ def delete_resource(resource_ids=None, resource_group_name=None,
     """
     Deletes the given resource(s).
     This function allows deletion of ids with dependencies on one another.
-    This is done with multiple passes through the given ids.
+    A resource is deleted once the resources which may depend on it are deleted, e.g. a virtual
+    network after its subnets and network interfaces, and independent resources are deleted
+    concurrently. A failed delete is retried after another resource is deleted.
     """
-    parsed_ids = _get_parsed_resource_ids(resource_ids) or [_create_parsed_id(resource_group_name,
-                                                                              resource_provider_namespace,
-                                                                              parent_resource_path,
-                                                                              resource_type,
-                                                                              resource_name)]
+    parsed_ids = list(_get_parsed_resource_ids(resource_ids) or [_create_parsed_id(resource_group_name,
+                                                                                   resource_provider_namespace,
+                                                                                   parent_resource_path,
+                                                                                   resource_type,
+                                                                                   resource_name)])
     to_be_deleted = [(_get_rsrc_util_from_parsed_id(id_dict, api_version), id_dict) for id_dict in parsed_ids]
+    dependencies = _get_delete_dependencies(resource_ids) if resource_ids else [set()]
 
-    results = []
-    from msrestazure.azure_exceptions import CloudError
-    while to_be_deleted:
-        logger.debug("Start new loop to delete resources.")
-        operations = []
-        failed_to_delete = []
-        for rsrc_utils, id_dict in to_be_deleted:
-            try:
-                operations.append(rsrc_utils.delete())
-                resource = resource_dict_to_id(**id_dict) if id_dict.get("subscription") else resource_name
-                logger.debug("deleting", resource)
-            except CloudError as e:
-                # request to delete failed, add parsed id dict back to queue
-                id_dict['exception'] = str(e)
-                failed_to_delete.append((rsrc_utils, id_dict))
-        to_be_deleted = failed_to_delete
-
-        # stop deleting if none deletable
-        if not operations:
-            break
-
-        # all operations return result before next pass
-        for operation in operations:
-            results.append(operation.result())
-
-    if to_be_deleted:
+    results, failed = _delete_resources_in_order(to_be_deleted, dependencies)
+
+    if failed:
         error_msg_builder = ['Some resources failed to be deleted:']
-        for _, id_dict in to_be_deleted:
+        for _, id_dict in failed:
             logger.debug(id_dict['exception'])
-            error_msg_builder.append(resource_dict_to_id(**id_dict))
+            error_msg_builder.append(resource_dict_to_id(**id_dict) if id_dict.get('subscription') else
+                                     id_dict['resource_name'])
         raise CLIError(os.linesep.join(error_msg_builder))
 
     return _single_or_collection(results)
 
 
+# the order in which resources of these types are deleted, since a resource may be referenced by
+# the resources of the types before it, e.g. a network interface by a virtual machine
+_RESOURCE_DELETE_TIERS = {
+    'microsoft.compute/virtualmachines': 0,
+    'microsoft.compute/virtualmachinescalesets': 0,
+    'microsoft.compute/availabilitysets': 1,
+    'microsoft.compute/disks': 1,
+    'microsoft.network/networkinterfaces': 1,
+    'microsoft.network/loadbalancers': 1,
+    'microsoft.network/applicationgateways': 1,
+    'microsoft.network/virtualnetworkgateways': 1,
+    'microsoft.network/publicipaddresses': 2,
+    'microsoft.network/virtualnetworks': 2,
+    'microsoft.network/networksecuritygroups': 3,
+    'microsoft.network/routetables': 3,
+}
+
+_MAX_CONCURRENT_DELETES = 10
+
+
+def _get_delete_dependencies(resource_ids):
+    """
+    Returns, for each resource id, the indexes of the resources which have to be deleted before
+    it: its child resources, and the resources of the types deleted before its type.
+    """
+    resource_ids = [rid.lower().rstrip('/') for rid in resource_ids]
+    tiers = []
+    for rid in resource_ids:
+        parts = parse_resource_id(rid)
+        resource_type = '{}/{}'.format(parts['namespace'], parts['type'])
+        tiers.append(None if 'child_type' in parts else _RESOURCE_DELETE_TIERS.get(resource_type))
+
+    dependencies = []
+    for rid, tier in zip(resource_ids, tiers):
+        dependencies.append(set(
+            i for i, (other_id, other_tier) in enumerate(zip(resource_ids, tiers))
+            if other_id.startswith(rid + '/') or
+            (tier is not None and other_tier is not None and other_tier < tier)))
+    return dependencies
+
+
+def _delete_resources_in_order(to_be_deleted, dependencies):
+    """
+    Deletes the resources of `to_be_deleted`, a list of (_ResourceUtils, parsed id), once the
+    resources at the indexes of their `dependencies` are deleted or failed to be deleted.
+    Returns the results of the deletes and the resources which could not be deleted.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from msrestazure.azure_exceptions import CloudError
+
+    def _delete(rsrc_utils, id_dict):
+        logger.debug("Deleting %s", resource_dict_to_id(**id_dict) if id_dict.get("subscription") else
+                     id_dict['resource_name'])
+        return rsrc_utils.delete().result()
+
+    results = []
+    waiting = set(range(len(to_be_deleted)))
+    failed = set()
+    running = {}
+    with ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_DELETES) as executor:
+        while True:
+            unfinished = waiting | set(running.values())
+            for index in sorted(waiting):
+                if not dependencies[index] & unfinished:
+                    waiting.remove(index)
+                    running[executor.submit(_delete, *to_be_deleted[index])] = index
+            if not running:
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                try:
+                    results.append(future.result())
+                except CloudError as e:
+                    logger.debug("Failed to delete, will retry after another resource is deleted: %s", e)
+                    to_be_deleted[index][1]['exception'] = str(e)
+                    failed.add(index)
+                    continue
+                # the failed deletes may have been blocked by the resource just deleted
+                waiting.update(failed)
+                failed.clear()
+
+    return results, [to_be_deleted[index] for index in sorted(failed | waiting)]
+
+
 def update_resource(parameters, resource_ids=None,
                     resource_group_name=None, resource_provider_namespace=None,
                     parent_resource_path=None, resource_type=None, resource_name=None, api_version=None):
@@ -654,8 +720,7 @@ def list_resources(resource_group_name=None,
     odata_filter = _list_resources_odata_filter_builder(resource_group_name,
                                                         resource_provider_namespace,
                                                         resource_type, name, tag, location)
-    resources = rcf.resources.list(filter=odata_filter)
-    return list(resources)
+    return rcf.resources.list(filter=odata_filter)
 
 
 def _list_resources_odata_filter_builder(resource_group_name=None,
@@ -705,6 +770,56 @@ def _list_resources_odata_filter_builder(resource_group_name=None,
     return ' and '.join(filters)
 
 
+_PROVIDER_CACHE_FILE_NAME = 'resourceProviders.json'
+
+
+def _get_provider_cache():
+    from azure.cli.core._config import az_config
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import CacheSession
+    cache = CacheSession(max_age=az_config.getint('resource', 'provider_cache_max_age', fallback=86400))
+    cache.load(os.path.join(get_config_dir(), _PROVIDER_CACHE_FILE_NAME))
+    return cache
+
+
+def _get_provider_cache_key(rcf, namespace):
+    from azure.cli.core.cloud import get_active_cloud_name
+    return '{}|{}|{}'.format(get_active_cloud_name(), rcf.config.subscription_id, namespace.lower())
+
+
+def _cache_provider(rcf, namespace, provider, cache=None):
+    cache = cache or _get_provider_cache()
+    resource_types = {t.resource_type.lower(): t.api_versions for t in provider.resource_types or []}
+    cache.set_value(_get_provider_cache_key(rcf, namespace), resource_types)
+    return resource_types
+
+
+def _get_resource_type_api_versions(rcf, namespace, resource_type):
+    """
+    Returns the api versions of a resource type, or None if the provider has no such type.
+    The resource types of the providers are cached per cloud and subscription. A provider is
+    fetched again once its cache expires, or when the cache misses the resource type.
+    """
+    cache = _get_provider_cache()
+    resource_types = cache.get_value(_get_provider_cache_key(rcf, namespace))
+    if resource_types is None or resource_type.lower() not in resource_types:
+        resource_types = _cache_provider(rcf, namespace, rcf.providers.get(namespace), cache)
+    return resource_types.get(resource_type.lower())
+
+
+def show_provider(resource_provider_namespace, expand=None):
+    """
+    Gets a resource provider, and refreshes the api versions of its resource types cached by the
+    generic resource commands.
+    :param expand: The $expand query parameter, e.g. 'resourceTypes/aliases' to include the
+    property aliases of the resource types.
+    """
+    rcf = _resource_client_factory()
+    provider = rcf.providers.get(resource_provider_namespace, expand=expand)
+    _cache_provider(rcf, resource_provider_namespace, provider)
+    return provider
+
+
 def get_providers_completion_list(prefix, **kwargs):  # pylint: disable=unused-argument
     rcf = _resource_client_factory()
     result = rcf.providers.list()
@@ -1621,20 +1736,17 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
 
     @staticmethod
     def resolve_api_version(rcf, resource_provider_namespace, parent_resource_path, resource_type):
-        provider = rcf.providers.get(resource_provider_namespace)
-
         # If available, we will use parent resource's api-version
         resource_type_str = (parent_resource_path.split('/')[0]
                              if parent_resource_path else resource_type)
 
-        rt = [t for t in provider.resource_types
-              if t.resource_type.lower() == resource_type_str.lower()]
-        if not rt:
+        api_versions = _get_resource_type_api_versions(rcf, resource_provider_namespace, resource_type_str)
+        if api_versions is None:
             raise IncorrectUsageError('Resource type {} not found.'
                                       .format(resource_type_str))
-        if len(rt) == 1 and rt[0].api_versions:
-            npv = [v for v in rt[0].api_versions if 'preview' not in v.lower()]
-            return npv[0] if npv else rt[0].api_versions[0]
+        if api_versions:
+            npv = [v for v in api_versions if 'preview' not in v.lower()]
+            return npv[0] if npv else api_versions[0]
         else:
             raise IncorrectUsageError(
                 'API version is required and could not be resolved for resource {}'
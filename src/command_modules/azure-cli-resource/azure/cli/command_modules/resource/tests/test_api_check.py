@@ -3,16 +3,20 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import shutil
+import tempfile
 import unittest
 
 try:
+    import unittest.mock as mock
     from unittest.mock import MagicMock
 except ImportError:
+    import mock
     from mock import MagicMock
 
 from azure.cli.core.util import CLIError
 from azure.cli.command_modules.resource.custom import (_ResourceUtils, _validate_resource_inputs,
-                                                       parse_resource_id)
+                                                       parse_resource_id, show_provider)
 
 
 class TestApiCheck(unittest.TestCase):
@@ -25,10 +29,13 @@ class TestApiCheck(unittest.TestCase):
         pass
 
     def setUp(self):
-        pass
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': self.temp_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def tearDown(self):
-        pass
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_parse_resource(self):
         parts = parse_resource_id('/subscriptions/00000/resourcegroups/bocconitestlabrg138089/'
@@ -72,8 +79,29 @@ class TestApiCheck(unittest.TestCase):
                                    resource_group_name='rg', rcf=rcf)
         self.assertEqual(res_utils.api_version, "2005-01-01-preview")
 
+    def test_resolve_api_version_cached(self):
+        rcf = self._get_mock_client()
+        for resource_type in ['Mock/test', 'Mock/preview', 'mock/TEST']:
+            _ResourceUtils(resource_type=resource_type, resource_name='vnet1', resource_group_name='rg', rcf=rcf)
+        rcf.providers.get.assert_called_once_with('Mock')
+
+        # the provider is fetched again for a resource type missing from the cache
+        rcf.providers.get.return_value.resource_types.append(self._get_mock_resource_type('new', ['2017-01-01']))
+        res_utils = _ResourceUtils(resource_type='Mock/new', resource_name='vnet1', resource_group_name='rg', rcf=rcf)
+        self.assertEqual(res_utils.api_version, "2017-01-01")
+        self.assertEqual(rcf.providers.get.call_count, 2)
+
+        # showing the provider refreshes the cache
+        rcf.providers.get.return_value.resource_types[1] = self._get_mock_resource_type('test', ['2017-06-01'])
+        with mock.patch('azure.cli.command_modules.resource.custom._resource_client_factory', return_value=rcf):
+            show_provider('Mock')
+        res_utils = _ResourceUtils(resource_type='Mock/test', resource_name='vnet1', resource_group_name='rg', rcf=rcf)
+        self.assertEqual(res_utils.api_version, "2017-06-01")
+        self.assertEqual(rcf.providers.get.call_count, 3)
+
     def _get_mock_client(self):
         client = MagicMock()
+        client.config.subscription_id = 'sub1'
         provider = MagicMock()
         provider.resource_types = [
             self._get_mock_resource_type('skip', ['2000-01-01-preview', '2000-01-01']),
@@ -18,7 +18,7 @@ except ImportError:
 from azure.cli.core.util import CLIError, get_file_json, shell_safe_json_parse
 from azure.cli.command_modules.resource.custom import \
     (_get_missing_parameters, _extract_lock_params, _process_parameters, _find_missing_parameters,
-     _prompt_for_parameters, _load_file_string_or_uri)
+     _prompt_for_parameters, _load_file_string_or_uri, delete_resource)
 
 
 def _simulate_no_tty():
@@ -302,5 +302,58 @@ class TestCustom(unittest.TestCase):
         self.assertTrue(str(list(results.keys())) in param_alpha_order)
 
 
+class TestDeleteResource(unittest.TestCase):
+    def setUp(self):
+        self.deleted = []
+        self.failures = {}
+        patcher = mock.patch('azure.cli.command_modules.resource.custom._get_rsrc_util_from_parsed_id',
+                             side_effect=self._get_rsrc_util)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_rsrc_util(self, id_dict, _):
+        from msrestazure.azure_exceptions import CloudError
+
+        def _delete():
+            name = id_dict['resource_name']
+            if self.failures.get(name):
+                self.failures[name] -= 1
+                raise CloudError(mock.MagicMock(status_code=400), 'failed to delete ' + name)
+            self.deleted.append(name)
+            return mock.Mock(**{'result.return_value': None})
+
+        return mock.Mock(**{'delete.side_effect': _delete})
+
+    @staticmethod
+    def _ids(*names):
+        prefix = '/subscriptions/sub1/resourceGroups/rg1/providers/'
+        return [prefix + n for n in names]
+
+    def test_delete_resources_in_dependency_order(self):
+        delete_resource(self._ids('Microsoft.Network/networkSecurityGroups/nsg1',
+                                  'Microsoft.Network/virtualNetworks/vnet1',
+                                  'Microsoft.Network/virtualNetworks/vnet1/subnets/subnet1',
+                                  'Microsoft.Network/networkInterfaces/nic1',
+                                  'Microsoft.Storage/storageAccounts/storage1',
+                                  'Microsoft.Compute/virtualMachines/vm1'))
+        order = {name: i for i, name in enumerate(self.deleted)}
+        self.assertEqual(len(order), 6)
+        self.assertLess(order['vm1'], order['nic1'])
+        self.assertLess(order['nic1'], order['vnet1'])
+        self.assertLess(order['subnet1'], order['vnet1'])
+        self.assertLess(order['vnet1'], order['nsg1'])
+
+    def test_delete_resources_retries_failed(self):
+        # storage1 fails until the unrelated disk1 is deleted, vm2 never gets deleted
+        self.failures = {'storage1': 1, 'vm2': 100}
+        with self.assertRaises(CLIError) as err:
+            delete_resource(self._ids('Microsoft.Storage/storageAccounts/storage1',
+                                      'Microsoft.Compute/virtualMachines/vm2',
+                                      'Microsoft.Compute/disks/disk1'))
+        self.assertEqual(sorted(self.deleted), ['disk1', 'storage1'])
+        self.assertIn('virtualMachines/vm2', str(err.exception))
+        self.assertNotIn('storage1', str(err.exception))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,6 +6,7 @@
 from __future__ import print_function
 
 import datetime
+import itertools
 import re
 import os
 import uuid
@@ -32,6 +33,18 @@ logger = get_az_logger(__name__)
 
 _CUSTOM_RULE = 'CustomRole'
 
+# role definition names, principal names and assignee object ids of all tenants, by tenant
+_ROLE_CACHE_FILE_NAME = 'roleCache.json'
+
+# object ids resolved per graph call, and graph calls in flight
+_OBJECT_IDS_CHUNK_SIZE = 250
+_MAX_CONCURRENT_GRAPH_CALLS = 5
+
+# assignments whose names are filled in at a time when streaming `role assignment list --all`
+_ASSIGNMENTS_BATCH_SIZE = 500
+
+_NOT_CACHED = object()
+
 
 def list_role_definitions(name=None, resource_group_name=None, scope=None,
                           custom_role_only=False):
@@ -163,22 +176,44 @@ def list_role_assignments(assignee=None, role=None, resource_group_name=None,
         scope = _build_role_scope(resource_group_name, scope,
                                   definitions_client.config.subscription_id)
 
-    assignments = _search_role_assignments(assignments_client, definitions_client,
-                                           scope, assignee, role,
-                                           include_inherited, include_groups)
+    assignments = _iter_role_assignments(assignments_client, definitions_client,
+                                         scope, assignee, role,
+                                         include_inherited, include_groups)
 
-    if not assignments:
+    cache = _get_role_cache()
+    definitions_scope = scope or ('/subscriptions/' + definitions_client.config.subscription_id)
+    if show_all:
+        # stream the assignments as they are listed rather than wait for all of them
+        return _iter_assignments_with_names(assignments, definitions_client, definitions_scope,
+                                            graph_client, cache)
+    return _fill_in_assignment_names(todict(list(assignments)), definitions_client,
+                                     definitions_scope, graph_client, cache)
+
+
+def _iter_assignments_with_names(assignments, definitions_client, definitions_scope,
+                                 graph_client, cache):
+    assignments = iter(assignments)
+    while True:
+        batch = list(itertools.islice(assignments, _ASSIGNMENTS_BATCH_SIZE))
+        if not batch:
+            return
+        for result in _fill_in_assignment_names(todict(batch), definitions_client,
+                                                definitions_scope, graph_client, cache):
+            yield result
+
+
+def _fill_in_assignment_names(results, definitions_client, definitions_scope, graph_client,
+                              cache):
+    if not results:
         return []
 
     # fill in logic names to get things understandable.
     # it's possible that associated roles and principals were deleted, and we just do nothing.
 
-    results = todict(assignments)
-
     # fill in role names
-    role_defs = list(definitions_client.list(
-        scope=scope or ('/subscriptions/' + definitions_client.config.subscription_id)))
-    role_dics = {i.id: i.properties.role_name for i in role_defs}
+    role_dics = _get_role_definition_names(
+        definitions_client, definitions_scope, graph_client.config.tenant_id, cache,
+        set(i['properties']['roleDefinitionId'] for i in results))
     for i in results:
         i['properties']['roleDefinitionName'] = role_dics.get(i['properties']['roleDefinitionId'],
                                                               None)
@@ -186,8 +221,7 @@ def list_role_assignments(assignee=None, role=None, resource_group_name=None,
     # fill in principal names
     principal_ids = set(i['properties']['principalId'] for i in results)
     if principal_ids:
-        principals = _get_object_stubs(graph_client, principal_ids)
-        principal_dics = {i.object_id: _get_displayable_name(i) for i in principals}
+        principal_dics = _get_principal_names(graph_client, principal_ids, cache)
         for i in results:
             i['properties']['principalName'] = principal_dics.get(i['properties']['principalId'],
                                                                   None)
@@ -195,6 +229,49 @@ def list_role_assignments(assignee=None, role=None, resource_group_name=None,
     return results
 
 
+def _get_role_cache():
+    from azure.cli.core._config import az_config
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import CacheSession
+    cache = CacheSession(max_age=az_config.getint('role', 'cache_max_age', fallback=3600))
+    cache.load(os.path.join(get_config_dir(), _ROLE_CACHE_FILE_NAME))
+    return cache
+
+
+def _get_role_definition_names(definitions_client, scope, tenant_id, cache, role_definition_ids):
+    '''
+    Return the names of the role definitions of `scope` by id. The definitions are listed again
+    when the cached names miss any of `role_definition_ids`, e.g. for a role created since.
+    '''
+    key = 'roleDefinitions|{}|{}'.format(tenant_id, scope.lower())
+    names = cache.get_value(key)
+    if names is None or not role_definition_ids.issubset(names):
+        names = {i.id: i.properties.role_name for i in definitions_client.list(scope=scope)}
+        # remember the definitions which don't exist anymore, so they are not listed again
+        names.update({i: None for i in role_definition_ids if i not in names})
+        cache.set_value(key, names)
+    return names
+
+
+def _get_principal_names(graph_client, principal_ids, cache):
+    tenant_id = graph_client.config.tenant_id
+    names = {}
+    for object_id in principal_ids:
+        name = cache.get_value('principalName|{}|{}'.format(tenant_id, object_id), _NOT_CACHED)
+        if name is not _NOT_CACHED:
+            names[object_id] = name
+    missing = [i for i in principal_ids if i not in names]
+    if missing:
+        names.update({i.object_id: _get_displayable_name(i)
+                      for i in _get_object_stubs(graph_client, missing)})
+        with cache.transaction():
+            for object_id in missing:
+                # deleted principals are cached too, with no name
+                cache.set_value('principalName|{}|{}'.format(tenant_id, object_id),
+                                names.get(object_id))
+    return names
+
+
 def _get_displayable_name(graph_object):
     if graph_object.user_principal_name:
         return graph_object.user_principal_name
@@ -231,6 +308,15 @@ def delete_role_assignments(ids=None, assignee=None, role=None,
 
 def _search_role_assignments(assignments_client, definitions_client,
                              scope, assignee, role, include_inherited, include_groups):
+    return list(_iter_role_assignments(assignments_client, definitions_client, scope, assignee,
+                                       role, include_inherited, include_groups))
+
+
+def _iter_role_assignments(assignments_client, definitions_client,
+                           scope, assignee, role, include_inherited, include_groups):
+    '''
+    Return an iterator of the matching role assignments, which lists them page by page.
+    '''
     assignee_object_id = None
     if assignee:
         assignee_object_id = _resolve_object_id(assignee)
@@ -241,24 +327,18 @@ def _search_role_assignments(assignments_client, definitions_client,
             f = "assignedTo('{}')".format(assignee_object_id)
         else:
             f = "principalId eq '{}'".format(assignee_object_id)
-        assignments = list(assignments_client.list(filter=f))
+        assignments = assignments_client.list(filter=f)
     elif scope:
-        assignments = list(assignments_client.list_for_scope(scope=scope, filter='atScope()'))
+        assignments = assignments_client.list_for_scope(scope=scope, filter='atScope()')
     else:
-        assignments = list(assignments_client.list())
-
-    if assignments:
-        assignments = [a for a in assignments if (
-            not scope or
-            include_inherited and re.match(a.properties.scope, scope, re.I) or
-            a.properties.scope.lower() == scope.lower()
-        )]
+        assignments = assignments_client.list()
 
-        if role:
-            role_id = _resolve_role_id(role, scope, definitions_client)
-            assignments = [i for i in assignments if i.properties.role_definition_id == role_id]
-
-    return assignments
+    role_id = _resolve_role_id(role, scope, definitions_client) if role else None
+    return (a for a in assignments if (
+        not scope or
+        include_inherited and re.match(a.properties.scope, scope, re.I) or
+        a.properties.scope.lower() == scope.lower()
+    ) and (not role_id or a.properties.role_definition_id == role_id))
 
 
 def _build_role_scope(resource_group_name, scope, subscription_id):
@@ -927,8 +1007,13 @@ def _resolve_object_id(assignee):
     if not result:
         result = list(client.service_principals.list(
             filter="servicePrincipalNames/any(c:c eq '{}')".format(assignee)))
-    if not result:  # assume an object id, let us verify it
-        result = _get_object_stubs(client, [assignee])
+    if not result:
+        try:
+            uuid.UUID(assignee)
+            # assume an object id, let us verify it
+            result = _get_object_stubs(client, [assignee])
+        except ValueError:
+            pass
 
     # 2+ matches should never happen, so we only check 'no match' here
     if not result:
@@ -938,6 +1023,18 @@ def _resolve_object_id(assignee):
 
 
 def _get_object_stubs(graph_client, assignees):
+    from concurrent.futures import ThreadPoolExecutor
     from azure.graphrbac.models import GetObjectsParameters
-    params = GetObjectsParameters(include_directory_object_references=True, object_ids=assignees)
-    return list(graph_client.objects.get_objects_by_object_ids(params))
+
+    def _get_chunk(object_ids):
+        params = GetObjectsParameters(include_directory_object_references=True,
+                                      object_ids=object_ids)
+        return list(graph_client.objects.get_objects_by_object_ids(params))
+
+    assignees = list(assignees)
+    if len(assignees) <= _OBJECT_IDS_CHUNK_SIZE:
+        return _get_chunk(assignees)
+    chunks = [assignees[i:i + _OBJECT_IDS_CHUNK_SIZE]
+              for i in range(0, len(assignees), _OBJECT_IDS_CHUNK_SIZE)]
+    with ThreadPoolExecutor(max_workers=min(len(chunks), _MAX_CONCURRENT_GRAPH_CALLS)) as executor:
+        return [o for objects in executor.map(_get_chunk, chunks) for o in objects]
@@ -2,10 +2,17 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import types
 import unittest
 import mock
 
-from azure.cli.command_modules.role.custom import _resolve_role_id
+from azure.mgmt.authorization.models import RoleAssignment, RoleAssignmentPropertiesWithScope
+from azure.cli.core.util import CLIError
+from azure.cli.command_modules.role.custom import (_resolve_role_id, _resolve_object_id, _get_object_stubs,
+                                                   list_role_assignments)
 
 # pylint: disable=line-too-long
 
@@ -26,3 +33,105 @@ class TestRoleCustomCommands(unittest.TestCase):
         # action (using a full id)
         test_full_id = '/subscriptions/0b1f6471-1bf0-4dda-aec3-cb9272123456/providers/microsoft.authorization/roleDefinitions/5370bbf4-6b73-4417-969b-8f2e6e123456'
         self.assertEqual(test_full_id, _resolve_role_id(test_full_id, 'foobar', mock_client))
+
+    def test_get_object_stubs_chunked(self):
+        graph_client = mock.MagicMock()
+        graph_client.objects.get_objects_by_object_ids.side_effect = lambda params: [
+            mock.Mock(object_id=i) for i in params.object_ids]
+        object_ids = [str(i) for i in range(600)]
+
+        result = _get_object_stubs(graph_client, object_ids)
+
+        self.assertEqual([o.object_id for o in result], object_ids)
+        calls = graph_client.objects.get_objects_by_object_ids.call_args_list
+        self.assertEqual([len(c[0][0].object_ids) for c in calls], [250, 250, 100])
+
+
+class TestListRoleAssignments(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': self.temp_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        auth_client = mock.MagicMock()
+        auth_client.role_definitions.config.subscription_id = 'sub1'
+        role = mock.MagicMock(id='/role/reader')
+        role.properties.role_name = 'Reader'
+        auth_client.role_definitions.list.return_value = [role]
+        self.assignments_client = auth_client.role_assignments
+        self.assignments_client.list_for_scope.return_value = [self._assignment('p1'), self._assignment('p2')]
+        self.assignments_client.list.return_value = [self._assignment('p1'), self._assignment('p3')]
+        self.auth_client = auth_client
+
+        self.graph_client = mock.MagicMock()
+        self.graph_client.config.tenant_id = 'tenant1'
+        principal = mock.Mock(object_id='p1', user_principal_name='admin@contoso.com')
+        self.graph_client.objects.get_objects_by_object_ids.return_value = [principal]
+
+        for name, client in [('_auth_client_factory', self.auth_client), ('_graph_client_factory', self.graph_client)]:
+            patcher = mock.patch('azure.cli.command_modules.role.custom.' + name, return_value=client)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _assignment(principal_id):
+        return RoleAssignment(id=principal_id, properties=RoleAssignmentPropertiesWithScope(
+            scope='/subscriptions/sub1', role_definition_id='/role/reader', principal_id=principal_id))
+
+    def test_list_role_assignments_names_cached(self):
+        for _ in range(2):
+            result = list_role_assignments()
+            self.assertEqual([(r['properties']['roleDefinitionName'], r['properties']['principalName'])
+                              for r in result], [('Reader', 'admin@contoso.com'), ('Reader', None)])
+
+        self.auth_client.role_definitions.list.assert_called_once_with(scope='/subscriptions/sub1')
+        self.graph_client.objects.get_objects_by_object_ids.assert_called_once()
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'roleCache.json')))
+
+        # only the principals which are not cached are resolved
+        self.graph_client.objects.get_objects_by_object_ids.reset_mock()
+        result = list(list_role_assignments(show_all=True))
+        self.assertEqual([r['properties']['principalName'] for r in result], ['admin@contoso.com', None])
+        self.assertEqual(self.graph_client.objects.get_objects_by_object_ids.call_args[0][0].object_ids, ['p3'])
+
+    def test_list_all_role_assignments_streamed(self):
+        result = list_role_assignments(show_all=True)
+        self.assertIsInstance(result, types.GeneratorType)
+        self.assertEqual([r['id'] for r in result], ['p1', 'p3'])
+
+    def test_resolve_object_id_not_cached(self):
+        # a principal may be deleted and created again, so the object id is looked up every time
+        self.graph_client.users.list.return_value = []
+        principals = [[mock.Mock(object_id='sp1')], [mock.Mock(object_id='sp2')]]
+        self.graph_client.service_principals.list.side_effect = principals
+
+        self.assertEqual(_resolve_object_id('http://app@contoso'), 'sp1')
+        self.assertEqual(_resolve_object_id('http://app@contoso'), 'sp2')
+        self.graph_client.users.list.assert_called_with(filter="userPrincipalName eq 'http://app@contoso'")
+        self.graph_client.objects.get_objects_by_object_ids.assert_not_called()
+
+    def test_resolve_object_id_first_match_wins(self):
+        self.graph_client.users.list.return_value = [mock.Mock(object_id='user1')]
+
+        self.assertEqual(_resolve_object_id('admin@contoso.com'), 'user1')
+        self.graph_client.service_principals.list.assert_not_called()
+        self.graph_client.objects.get_objects_by_object_ids.assert_not_called()
+
+    def test_resolve_object_id_verifies_only_guids(self):
+        object_id = '5370bbf4-6b73-4417-969b-8f2e6e123456'
+        self.graph_client.service_principals.list.return_value = []
+        self.graph_client.objects.get_objects_by_object_ids.return_value = [mock.Mock(object_id=object_id)]
+
+        self.assertEqual(_resolve_object_id(object_id), object_id)
+        self.graph_client.users.list.assert_not_called()
+        self.assertEqual(self.graph_client.objects.get_objects_by_object_ids.call_args[0][0].object_ids, [object_id])
+
+        self.graph_client.objects.get_objects_by_object_ids.reset_mock()
+        with self.assertRaises(CLIError):
+            _resolve_object_id('myapp')
+        self.graph_client.objects.get_objects_by_object_ids.assert_not_called()
@@ -63,6 +63,6 @@ setup(
         'azure.cli.command_modules.servicefabric'
     ],
     install_requires=DEPENDENCIES,
-    package_data={'azure.cli.command_modules.servicefabric': ['template/windows/template.json', 'template/linux/template.json', 'template/windows/parameter.json', 'template/linux/parameter.json']},
+    package_data={'azure.cli.command_modules.servicefabric': ['template/windows/template.json', 'template/linux/template.json', 'template/windows/parameter.json', 'template/linux/parameter.json', '_argument_manifest.json', '_help_index.json']},
     cmdclass=cmdclass
 )
@@ -0,0 +1,143 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+The storage accounts resolved for the data plane commands given only an account name. The
+resource group of an account is cached so that its keys are listed without enumerating the
+accounts of the subscription. With `storage.cache_account_keys` enabled the account key is
+cached too, encrypted with a secret kept in the configuration directory.
+"""
+
+import os
+import threading
+
+import azure.cli.core.azlogging as azlogging
+
+logger = azlogging.get_az_logger(__name__)
+
+_ACCOUNT_CACHE_FILE_NAME = 'storageAccounts.json'
+_KEY_CACHE_FILE_NAME = 'storageAccountKeys.json'
+_KEY_CACHE_SECRET_FILE_NAME = 'storageAccountKeys.secret'
+
+_account_cache = None
+_key_cache = None
+_cache_lock = threading.RLock()
+# the cache keys of the account keys this process read from the cache
+_cached_keys_used = set()
+
+
+def _get_cache(cache, file_name, max_age_option, max_age_fallback):
+    from azure.cli.core._config import az_config
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import CacheSession
+    filename = os.path.join(get_config_dir(), file_name)
+    if cache is None or cache.filename != filename:
+        cache = CacheSession(max_age=az_config.getint('storage', max_age_option, fallback=max_age_fallback))
+        cache.load(filename)
+    return cache
+
+
+def _get_account_cache():
+    global _account_cache  # pylint: disable=global-statement
+    _account_cache = _get_cache(_account_cache, _ACCOUNT_CACHE_FILE_NAME, 'account_cache_max_age', 86400)
+    return _account_cache
+
+
+def _get_key_cache():
+    global _key_cache  # pylint: disable=global-statement
+    _key_cache = _get_cache(_key_cache, _KEY_CACHE_FILE_NAME, 'account_key_cache_max_age', 3600)
+    return _key_cache
+
+
+def _is_key_cache_enabled():
+    from azure.cli.core._config import az_config
+    return az_config.getboolean('storage', 'cache_account_keys', fallback=False)
+
+
+def _get_cipher():
+    """Returns the Fernet cipher of the cached account keys, or None if it is not available."""
+    from azure.cli.core._environment import get_config_dir
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:
+        logger.debug('The account keys are not cached as cryptography is not installed.')
+        return None
+    filename = os.path.join(get_config_dir(), _KEY_CACHE_SECRET_FILE_NAME)
+    try:
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except OSError:
+        with open(filename, 'rb') as f:
+            secret = f.read().strip()
+    else:
+        secret = Fernet.generate_key()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(secret)
+    try:
+        return Fernet(secret)
+    except ValueError:
+        logger.debug("Unable to read the secret of the cached account keys '%s'.", filename)
+        return None
+
+
+def get_account_cache_key(subscription_id, account_name):
+    return '{}|{}'.format(subscription_id, account_name.lower())
+
+
+def get_cached_account(cache_key):
+    """Returns the resource group and, if cached, the key of the storage account of `cache_key`.
+    Returns None for what is not cached."""
+    with _cache_lock:
+        resource_group = _get_account_cache().get_value(cache_key)
+        if not resource_group or not _is_key_cache_enabled():
+            return resource_group, None
+        encrypted_key = _get_key_cache().get_value(cache_key)
+    if not encrypted_key:
+        return resource_group, None
+    cipher = _get_cipher()
+    if not cipher:
+        return resource_group, None
+    from cryptography.fernet import InvalidToken
+    try:
+        account_key = cipher.decrypt(encrypted_key.encode('ascii')).decode('utf-8')
+    except InvalidToken:
+        logger.debug("Unable to decrypt the cached key of storage account '%s'.", cache_key)
+        return resource_group, None
+    with _cache_lock:
+        _cached_keys_used.add(cache_key)
+    return resource_group, account_key
+
+
+def cache_account(cache_key, resource_group, account_key):
+    with _cache_lock:
+        _get_account_cache().set_value(cache_key, resource_group)
+        if not account_key or not _is_key_cache_enabled():
+            return
+    cipher = _get_cipher()
+    if cipher:
+        with _cache_lock:
+            _get_key_cache().set_value(cache_key, cipher.encrypt(account_key.encode('utf-8')).decode('ascii'))
+
+
+def invalidate_cached_account(cache_key):
+    """Removes the storage account of `cache_key` from the caches, e.g. once it was not found in
+    its cached resource group."""
+    with _cache_lock:
+        for cache in [_get_account_cache(), _get_key_cache()]:
+            if cache.get(cache_key) is not None:
+                del cache[cache_key]
+
+
+def invalidate_used_account_keys():
+    """Removes the account keys this process read from the cache, e.g. once the service refused
+    one."""
+    with _cache_lock:
+        if not _cached_keys_used:
+            return
+        cache = _get_key_cache()
+        with cache.transaction():
+            for cache_key in _cached_keys_used:
+                if cache.get(cache_key) is not None:
+                    del cache[cache_key]
+        _cached_keys_used.clear()
@@ -3,11 +3,28 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import sys
+
+from six import reraise
+
 from azure.cli.core.profiles import supported_api_version
 from azure.cli.core.commands import create_command, command_table
 from ._validators import validate_client_parameters
 
 
+def _invalidate_account_keys_on_auth_failure(exception_handler):
+    """Wraps `exception_handler` so that the account keys read from the cache are removed from it
+    once the service refuses the credentials."""
+    def _handle_exception(ex):
+        if getattr(ex, 'status_code', None) == 403:
+            from ._account_cache import invalidate_used_account_keys
+            invalidate_used_account_keys()
+        if exception_handler:
+            return exception_handler(ex)
+        reraise(*sys.exc_info())
+    return _handle_exception
+
+
 def cli_storage_data_plane_command(name, operation, client_factory, transform=None, table_transformer=None,
                                    exception_handler=None, resource_type=None, max_api=None, min_api=None):
     """ Registers an Azure CLI Storage Data Plane command. These commands always include the
@@ -19,7 +36,8 @@ def cli_storage_data_plane_command(name, operation, client_factory, transform=No
             return
 
     command = create_command(__name__, name, operation, transform, table_transformer,
-                             client_factory, exception_handler=exception_handler)
+                             client_factory,
+                             exception_handler=_invalidate_account_keys_on_auth_failure(exception_handler))
     # add parameters required to create a storage client
     group_name = 'Storage Account'
     command.add_argument('account_name', '--account-name', required=False, default=None,
@@ -448,6 +448,8 @@ register_cli_argument('storage blob download-batch', 'source', options_list=('--
                       validator=process_blob_download_batch_parameters)
 
 register_cli_argument('storage blob download-batch', 'source_container_name', ignore_type)
+register_cli_argument('storage blob download-batch', 'max_concurrent_files', type=int)
+register_cli_argument('storage blob download-batch', 'sync', action='store_true')
 
 # BLOB UPLOAD-BATCH PARAMETERS
 register_cli_argument('storage blob upload-batch', 'destination', options_list=('--destination', '-d'))
@@ -477,6 +479,8 @@ register_cli_argument('storage blob upload-batch', 'content_type', arg_group='Co
 register_cli_argument('storage blob upload-batch', 'content_cache_control', arg_group='Content Control')
 register_cli_argument('storage blob upload-batch', 'content_language', arg_group='Content Control')
 register_cli_argument('storage blob upload-batch', 'max_connections', type=int)
+register_cli_argument('storage blob upload-batch', 'max_concurrent_files', type=int)
+register_cli_argument('storage blob upload-batch', 'sync', action='store_true')
 
 # BLOB COPY-BATCH PARAMETERS
 
@@ -496,6 +500,9 @@ with CommandContext('storage blob copy start-batch') as c:
 with CommandContext('storage file upload-batch') as c:
     c.reg_arg('source', options_list=('--source', '-s'), validator=process_file_upload_batch_parameters)
     c.reg_arg('destination', options_list=('--destination', '-d'))
+    c.reg_arg('sync', action='store_true',
+              help='Only upload the files which differ from the remote files in size or MD5. If a file has '
+                   'no MD5, it is uploaded if it was modified after its copy. Files are never deleted.')
 
     with c.arg_group('Download Control') as group:
         group.reg_arg('max_connections')
@@ -510,6 +517,9 @@ register_content_settings_argument('storage file upload-batch', FileContentSetti
 with CommandContext('storage file download-batch') as c:
     c.reg_arg('source', options_list=('--source', '-s'), validator=process_file_download_batch_parameters)
     c.reg_arg('destination', options_list=('--destination', '-d'))
+    c.reg_arg('sync', action='store_true',
+              help='Only download the files which differ from the local files in size or MD5. If a file has '
+                   'no MD5, it is downloaded if it was modified after its copy. Files are never deleted.')
 
     with c.arg_group('Download Control') as group:
         group.reg_arg('max_connections')
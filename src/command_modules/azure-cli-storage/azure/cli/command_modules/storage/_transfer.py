@@ -0,0 +1,290 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Transfer engine of the storage batch commands: the files of a batch are transferred on a pool of
+workers and every completed file is recorded in a journal, so an interrupted batch resumes
+without transferring the completed files again. In sync mode only the files which differ from
+their remote copy are transferred.
+"""
+
+import base64
+import calendar
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+
+from azure.cli.core.azlogging import get_az_logger
+
+logger = get_az_logger(__name__)
+
+JOURNALS_DIR_NAME = 'storageBatchJournals'
+MD5_CACHES_DIR_NAME = 'storageMd5Caches'
+
+# key: the name of the blob or file in the batch, local_path: the file on the local disk
+BatchTransferItem = namedtuple('BatchTransferItem', ['key', 'local_path'])
+
+# the properties of a blob or file compared with the local file in sync mode
+RemoteFileState = namedtuple('RemoteFileState', ['size', 'last_modified', 'md5'])
+
+
+def _get_digest(*identity):
+    return hashlib.sha1(json.dumps(identity).encode('utf-8')).hexdigest()
+
+
+def _get_local_file_state(path):
+    try:
+        stat = os.stat(path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+    except OSError:
+        return None
+
+
+class BatchTransferJournal(object):
+    """
+    Records the files completed by a batch transfer in a file, one JSON line per file.
+
+    A file is considered transferred if it is recorded and its local copy still has the size and
+    modification time it had when it was transferred.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        self._file = None
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry['key']] = entry
+                    except (ValueError, KeyError, TypeError):
+                        # the last line of an interrupted batch may be incomplete
+                        continue
+        except (OSError, IOError):
+            pass
+        if self._entries:
+            logger.warning('Resuming an interrupted batch, %d files are already transferred.',
+                           len(self._entries))
+
+    def is_transferred(self, item):
+        entry = self._entries.get(item.key)
+        if not entry:
+            return False
+        return _get_local_file_state(item.local_path) == {'size': entry['size'], 'mtime': entry['mtime']}
+
+    def record(self, item):
+        state = _get_local_file_state(item.local_path)
+        if state is None:
+            return
+        if self._file is None:
+            journal_dir = os.path.dirname(self.path)
+            if not os.path.isdir(journal_dir):
+                os.makedirs(journal_dir)
+            self._file = open(self.path, 'a')
+        state['key'] = item.key
+        self._file.write(json.dumps(state) + '\n')
+        self._file.flush()
+        self._entries[item.key] = state
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def delete(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def get_batch_journal(*identity):
+    """ Return the journal of the batch identified by `identity`, e.g. the direction, account,
+    container, local directory and pattern of the batch. """
+    from azure.cli.core._environment import get_config_dir
+    return BatchTransferJournal(os.path.join(get_config_dir(), JOURNALS_DIR_NAME, _get_digest(*identity) + '.jsonl'))
+
+
+def get_remote_file_state(properties):
+    """ Return the RemoteFileState of the properties of a blob or file. """
+    content_settings = getattr(properties, 'content_settings', None)
+    return RemoteFileState(properties.content_length, getattr(properties, 'last_modified', None),
+                           getattr(content_settings, 'content_md5', None))
+
+
+class LocalMd5Cache(object):
+    """
+    The base64 encoded MD5 of the files in a local directory, kept in the configuration directory
+    so that a file is only hashed again once its size or modification time changes.
+    """
+
+    def __init__(self, directory):
+        from azure.cli.core._environment import get_config_dir
+        from azure.cli.core._session import Session
+        self.directory = os.path.realpath(directory)
+        self._cache = Session()
+        cache_dir = os.path.join(get_config_dir(), MD5_CACHES_DIR_NAME)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        self._cache.load(os.path.join(cache_dir, _get_digest(self.directory) + '.json'))
+
+    def get_md5(self, path):
+        key = os.path.relpath(os.path.realpath(path), self.directory)
+        state = _get_local_file_state(path)
+        entry = self._cache.get(key)
+        if entry and state and entry['size'] == state['size'] and entry['mtime'] == state['mtime']:
+            return entry['md5']
+
+        md5 = hashlib.md5()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                md5.update(chunk)
+        md5 = base64.b64encode(md5.digest()).decode('utf-8')
+        if state:
+            state['md5'] = md5
+            self._cache.data[key] = state
+        return md5
+
+    def save(self):
+        self._cache.save_with_retry()
+
+
+def is_in_sync(local_path, remote_state, md5_cache, upload):
+    """
+    Return True if the local file has the same content as its remote copy, described by the
+    RemoteFileState `remote_state`, so it doesn't need to be transferred.
+
+    The files are compared by size and then by MD5. If the remote copy has no MD5 the files are
+    in sync when the destination was modified after the source.
+    """
+    state = _get_local_file_state(local_path)
+    if remote_state is None or state is None or state['size'] != remote_state.size:
+        return False
+    if remote_state.md5:
+        return md5_cache.get_md5(local_path) == remote_state.md5
+    if remote_state.last_modified is None:
+        return False
+    remote_mtime = calendar.timegm(remote_state.last_modified.utctimetuple())
+    return state['mtime'] <= remote_mtime if upload else state['mtime'] >= remote_mtime
+
+
+def filter_modified_items(items, remote_states, local_directory, upload, get_remote_state=None):
+    """
+    Return the items whose local file is not in sync with its remote copy. `remote_states` maps
+    the key of an item to the RemoteFileState listed for it. `get_remote_state(item)` is called
+    to fetch the state of a remote copy of the same size listed without its MD5 or modification
+    time.
+    """
+    md5_cache = LocalMd5Cache(local_directory)
+    modified = []
+    for item in items:
+        remote_state = remote_states.get(item.key)
+        if get_remote_state and remote_state and not (remote_state.md5 or remote_state.last_modified):
+            local_state = _get_local_file_state(item.local_path)
+            if local_state and local_state['size'] == remote_state.size:
+                remote_state = get_remote_state(item)
+        if not is_in_sync(item.local_path, remote_state, md5_cache, upload):
+            modified.append(item)
+    md5_cache.save()
+    logger.warning('%d of %d files are modified and will be transferred.', len(modified), len(items))
+    return modified
+
+
+class _TransferProgress(object):
+    """ Reports the files transferred by a batch, and its throughput, to the progress controller. """
+
+    def __init__(self, total_files):
+        from azure.cli.core.application import APPLICATION
+        self.controller = APPLICATION.get_progress_controller(True)
+        self.total_files = total_files
+        self.files = 0
+        self.bytes = 0
+        self.start = time.time()
+
+    def add(self, size):
+        self.files += 1
+        self.bytes += size
+        elapsed = max(time.time() - self.start, 0.001)
+        message = '{:.2f} MiB/s '.format(self.bytes / elapsed / 1024 / 1024)
+        self.controller.add(message=message, value=self.files, total_val=self.total_files)
+
+    def end(self):
+        self.controller.end()
+
+    def stop(self):
+        self.controller.stop()
+
+
+def run_batch_transfer(items, transfer, journal=None, max_concurrent_files=1):
+    """
+    Transfer the `items`, a list of BatchTransferItem, by calling `transfer(item)` on up to
+    `max_concurrent_files` workers.
+
+    Returns the results of `transfer` in the order of `items`. The result of an item skipped
+    because the journal records it as transferred is None. The first error stops the batch once
+    the transfers in progress complete; the journal is kept so the batch can be resumed.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    results = [None] * len(items)
+    pending_items = [(index, item) for index, item in enumerate(items)
+                     if not (journal and journal.is_transferred(item))]
+    if not pending_items:
+        if journal:
+            journal.delete()
+        return results
+
+    progress = _TransferProgress(len(pending_items))
+
+    max_concurrent_files = max(max_concurrent_files or 1, 1)
+    errors = []
+    running = {}
+    queued = iter(pending_items)
+    with ThreadPoolExecutor(max_workers=max_concurrent_files) as executor:
+        try:
+            while True:
+                # keep a bounded number of transfers in flight rather than queueing the whole batch
+                while not errors and len(running) < max_concurrent_files * 2:
+                    index, item = next(queued, (None, None))
+                    if item is None:
+                        break
+                    running[executor.submit(transfer, item)] = index
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        results[index] = future.result()
+                    except Exception as ex:  # pylint: disable=broad-except
+                        logger.debug('Failed to transfer %s: %s', items[index].key, ex)
+                        errors.append(ex)
+                        continue
+                    # a downloaded file is recorded once it is on the local disk
+                    state = _get_local_file_state(items[index].local_path)
+                    if journal:
+                        journal.record(items[index])
+                    progress.add(state['size'] if state else 0)
+        except BaseException:
+            for future in running:
+                future.cancel()
+            progress.stop()
+            if journal:
+                journal.close()
+            raise
+
+    if errors:
+        progress.stop()
+        if journal:
+            journal.close()
+            logger.warning('The batch stopped after an error. Run the command again to resume it.')
+        raise errors[0]
+
+    progress.end()
+    if journal:
+        journal.delete()
+    return results
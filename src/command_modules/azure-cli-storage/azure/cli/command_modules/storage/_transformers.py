@@ -98,7 +98,9 @@ def create_boolean_result_output_transformer(property_name):
 
 
 def transform_storage_list_output(result):
-    return list(result)
+    # the next pages are only listed as the items are written out
+    for item in result:
+        yield item
 
 
 def transform_url(result):
@@ -25,23 +25,45 @@ storage_account_key_options = {'primary': 'key1', 'secondary': 'key2'}
 # Utilities
 
 def _query_account_key(account_name):
+    """Query the key of a storage account. The resource group of the account, and with
+    `storage.cache_account_keys` enabled its key, are cached for the next commands."""
+    from msrestazure.azure_exceptions import CloudError
+    from ._account_cache import get_account_cache_key, get_cached_account, cache_account, invalidate_cached_account
     scf = get_mgmt_service_client(ResourceType.MGMT_STORAGE)
-    acc = next((x for x in scf.storage_accounts.list() if x.name == account_name), None)
-    if acc:
+    cache_key = get_account_cache_key(scf.config.subscription_id, account_name)
+    rg, account_key = get_cached_account(cache_key)
+    if account_key:
+        return account_key
+    if rg:
+        try:
+            account_key = _list_account_key(scf, rg, account_name)
+        except CloudError as ex:
+            if ex.status_code != 404:
+                raise
+            invalidate_cached_account(cache_key)
+            rg = None
+    if not rg:
+        acc = next((x for x in scf.storage_accounts.list() if x.name == account_name), None)
+        if not acc:
+            raise ValueError("Storage account '{}' not found.".format(account_name))
         from azure.cli.core.commands.arm import parse_resource_id
         rg = parse_resource_id(acc.id)['resource_group']
-
-        (StorageAccountKeys, StorageAccountListKeysResult) = get_sdk(
-            ResourceType.MGMT_STORAGE,
-            'models.storage_account_keys#StorageAccountKeys',
-            'models.storage_account_list_keys_result#StorageAccountListKeysResult')
-
-        if StorageAccountKeys:
-            return scf.storage_accounts.list_keys(rg, account_name).key1
-        elif StorageAccountListKeysResult:
-            return scf.storage_accounts.list_keys(rg, account_name).keys[0].value  # pylint: disable=no-member
-    else:
-        raise ValueError("Storage account '{}' not found.".format(account_name))
+        account_key = _list_account_key(scf, rg, account_name)
+    cache_account(cache_key, rg, account_key)
+    return account_key
+
+
+def _list_account_key(scf, resource_group_name, account_name):
+    (StorageAccountKeys, StorageAccountListKeysResult) = get_sdk(
+        ResourceType.MGMT_STORAGE,
+        'models.storage_account_keys#StorageAccountKeys',
+        'models.storage_account_list_keys_result#StorageAccountListKeysResult')
+
+    keys = scf.storage_accounts.list_keys(resource_group_name, account_name)
+    if StorageAccountKeys:
+        return keys.key1
+    elif StorageAccountListKeysResult:
+        return keys.keys[0].value  # pylint: disable=no-member
 
 
 def _create_short_lived_blob_sas(account_name, account_key, container, blob):
@@ -15,8 +15,10 @@ from azure.cli.command_modules.storage.util import (create_blob_service_from_sto
                                                     create_file_share_from_storage_client,
                                                     create_short_lived_share_sas,
                                                     create_short_lived_container_sas,
-                                                    filter_none, collect_blobs, collect_files,
+                                                    filter_none, collect_blobs, collect_blob_objects, collect_files,
                                                     mkdir_p, guess_content_type)
+from azure.cli.command_modules.storage._transfer import (BatchTransferItem, get_batch_journal, run_batch_transfer,
+                                                         filter_modified_items, get_remote_file_state)
 
 BlobCopyResult = namedtuple('BlobCopyResult', ['name', 'copy_id'])
 
@@ -88,7 +90,8 @@ def storage_blob_copy_batch(client, source_client,
 
 
 # pylint: disable=unused-argument
-def storage_blob_download_batch(client, source, destination, source_container_name, pattern=None, dryrun=False):
+def storage_blob_download_batch(client, source, destination, source_container_name, pattern=None, dryrun=False,
+                                max_concurrent_files=1, sync=False):
     """
     Download blobs in a container recursively
 
@@ -107,8 +110,23 @@ def storage_blob_download_batch(client, source, destination, source_container_na
     :param str pattern:
         The pattern is used for files globbing. The supported patterns are '*', '?', '[seq]',
         and '[!seq]'.
+
+    :param int max_concurrent_files:
+        The number of blobs downloaded in parallel.
+
+    :param bool sync:
+        Only download the blobs which differ from the local files in size or MD5. If a blob has no MD5,
+        it is downloaded if it was modified after the local file. Local files are never deleted.
     """
-    source_blobs = list(collect_blobs(client, source_container_name, pattern))
+    if sync:
+        blobs = list(collect_blob_objects(client, source_container_name, pattern))
+        items = filter_modified_items([BatchTransferItem(blob.name, os.path.join(destination, blob.name))
+                                       for blob in blobs],
+                                      {blob.name: get_remote_file_state(blob.properties) for blob in blobs},
+                                      destination, upload=False)
+        source_blobs = [item.key for item in items]
+    else:
+        source_blobs = list(collect_blobs(client, source_container_name, pattern))
 
     if dryrun:
         logger = get_az_logger(__name__)
@@ -121,7 +139,14 @@ def storage_blob_download_batch(client, source, destination, source_container_na
             logger.warning('  - %s', b)
         return []
 
-    return list(_download_blob(client, source_container_name, destination, blob) for blob in source_blobs)
+    def _download_item(item):
+        return _download_blob(client, source_container_name, destination, item.key)
+
+    items = [BatchTransferItem(blob, os.path.join(destination, blob)) for blob in source_blobs]
+    journal = get_batch_journal('download', client.account_name, source_container_name,
+                                os.path.realpath(destination), pattern)
+    results = run_batch_transfer(items, _download_item, journal, max_concurrent_files)
+    return [result or item.key for item, result in zip(items, results)]
 
 
 def storage_blob_upload_batch(client, source, destination, pattern=None, source_files=None,  # pylint: disable=too-many-locals
@@ -129,7 +154,7 @@ def storage_blob_upload_batch(client, source, destination, pattern=None, source_
                               content_settings=None, metadata=None, validate_content=False,
                               maxsize_condition=None, max_connections=2, lease_id=None,
                               if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False):
+                              if_none_match=None, timeout=None, dryrun=False, max_concurrent_files=1, sync=False):
     """
     Upload files to storage container as blobs
 
@@ -157,6 +182,14 @@ def storage_blob_upload_batch(client, source, destination, pattern=None, source_
         operation only if the resource's ETag does not match the value specified. Specify the
         wildcard character (*) to perform the operation only if the resource does not exist,
         and fail the operation if it does exist.
+
+    :param int max_concurrent_files:
+        The number of files uploaded in parallel. Use --max-connections to upload the chunks of
+        each file in parallel.
+
+    :param bool sync:
+        Only upload the files which differ from the blobs in size or MD5. If a blob has no MD5, the
+        file is uploaded if it was modified after the blob. Blobs are never deleted.
     """
 
     def _append_blob(file_path, blob_name, blob_content_settings):
@@ -220,6 +253,13 @@ def storage_blob_upload_batch(client, source, destination, pattern=None, source_
     logger = get_az_logger(__name__)
     settings_class = get_sdk(ResourceType.DATA_STORAGE, 'blob.models#ContentSettings')
 
+    if sync:
+        blobs = collect_blob_objects(client, destination_container_name, pattern.lstrip('/') if pattern else None)
+        items = filter_modified_items([BatchTransferItem(dst, src) for src, dst in source_files or []],
+                                      {blob.name: get_remote_file_state(blob.properties) for blob in blobs},
+                                      source, upload=True)
+        source_files = [(item.local_path, item.key) for item in items]
+
     results = []
     if dryrun:
         logger.info('upload action: from %s to %s', source, destination)
@@ -231,11 +271,20 @@ def storage_blob_upload_batch(client, source, destination, pattern=None, source_
         for src, dst in source_files or []:
             results.append(_create_return_result(dst, guess_content_type(src, content_settings, settings_class)))
     else:
-        for src, dst in source_files or []:
-            logger.warning('uploading {}'.format(src))
-            guessed_content_settings = guess_content_type(src, content_settings, settings_class)
-            results.append(
-                _create_return_result(dst, guessed_content_settings, upload_action(src, dst, guessed_content_settings)))
+        def _upload_item(item):
+            logger.info('uploading %s', item.local_path)
+            guessed_content_settings = guess_content_type(item.local_path, content_settings, settings_class)
+            return _create_return_result(item.key, guessed_content_settings,
+                                         upload_action(item.local_path, item.key, guessed_content_settings))
+
+        items = [BatchTransferItem(dst, src) for src, dst in source_files or []]
+        journal = get_batch_journal('upload', client.account_name, destination_container_name,
+                                    os.path.realpath(source), pattern, blob_type)
+        uploaded = run_batch_transfer(items, _upload_item, journal, max_concurrent_files)
+        # the files uploaded by an interrupted run of the batch are reported without their properties
+        results = [result or _create_return_result(item.key, guess_content_type(item.local_path, content_settings,
+                                                                                settings_class))
+                   for item, result in zip(items, uploaded)]
 
     return results
 
@@ -16,14 +16,25 @@ from azure.cli.command_modules.storage.util import (filter_none, collect_blobs,
                                                     create_blob_service_from_storage_client,
                                                     create_short_lived_container_sas,
                                                     create_short_lived_share_sas, guess_content_type)
+from azure.cli.command_modules.storage._transfer import (BatchTransferItem, filter_modified_items,
+                                                         get_remote_file_state)
 
 
 def storage_file_upload_batch(client, destination, source, pattern=None, dryrun=False, validate_content=False,
-                              content_settings=None, max_connections=1, metadata=None):
+                              content_settings=None, max_connections=1, metadata=None, sync=False):
     """ Upload local files to Azure Storage File Share in batch """
 
-    from .util import glob_files_locally
+    from .util import glob_files_locally, glob_files_remotely
     source_files = [c for c in glob_files_locally(source, pattern)]
+
+    if sync:
+        remote_files = glob_files_remotely(client, destination, pattern.lstrip('/') if pattern else None,
+                                           include_properties=True)
+        items = filter_modified_items([BatchTransferItem(dst, src) for src, dst in source_files],
+                                      {os.path.join(d, n): get_remote_file_state(p) for d, n, p in remote_files},
+                                      source, upload=True,
+                                      get_remote_state=lambda item: _get_file_state(client, destination, item.key))
+        source_files = [(item.local_path, item.key) for item in items]
     logger = get_az_logger(__name__)
     settings_class = get_sdk(ResourceType.DATA_STORAGE, 'file.models#ContentSettings')
 
@@ -65,7 +76,7 @@ def storage_file_upload_batch(client, destination, source, pattern=None, dryrun=
 
 
 def storage_file_download_batch(client, source, destination, pattern=None, dryrun=False, validate_content=False,
-                                max_connections=1):
+                                max_connections=1, sync=False):
     """
     Download files from file share to local directory in batch
     """
@@ -74,6 +85,16 @@ def storage_file_download_batch(client, source, destination, pattern=None, dryru
 
     source_files = glob_files_remotely(client, source, pattern)
 
+    if sync:
+        remote_files = list(glob_files_remotely(client, source, pattern, include_properties=True))
+        items = filter_modified_items([BatchTransferItem(os.path.join(d, n), os.path.join(destination, d, n))
+                                       for d, n, _ in remote_files],
+                                      {os.path.join(d, n): get_remote_file_state(p) for d, n, p in remote_files},
+                                      destination, upload=False,
+                                      get_remote_state=lambda item: _get_file_state(client, source, item.key))
+        modified = set(item.key for item in items)
+        source_files = [(d, n) for d, n, _ in remote_files if os.path.join(d, n) in modified]
+
     if dryrun:
         source_files_list = list(source_files)
 
@@ -271,3 +292,10 @@ def _make_directory_in_files_share(file_service, file_share, directory_path, exi
 
         if existing_dirs:
             existing_dirs.add(directory_path)
+
+
+def _get_file_state(file_service, share, path):
+    """ Get the size, modification time and MD5 of a file, which are not all listed with the file. """
+    directory_name, file_name = os.path.split(path)
+    properties = file_service.get_file_properties(share, directory_name or None, file_name).properties
+    return get_remote_file_state(properties)
@@ -0,0 +1,135 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import calendar
+import datetime
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import mock
+
+from azure.cli.command_modules.storage._transfer import (BatchTransferItem, BatchTransferJournal, RemoteFileState,
+                                                         filter_modified_items, run_batch_transfer)
+
+
+class TestStorageBatchTransfer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal_path = os.path.join(self.temp_dir, 'journals', 'batch.jsonl')
+        self.items = []
+        for i in range(10):
+            path = os.path.join(self.temp_dir, 'file_{}'.format(i))
+            with open(path, 'w') as f:
+                f.write('x' * i)
+            self.items.append(BatchTransferItem('blob_{}'.format(i), path))
+
+        patcher = mock.patch('azure.cli.core.application.APPLICATION.get_progress_controller', autospec=True)
+        self.progress_controller = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': os.path.join(self.temp_dir, 'config')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_batch_transfer_concurrent_in_order(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def _transfer(item):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return item.key
+
+        results = run_batch_transfer(self.items, _transfer, BatchTransferJournal(self.journal_path),
+                                     max_concurrent_files=4)
+        self.assertEqual(results, [item.key for item in self.items])
+        self.assertTrue(1 < active[1] <= 4)
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertEqual(self.progress_controller.add.call_args[1]['value'], 10)
+        self.assertEqual(self.progress_controller.add.call_args[1]['total_val'], 10)
+        self.progress_controller.end.assert_called_once_with()
+
+    def test_batch_transfer_resumes_after_error(self):
+        transferred = []
+
+        def _failing_transfer(item):
+            if item.key == 'blob_9':
+                raise ValueError('transfer failed')
+            transferred.append(item.key)
+            return item.key
+
+        with self.assertRaises(ValueError):
+            run_batch_transfer(self.items, _failing_transfer, BatchTransferJournal(self.journal_path))
+        self.assertEqual(transferred, ['blob_{}'.format(i) for i in range(9)])
+        self.assertTrue(os.path.exists(self.journal_path))
+        self.progress_controller.stop.assert_called_once_with()
+
+        # a file modified since it was transferred is transferred again
+        with open(self.items[1].local_path, 'w') as f:
+            f.write('modified')
+
+        transferred = []
+        results = run_batch_transfer(self.items, lambda item: transferred.append(item.key) or item.key,
+                                     BatchTransferJournal(self.journal_path))
+        self.assertEqual(transferred, ['blob_1', 'blob_9'])
+        self.assertEqual(results, [None, 'blob_1'] + [None] * 7 + ['blob_9'])
+        self.assertFalse(os.path.exists(self.journal_path))
+
+    def test_batch_journal_ignores_incomplete_entry(self):
+        journal = BatchTransferJournal(self.journal_path)
+        journal.record(self.items[0])
+        journal.close()
+        with open(self.journal_path, 'a') as f:
+            f.write('{"key": "blob_1", "si')
+
+        journal = BatchTransferJournal(self.journal_path)
+        self.assertTrue(journal.is_transferred(self.items[0]))
+        self.assertFalse(journal.is_transferred(self.items[1]))
+
+    def test_filter_modified_items(self):
+        def _md5(i):
+            return base64.b64encode(hashlib.md5(b'x' * i).digest()).decode('utf-8')
+
+        now = datetime.datetime.utcnow()
+        remote_states = {
+            'blob_1': RemoteFileState(1, now, _md5(1)),  # same content
+            'blob_2': RemoteFileState(2, now, _md5(3)),  # same size, different content
+            'blob_3': RemoteFileState(4, now, _md5(4)),  # different size
+            'blob_4': RemoteFileState(4, now + datetime.timedelta(hours=1), None),  # uploaded after modified
+            'blob_5': RemoteFileState(5, now - datetime.timedelta(hours=1), None),  # modified after uploaded
+            'blob_6': RemoteFileState(6, None, None),  # listed without details
+        }
+        for i in range(1, 7):
+            mtime = calendar.timegm(now.utctimetuple())
+            os.utime(self.items[i].local_path, (mtime, mtime))
+
+        get_remote_state = mock.Mock(return_value=RemoteFileState(6, now, _md5(6)))
+        modified = filter_modified_items(self.items, remote_states, self.temp_dir, upload=True,
+                                         get_remote_state=get_remote_state)
+        self.assertEqual([item.key for item in modified],
+                         ['blob_0', 'blob_2', 'blob_3', 'blob_5', 'blob_7', 'blob_8', 'blob_9'])
+        get_remote_state.assert_called_once_with(self.items[6])
+
+        # the MD5 of an unchanged file is not computed again
+        with mock.patch('hashlib.md5', autospec=True) as md5:
+            modified = filter_modified_items(self.items[1:3], remote_states, self.temp_dir, upload=True)
+            self.assertEqual([item.key for item in modified], ['blob_2'])
+            md5.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
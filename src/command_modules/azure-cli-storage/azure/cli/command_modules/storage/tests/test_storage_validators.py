@@ -3,13 +3,20 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
+import tempfile
 import unittest
 from argparse import Namespace
 from six import StringIO
 
+import mock
+
+from azure.cli.command_modules.storage import _account_cache
+from azure.cli.command_modules.storage._command_type import _invalidate_account_keys_on_auth_failure
 from azure.cli.command_modules.storage._validators import (get_permission_validator, get_datetime_type, datetime,
                                                            ipv4_range_type, resource_type_type, services_type,
-                                                           process_blob_source_uri, get_char_options_validator)
+                                                           process_blob_source_uri, get_char_options_validator,
+                                                           _query_account_key)
 from azure.cli.core.profiles import get_sdk, ResourceType, supported_api_version
 from azure.cli.testsdk import api_version_constraint
 
@@ -119,6 +126,81 @@ class TestStorageValidators(unittest.TestCase):
         self.assertEqual(result, set('ab'))
 
 
+def _get_storage_client():
+    scf = mock.MagicMock()
+    scf.config.subscription_id = 'sub1'
+    account = mock.MagicMock(id='/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Storage/'
+                                'storageAccounts/account1')
+    account.name = 'account1'
+    scf.storage_accounts.list.return_value = [account]
+    keys = mock.MagicMock(key1='key1')
+    keys.keys = [mock.MagicMock(value='key1')]
+    scf.storage_accounts.list_keys.return_value = keys
+    return scf
+
+
+def _reload_account_caches():
+    _account_cache._account_cache = None
+    _account_cache._key_cache = None
+
+
+class TestQueryAccountKey(unittest.TestCase):
+    @mock.patch.object(_account_cache, '_cached_keys_used', new_callable=set)
+    @mock.patch.object(_account_cache, '_key_cache', None)
+    @mock.patch.object(_account_cache, '_account_cache', None)
+    @mock.patch('azure.cli.command_modules.storage._validators.get_mgmt_service_client', autospec=True)
+    def test_resource_group_is_cached(self, client_factory, _):
+        from msrestazure.azure_exceptions import CloudError
+        scf = client_factory.return_value = _get_storage_client()
+
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': tempfile.mkdtemp()}):
+            self.assertEqual(_query_account_key('account1'), 'key1')
+            _reload_account_caches()
+            self.assertEqual(_query_account_key('account1'), 'key1')
+            scf.storage_accounts.list.assert_called_once_with()
+            scf.storage_accounts.list_keys.assert_called_with('rg1', 'account1')
+            self.assertEqual(scf.storage_accounts.list_keys.call_count, 2)
+
+            # an account no longer in its cached resource group is looked up again
+            scf.storage_accounts.list_keys.side_effect = [CloudError(mock.MagicMock(status_code=404)),
+                                                          scf.storage_accounts.list_keys.return_value]
+            self.assertEqual(_query_account_key('account1'), 'key1')
+            self.assertEqual(scf.storage_accounts.list.call_count, 2)
+
+            with self.assertRaises(ValueError):
+                _query_account_key('account2')
+
+    @mock.patch.object(_account_cache, '_cached_keys_used', new_callable=set)
+    @mock.patch.object(_account_cache, '_key_cache', None)
+    @mock.patch.object(_account_cache, '_account_cache', None)
+    @mock.patch('azure.cli.command_modules.storage._validators.get_mgmt_service_client', autospec=True)
+    def test_keys_are_cached_encrypted(self, client_factory, _):
+        scf = client_factory.return_value = _get_storage_client()
+        config_dir = tempfile.mkdtemp()
+
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': config_dir,
+                                            'AZURE_STORAGE_CACHE_ACCOUNT_KEYS': 'true'}):
+            self.assertEqual(_query_account_key('account1'), 'key1')
+            _reload_account_caches()
+            self.assertEqual(_query_account_key('account1'), 'key1')
+            scf.storage_accounts.list_keys.assert_called_once_with('rg1', 'account1')
+            with open(os.path.join(config_dir, 'storageAccountKeys.json'), 'rb') as f:
+                self.assertNotIn(b'key1', f.read())
+
+            # a key refused by the service is listed again
+            handler = _invalidate_account_keys_on_auth_failure(None)
+            with self.assertRaises(ValueError):
+                try:
+                    raise ValueError('auth failed')
+                except ValueError as ex:
+                    ex.status_code = 403
+                    handler(ex)
+            _reload_account_caches()
+            self.assertEqual(_query_account_key('account1'), 'key1')
+            self.assertEqual(scf.storage_accounts.list_keys.call_count, 2)
+        scf.storage_accounts.list.assert_called_once_with()
+
+
 @api_version_constraint(resource_type=ResourceType.MGMT_STORAGE, min_api='2016-12-01')
 class TestEncryptionValidators(unittest.TestCase):
     def test_validate_encryption_services(self):
@@ -26,6 +26,16 @@ def collect_blobs(blob_service, container, pattern=None):
     return (blob.name for blob in blob_service.list_blobs(container) if _match_path(pattern, blob.name))
 
 
+def collect_blob_objects(blob_service, container, pattern=None):
+    """
+    List the blobs, including their properties, in the given blob container whose path matches the given pattern.
+    """
+    if not _pattern_has_wildcards(pattern):
+        return [blob for blob in blob_service.list_blobs(container, prefix=pattern) if blob.name == pattern]
+
+    return (blob for blob in blob_service.list_blobs(container) if _match_path(pattern, blob.name))
+
+
 def collect_files(file_service, share, pattern=None):
     """
     Search files in the the given file share recursively. Filter the files by matching their path to the given pattern.
@@ -76,8 +86,9 @@ def glob_files_locally(folder_path, pattern):
                 yield (full_path, full_path[len_folder_path:])
 
 
-def glob_files_remotely(client, share_name, pattern):
-    """glob the files in remote file share based on the given pattern"""
+def glob_files_remotely(client, share_name, pattern, include_properties=False):
+    """glob the files in remote file share based on the given pattern. When include_properties is set the
+    properties listed with each file are returned as the third item of the tuple."""
     from collections import deque
     Directory, File = get_sdk(ResourceType.DATA_STORAGE, 'file.models#Directory', 'file.models#File')
 
@@ -87,7 +98,7 @@ def glob_files_remotely(client, share_name, pattern):
         for f in client.list_directories_and_files(share_name, current_dir):
             if isinstance(f, File):
                 if (pattern and fnmatch(os.path.join(current_dir, f.name), pattern)) or (not pattern):
-                    yield current_dir, f.name
+                    yield (current_dir, f.name, f.properties) if include_properties else (current_dir, f.name)
             elif isinstance(f, Directory):
                 queue.appendleft(os.path.join(current_dir, f.name))
 
@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 import json
+import os
 import re
 
 from azure.cli.core.util import CLIError
@@ -31,44 +32,82 @@ def _get_thread_count():
     return 5  # don't increase too much till https://github.com/Azure/msrestazure-for-python/issues/6 is fixed
 
 
+_IMAGE_CACHE_DIR_NAME = 'vmImages'
+
+
+def _get_image_cache(name):
+    from azure.cli.core._config import az_config
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import CacheSession
+    cache_dir = os.path.join(get_config_dir(), _IMAGE_CACHE_DIR_NAME)
+    if not os.path.isdir(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:  # created by another process in the meantime
+            if not os.path.isdir(cache_dir):
+                raise
+    cache = CacheSession(max_age=az_config.getint('vm', 'image_cache_max_age', fallback=86400))
+    cache.load(os.path.join(cache_dir, name.lower() + '.json'))
+    return cache
+
+
 def load_images_thru_services(publisher, offer, sku, location):
+    """
+    Returns the images whose publisher, offer and sku partially match the given names. The names
+    of the publishers, offers, skus and versions are kept in a catalog per cloud and location, and
+    only the entries which are missing or expired are listed again from the service.
+    """
     from concurrent.futures import ThreadPoolExecutor, as_completed
-    all_images = []
-    client = _compute_client_factory()
+    from functools import partial
+    from azure.cli.core.cloud import get_active_cloud_name
+    images_client = _compute_client_factory().virtual_machine_images
     if location is None:
         location = get_one_of_subscription_locations()
+    cache = _get_image_cache('{}.{}'.format(get_active_cloud_name(), location))
 
-    def _load_images_from_publisher(publisher):
-        offers = client.virtual_machine_images.list_offers(location, publisher)
-        if offer:
-            offers = [o for o in offers if _partial_matched(offer, o.name)]
-        for o in offers:
-            skus = client.virtual_machine_images.list_skus(location, publisher, o.name)
-            if sku:
-                skus = [s for s in skus if _partial_matched(sku, s.name)]
-            for s in skus:
-                images = client.virtual_machine_images.list(location, publisher, o.name, s.name)
-                for i in images:
-                    all_images.append({
-                        'publisher': publisher,
-                        'offer': o.name,
-                        'sku': s.name,
-                        'version': i.name})
-
-    publishers = client.virtual_machine_images.list_publishers(location)
-    if publisher:
-        publishers = [p for p in publishers if _partial_matched(publisher, p.name)]
+    def _get_names(entries, key, list_names):
+        names = cache.get_value(key)
+        if names is None:
+            names = entries[key] = [n.name for n in list_names() or []]
+        return names
 
-    publisher_num = len(publishers)
-    if publisher_num > 1:
-        with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
-            tasks = [executor.submit(_load_images_from_publisher, p.name) for p in publishers]
-            for t in as_completed(tasks):
-                t.result()  # don't use the result but expose exceptions from the threads
-    elif publisher_num == 1:
-        _load_images_from_publisher(publishers[0].name)
-
-    return all_images
+    def _load_images_from_publisher(publisher):
+        # the entries listed from the service are returned to be cached by the calling thread
+        entries = {}
+        images = []
+        offers = _get_names(entries, 'offers|{}'.format(publisher).lower(),
+                            partial(images_client.list_offers, location, publisher))
+        for o in [o for o in offers if _partial_matched(offer, o)]:
+            skus = _get_names(entries, 'skus|{}|{}'.format(publisher, o).lower(),
+                              partial(images_client.list_skus, location, publisher, o))
+            for s in [s for s in skus if _partial_matched(sku, s)]:
+                versions = _get_names(entries, 'versions|{}|{}|{}'.format(publisher, o, s).lower(),
+                                      partial(images_client.list, location, publisher, o, s))
+                images.extend({'publisher': publisher, 'offer': o, 'sku': s, 'version': v} for v in versions)
+        return entries, images
+
+    entries = {}
+    publishers = _get_names(entries, 'publishers', partial(images_client.list_publishers, location))
+    publishers = [p for p in publishers if _partial_matched(publisher, p)]
+
+    results = {}
+    with cache.transaction():
+        try:
+            if len(publishers) > 1:
+                with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
+                    tasks = {executor.submit(_load_images_from_publisher, p): p for p in publishers}
+                    for t in as_completed(tasks):
+                        loaded, results[tasks[t]] = t.result()
+                        entries.update(loaded)
+            elif publishers:
+                loaded, results[publishers[0]] = _load_images_from_publisher(publishers[0])
+                entries.update(loaded)
+        finally:
+            # keep what was listed, even if a publisher failed
+            for key, names in entries.items():
+                cache.set_value(key, names)
+
+    return [i for p in publishers for i in results[p]]
 
 
 def load_images_from_aliases_doc(publisher=None, offer=None, sku=None):
@@ -79,27 +118,30 @@ def load_images_from_aliases_doc(publisher=None, offer=None, sku=None):
     except CloudEndpointNotSetException:
         raise CLIError("'endpoint_vm_image_alias_doc' isn't configured. Please invoke 'az cloud update' to configure "
                        "it or use '--all' to retrieve images from server")
-    txt = urlopen(target_url).read()
-    dic = json.loads(txt.decode())
-    try:
-        all_images = []
-        result = (dic['outputs']['aliases']['value'])
-        for v in result.values():  # loop around os
-            for alias, vv in v.items():  # loop around distros
-                all_images.append({
-                    'urnAlias': alias,
-                    'publisher': vv['publisher'],
-                    'offer': vv['offer'],
-                    'sku': vv['sku'],
-                    'version': vv['version']
-                })
-
-        all_images = [i for i in all_images if (_partial_matched(publisher, i['publisher']) and
-                                                _partial_matched(offer, i['offer']) and
-                                                _partial_matched(sku, i['sku']))]
-        return all_images
-    except KeyError:
-        raise CLIError('Could not retrieve image list from {}'.format(target_url))
+    cache = _get_image_cache('aliases')
+    all_images = cache.get_value(target_url)
+    if all_images is None:
+        txt = urlopen(target_url).read()
+        dic = json.loads(txt.decode())
+        try:
+            all_images = []
+            result = (dic['outputs']['aliases']['value'])
+            for v in result.values():  # loop around os
+                for alias, vv in v.items():  # loop around distros
+                    all_images.append({
+                        'urnAlias': alias,
+                        'publisher': vv['publisher'],
+                        'offer': vv['offer'],
+                        'sku': vv['sku'],
+                        'version': vv['version']
+                    })
+        except KeyError:
+            raise CLIError('Could not retrieve image list from {}'.format(target_url))
+        cache.set_value(target_url, all_images)
+
+    return [i for i in all_images if (_partial_matched(publisher, i['publisher']) and
+                                      _partial_matched(offer, i['offer']) and
+                                      _partial_matched(sku, i['sku']))]
 
 
 def load_extension_images_thru_services(publisher, name, version, location, show_latest=False):
@@ -10,22 +10,21 @@ def _compute_client_factory(**_):
     return get_mgmt_service_client(ResourceType.MGMT_COMPUTE)
 
 
-def cf_ni(_):
-    from azure.cli.core.profiles import ResourceType
-    from azure.cli.core.commands.client_factory import get_mgmt_service_client
+def scale_set_nic_operations(network_client):
+    import copy
     # TODO: Remove hard coded api-version once
     # https://github.com/Azure/azure-rest-api-specs/issues/570
     # is fixed.
-    ni = get_mgmt_service_client(ResourceType.MGMT_NETWORK).network_interfaces
+    # the network client is shared with the rest of the command, so its operations are copied
+    ni = copy.copy(network_client.network_interfaces)
     ni.api_version = '2016-03-30'
     return ni
 
 
-def cf_public_ip_addresses():
+def cf_ni(_):
     from azure.cli.core.profiles import ResourceType
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
-    public_ip_ops = get_mgmt_service_client(ResourceType.MGMT_NETWORK).public_ip_addresses
-    return public_ip_ops
+    return scale_set_nic_operations(get_mgmt_service_client(ResourceType.MGMT_NETWORK))
 
 
 def cf_avail_set(_):
@@ -657,6 +657,11 @@ helps['vm image'] = """
 helps['vm image list'] = """
     type: command
     short-summary: List the VM/VMSS images available in the Azure Marketplace.
+    long-summary: >
+        The images listed with '--all' are kept in a catalog per location under the configuration
+        directory, and only the publishers, offers and skus which aren't in the catalog yet are listed
+        from the service. The entries of the catalog and the offline list of images expire after
+        'vm.image_cache_max_age' seconds, one day by default.
     examples:
         - name: List all available images.
           text: az vm image list --all
@@ -76,3 +76,70 @@ def check_existence(value, resource_group, provider_namespace, resource_type,
         return True
     except CloudError:
         return False
+
+
+class NetworkResourceIndex(object):
+    ''' The NICs, public IPs and load balancers which map VMs and scale set instances to their
+    network, indexed by id so that they are joined in memory.
+
+    The list methods fetch the resources of a resource group, or of a scale set, with one call
+    each. A resource which was not listed is fetched once when it is looked up; the NICs and
+    public IPs of a scale set instance are fetched by listing those of the whole scale set.
+    '''
+
+    def __init__(self, network_client=None):
+        if network_client is None:
+            from azure.cli.core.commands.client_factory import get_mgmt_service_client
+            from azure.cli.core.profiles import ResourceType
+            network_client = get_mgmt_service_client(ResourceType.MGMT_NETWORK)
+        self.network_client = network_client
+        self._resources = {}
+
+    def _add(self, resources):
+        resources = list(resources)
+        for resource in resources:
+            self._resources[resource.id.lower()] = resource
+        return resources
+
+    def list_nics(self, resource_group_name=None):
+        operations = self.network_client.network_interfaces
+        return self._add(operations.list(resource_group_name) if resource_group_name else operations.list_all())
+
+    def list_public_ips(self, resource_group_name=None):
+        operations = self.network_client.public_ip_addresses
+        return self._add(operations.list(resource_group_name) if resource_group_name else operations.list_all())
+
+    def list_load_balancers(self, resource_group_name=None):
+        operations = self.network_client.load_balancers
+        return self._add(operations.list(resource_group_name) if resource_group_name else operations.list_all())
+
+    def list_scale_set_nics(self, resource_group_name, vm_scale_set_name):
+        from ._client_factory import scale_set_nic_operations
+        operations = scale_set_nic_operations(self.network_client)
+        return self._add(operations.list_virtual_machine_scale_set_network_interfaces(
+            resource_group_name, vm_scale_set_name))
+
+    def list_scale_set_public_ips(self, resource_group_name, vm_scale_set_name):
+        return self._add(self.network_client.public_ip_addresses.list_virtual_machine_scale_set_public_ip_addresses(
+            resource_group_name, vm_scale_set_name))
+
+    def _get(self, resource_id, operations, list_scale_set):
+        key = resource_id.lower()
+        if key not in self._resources:
+            res = parse_resource_id(resource_id)
+            if res.get('type', '').lower() == 'virtualmachinescalesets':
+                list_scale_set(res['resource_group'], res['name'])
+                if key not in self._resources:
+                    raise CLIError("Resource '{}' was not found.".format(resource_id))
+            else:
+                self._resources[key] = operations.get(res['resource_group'], res['name'])
+        return self._resources[key]
+
+    def get_nic(self, resource_id):
+        return self._get(resource_id, self.network_client.network_interfaces, self.list_scale_set_nics)
+
+    def get_public_ip(self, resource_id):
+        return self._get(resource_id, self.network_client.public_ip_addresses, self.list_scale_set_public_ips)
+
+    def get_load_balancer(self, resource_id):
+        return self._get(resource_id, self.network_client.load_balancers, None)
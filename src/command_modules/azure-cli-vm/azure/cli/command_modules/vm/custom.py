@@ -27,13 +27,13 @@ from azure.cli.core.util import CLIError
 import azure.cli.core.azlogging as azlogging
 from azure.cli.core.profiles import get_sdk, ResourceType, supported_api_version
 
-from ._vm_utils import read_content_if_is_file
+from ._vm_utils import read_content_if_is_file, NetworkResourceIndex
 from ._vm_diagnostics_templates import get_default_diag_config
 
 from ._actions import (load_images_from_aliases_doc,
                        load_extension_images_thru_services,
-                       load_images_thru_services)
-from ._client_factory import _compute_client_factory, cf_public_ip_addresses
+                       load_images_thru_services, _get_thread_count)
+from ._client_factory import _compute_client_factory
 
 logger = azlogging.get_az_logger(__name__)
 
@@ -157,7 +157,7 @@ def list_vm(resource_group_name=None, show_details=False):
     vm_list = ccf.virtual_machines.list(resource_group_name=resource_group_name) \
         if resource_group_name else ccf.virtual_machines.list_all()
     if show_details:
-        return [get_vm_details(_parse_rg_name(v.id)[0], v.name) for v in vm_list]
+        return _get_vms_details([_parse_rg_name(v.id) for v in vm_list], resource_group_name)
 
     return list(vm_list)
 
@@ -167,38 +167,57 @@ def show_vm(resource_group_name, vm_name, show_details=False):
 
 
 def get_vm_details(resource_group_name, vm_name):
-    result = get_instance_view(resource_group_name, vm_name)
-    network_client = get_mgmt_service_client(ResourceType.MGMT_NETWORK)
-    public_ips = []
-    fqdns = []
-    private_ips = []
-    mac_addresses = []
-    # pylint: disable=line-too-long,no-member
-    for nic_ref in result.network_profile.network_interfaces:
-        nic_parts = parse_resource_id(nic_ref.id)
-        nic = network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
-        if nic.mac_address:
-            mac_addresses.append(nic.mac_address)
-        for ip_configuration in nic.ip_configurations:
-            if ip_configuration.private_ip_address:
-                private_ips.append(ip_configuration.private_ip_address)
-            if ip_configuration.public_ip_address:
-                res = parse_resource_id(ip_configuration.public_ip_address.id)
-                public_ip_info = network_client.public_ip_addresses.get(res['resource_group'],
-                                                                        res['name'])
-                if public_ip_info.ip_address:
-                    public_ips.append(public_ip_info.ip_address)
-                if public_ip_info.dns_settings:
-                    fqdns.append(public_ip_info.dns_settings.fqdn)
-
-    setattr(result, 'power_state',
-            ','.join([s.display_status for s in result.instance_view.statuses if s.code.startswith('PowerState/')]))
-    setattr(result, 'public_ips', ','.join(public_ips))
-    setattr(result, 'fqdns', ','.join(fqdns))
-    setattr(result, 'private_ips', ','.join(private_ips))
-    setattr(result, 'mac_addresses', ','.join(mac_addresses))
-    del result.instance_view  # we don't need other instance_view info as people won't care
-    return result
+    return _get_vms_details([(resource_group_name, vm_name)])[0]
+
+
+def _get_vms_details(vm_names, resource_group_name=None):
+    ''' Get the instance views of the VMs, given as (resource group, name) pairs, along with their
+    power state and the addresses of their NICs.
+
+    When there is more than one VM the NICs and public IPs, of the resource group if given, are
+    listed once and joined with the VMs rather than getting each of them.
+    '''
+    from concurrent.futures import ThreadPoolExecutor
+    compute_client = _compute_client_factory()
+    network = NetworkResourceIndex(get_mgmt_service_client(ResourceType.MGMT_NETWORK))
+    if len(vm_names) > 1:
+        network.list_nics(resource_group_name)
+        network.list_public_ips(resource_group_name)
+
+    def _get_instance_view(names):
+        return compute_client.virtual_machines.get(names[0], names[1], expand='instanceView')
+
+    with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
+        vms = list(executor.map(_get_instance_view, vm_names))
+
+    for vm in vms:
+        public_ip_addresses = []
+        fqdns = []
+        private_ips = []
+        mac_addresses = []
+        # pylint: disable=line-too-long,no-member
+        for nic_ref in vm.network_profile.network_interfaces:
+            nic = network.get_nic(nic_ref.id)
+            if nic.mac_address:
+                mac_addresses.append(nic.mac_address)
+            for ip_configuration in nic.ip_configurations:
+                if ip_configuration.private_ip_address:
+                    private_ips.append(ip_configuration.private_ip_address)
+                if ip_configuration.public_ip_address:
+                    public_ip_info = network.get_public_ip(ip_configuration.public_ip_address.id)
+                    if public_ip_info.ip_address:
+                        public_ip_addresses.append(public_ip_info.ip_address)
+                    if public_ip_info.dns_settings:
+                        fqdns.append(public_ip_info.dns_settings.fqdn)
+
+        setattr(vm, 'power_state',
+                ','.join([s.display_status for s in vm.instance_view.statuses if s.code.startswith('PowerState/')]))
+        setattr(vm, 'public_ips', ','.join(public_ip_addresses))
+        setattr(vm, 'fqdns', ','.join(fqdns))
+        setattr(vm, 'private_ips', ','.join(private_ips))
+        setattr(vm, 'mac_addresses', ','.join(mac_addresses))
+        del vm.instance_view  # we don't need other instance_view info as people won't care
+    return vms
 
 
 def list_vm_images(image_location=None, publisher_name=None, offer=None, sku=None,
@@ -252,14 +271,12 @@ def list_ip_addresses(resource_group_name=None, vm_name=None):
     #
     # Since there is no guarantee that a NIC is in the same resource group as a given
     # Virtual Machine, we can't constrain the lookup to only a single group...
-    network_client = get_mgmt_service_client(ResourceType.MGMT_NETWORK)
-    nics = network_client.network_interfaces.list_all()
-    public_ip_addresses = network_client.public_ip_addresses.list_all()
-
-    ip_address_lookup = {pip.id: pip for pip in list(public_ip_addresses)}
+    network = NetworkResourceIndex(get_mgmt_service_client(ResourceType.MGMT_NETWORK))
+    nics = network.list_nics()
+    network.list_public_ips()
 
     result = []
-    for nic in [n for n in list(nics) if n.virtual_machine]:
+    for nic in [n for n in nics if n.virtual_machine]:
         nic_resource_group, nic_vm_name = _parse_rg_name(nic.virtual_machine.id)
 
         # If provided, make sure that resource group name and vm name match the NIC we are
@@ -276,7 +293,7 @@ def list_ip_addresses(resource_group_name=None, vm_name=None):
             for ip_configuration in nic.ip_configurations:
                 network_info['privateIpAddresses'].append(ip_configuration.private_ip_address)
                 if ip_configuration.public_ip_address:
-                    public_ip_address = ip_address_lookup[ip_configuration.public_ip_address.id]
+                    public_ip_address = network.get_public_ip(ip_configuration.public_ip_address.id)
                     network_info['publicIpAddresses'].append({
                         'id': public_ip_address.id,
                         'name': public_ip_address.name,
@@ -1483,37 +1500,31 @@ def list_vmss_instance_connection_info(resource_group_name, vm_scale_set_name):
     ip_config = next((ip for ip in ip_configs if ip.load_balancer_inbound_nat_pools), None)
     if not ip_config:
         raise CLIError('No load-balancer exist to retrieve public ip address')
-    res_id = ip_config.load_balancer_inbound_nat_pools[0].id
-    lb_info = parse_resource_id(res_id)
-    lb_name = lb_info['name']
-    lb_rg = lb_info['resource_group']
-
-    # get public ip
-    network_client = get_mgmt_service_client(ResourceType.MGMT_NETWORK)
-    lb = network_client.load_balancers.get(lb_rg, lb_name)
-    if getattr(lb.frontend_ip_configurations[0], 'public_ip_address', None):
-        res_id = lb.frontend_ip_configurations[0].public_ip_address.id
-        public_ip_info = parse_resource_id(res_id)
-        public_ip_name = public_ip_info['name']
-        public_ip_rg = public_ip_info['resource_group']
-        public_ip = network_client.public_ip_addresses.get(public_ip_rg, public_ip_name)
-        public_ip_address = public_ip.ip_address
-
-        # loop around inboundnatrule
-        instance_addresses = {}
-        for rule in lb.inbound_nat_rules:
-            instance_id = parse_resource_id(rule.backend_ip_configuration.id)['child_name']
-            instance_addresses['instance ' + instance_id] = '{}:{}'.format(public_ip_address,
-                                                                           rule.frontend_port)
-
-        return instance_addresses
-    else:
+    network = NetworkResourceIndex(get_mgmt_service_client(ResourceType.MGMT_NETWORK))
+    lb = network.get_load_balancer(ip_config.load_balancer_inbound_nat_pools[0].id)
+    public_frontends = {f.id.lower(): f.public_ip_address for f in lb.frontend_ip_configurations
+                        if getattr(f, 'public_ip_address', None)}
+    if not public_frontends:
         raise CLIError('The VM scale-set uses an internal load balancer, hence no connection information')
 
+    # join the inbound NAT rules of the instances with the public IPs of their frontends
+    instance_addresses = {}
+    for rule in lb.inbound_nat_rules:
+        if not rule.backend_ip_configuration or not rule.frontend_ip_configuration:
+            continue
+        backend = parse_resource_id(rule.backend_ip_configuration.id)
+        public_ip_ref = public_frontends.get(rule.frontend_ip_configuration.id.lower())
+        if backend['name'].lower() != vm_scale_set_name.lower() or public_ip_ref is None:
+            continue
+        public_ip = network.get_public_ip(public_ip_ref.id)
+        instance_addresses['instance ' + backend['child_name']] = '{}:{}'.format(
+            public_ip.ip_address, rule.frontend_port)
+    return instance_addresses
+
 
 def list_vmss_instance_public_ips(resource_group_name, vm_scale_set_name):
-    result = cf_public_ip_addresses().list_virtual_machine_scale_set_public_ip_addresses(resource_group_name,
-                                                                                         vm_scale_set_name)
+    network = NetworkResourceIndex(get_mgmt_service_client(ResourceType.MGMT_NETWORK))
+    result = network.list_scale_set_public_ips(resource_group_name, vm_scale_set_name)
     # filter away over-provisioned instances which are deleted after 'create/update' returns
     return [r for r in result if r.ip_address]
 
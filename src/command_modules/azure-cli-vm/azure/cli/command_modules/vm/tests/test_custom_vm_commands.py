@@ -15,7 +15,9 @@ from azure.cli.command_modules.vm.custom import (_get_access_extension_upgrade_i
                                                  _WINDOWS_ACCESS_EXT,
                                                  _get_extension_instance_name)
 from azure.cli.command_modules.vm.custom import \
-    (attach_unmanaged_data_disk, detach_data_disk, get_vmss_instance_view)
+    (attach_unmanaged_data_disk, detach_data_disk, get_vmss_instance_view, list_vm, show_vm,
+     list_vmss_instance_connection_info)
+from azure.cli.command_modules.vm._vm_utils import NetworkResourceIndex
 
 
 from azure.cli.command_modules.vm.disk_encryption import (encrypt_vm, decrypt_vm, _check_encrypt_is_supported,
@@ -205,6 +207,66 @@ class Test_Vm_Custom(unittest.TestCase):
         mock_vm_set.assert_called_once_with(vm)
         self.assertEqual(len(vm.storage_profile.data_disks), 0)
 
+    @mock.patch('azure.cli.command_modules.vm.custom.get_mgmt_service_client', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm.custom._compute_client_factory', autospec=True)
+    def test_list_vm_show_details(self, compute_factory_mock, network_factory_mock):
+        compute_client = compute_factory_mock.return_value
+        network_client = network_factory_mock.return_value
+        vm_ids = ['/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Compute/virtualMachines/vm' + str(i)
+                  for i in range(3)]
+        compute_client.virtual_machines.list.return_value = [mock.MagicMock(id=vm_id) for vm_id in vm_ids]
+
+        def _nic_id(name, resource_group='rg1'):
+            return '/subscriptions/sub1/resourceGroups/{}/providers/Microsoft.Network/networkInterfaces/{}'.format(
+                resource_group, name)
+
+        def _public_ip_id(name):
+            return '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Network/publicIPAddresses/' + name
+
+        def _get_vm(resource_group_name, vm_name, expand=None):
+            self.assertEqual(expand, 'instanceView')
+            # the NIC of vm2 is in another resource group, resource IDs are matched regardless of case
+            nic_id = _nic_id('nic2', 'rg2') if vm_name == 'vm2' else _nic_id(vm_name.replace('vm', 'NIC'), 'RG1')
+            vm = FakedVM(nics=[mock.MagicMock(id=nic_id)])
+            vm.name = vm_name
+            vm.instance_view = mock.MagicMock(statuses=[InstanceViewStatus(code='PowerState/running',
+                                                                           display_status='VM running')])
+            return vm
+
+        def _nic(nic_id, private_ip, public_ip_id=None):
+            public_ip = mock.MagicMock(id=public_ip_id) if public_ip_id else None
+            return mock.MagicMock(id=nic_id, mac_address='00-0D-3A',
+                                  ip_configurations=[mock.MagicMock(private_ip_address=private_ip,
+                                                                    public_ip_address=public_ip)])
+
+        compute_client.virtual_machines.get.side_effect = _get_vm
+        network_client.network_interfaces.list.return_value = [
+            _nic(_nic_id('nic0'), '10.0.0.4', _public_ip_id('ip0')),
+            _nic(_nic_id('nic1'), '10.0.0.5')]
+        network_client.network_interfaces.get.return_value = _nic(_nic_id('nic2', 'rg2'), '10.0.1.4')
+        network_client.public_ip_addresses.list.return_value = [
+            mock.MagicMock(id=_public_ip_id('ip0'), ip_address='13.0.0.1', dns_settings=None)]
+
+        result = list_vm('rg1', show_details=True)
+
+        self.assertEqual([vm.name for vm in result], ['vm0', 'vm1', 'vm2'])
+        self.assertEqual([vm.private_ips for vm in result], ['10.0.0.4', '10.0.0.5', '10.0.1.4'])
+        self.assertEqual([vm.public_ips for vm in result], ['13.0.0.1', '', ''])
+        self.assertEqual(result[0].power_state, 'VM running')
+        network_client.network_interfaces.list.assert_called_once_with('rg1')
+        network_client.public_ip_addresses.list.assert_called_once_with('rg1')
+        # only the NIC outside of the listed resource group is fetched by itself
+        network_client.network_interfaces.get.assert_called_once_with('rg2', 'nic2')
+        network_client.public_ip_addresses.get.assert_not_called()
+
+        # a single VM has its NICs fetched rather than listed
+        network_client.network_interfaces.get.reset_mock()
+        network_client.network_interfaces.get.return_value = _nic(_nic_id('nic1'), '10.0.0.5')
+        result = show_vm('rg1', 'vm1', show_details=True)
+        self.assertEqual(result.private_ips, '10.0.0.5')
+        network_client.network_interfaces.get.assert_called_once_with('RG1', 'NIC1')
+        self.assertEqual(network_client.network_interfaces.list.call_count, 1)
+
     @mock.patch('azure.cli.command_modules.vm.custom._compute_client_factory')
     def test_show_vmss_instance_view(self, factory_mock):
         vm_client = mock.MagicMock()
@@ -216,6 +278,86 @@ class Test_Vm_Custom(unittest.TestCase):
         vm_client.virtual_machine_scale_set_vms.list.assert_called_once_with('rg1', 'vmss1', expand='instanceView',
                                                                              select='instanceView')
 
+    @mock.patch('azure.cli.command_modules.vm.custom.get_mgmt_service_client', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm.custom._compute_client_factory', autospec=True)
+    def test_list_vmss_instance_connection_info(self, compute_factory_mock, network_factory_mock):
+        network_client = network_factory_mock.return_value
+        lb_id = '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Network/loadBalancers/lb1'
+        ip_config = mock.MagicMock(load_balancer_inbound_nat_pools=[mock.MagicMock(id=lb_id + '/inboundNatPools/p')])
+        nic_config = mock.MagicMock(primary=True, ip_configurations=[ip_config])
+        vmss = compute_factory_mock.return_value.virtual_machine_scale_sets.get.return_value
+        vmss.virtual_machine_profile.network_profile.network_interface_configurations = [nic_config]
+
+        def _public_ip_id(name):
+            return '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Network/publicIPAddresses/' + name
+
+        def _rule(vmss_name, instance_id, frontend, port):
+            backend_id = ('/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Compute/virtualMachineScaleSets/'
+                          '{}/virtualMachines/{}/networkInterfaces/nic/ipConfigurations/ip')
+            backend_id = backend_id.format(vmss_name, instance_id)
+            return mock.MagicMock(backend_ip_configuration=mock.MagicMock(id=backend_id),
+                                  frontend_ip_configuration=mock.MagicMock(id=lb_id + '/frontendIPConfigurations/' +
+                                                                           frontend),
+                                  frontend_port=port)
+
+        # the load balancer is shared with another scale set and has a frontend per public IP
+        frontends = [mock.MagicMock(id=lb_id + '/frontendIPConfigurations/fe' + str(i),
+                                    public_ip_address=mock.MagicMock(id=_public_ip_id('ip' + str(i))))
+                     for i in range(2)]
+        network_client.load_balancers.get.return_value = mock.MagicMock(
+            frontend_ip_configurations=frontends,
+            inbound_nat_rules=[_rule('vmss1', '0', 'fe0', 50000), _rule('vmss1', '1', 'FE1', 50001),
+                               _rule('vmss2', '0', 'fe0', 50002), mock.MagicMock(backend_ip_configuration=None)])
+        network_client.public_ip_addresses.get.side_effect = \
+            lambda resource_group, name: mock.MagicMock(ip_address='13.0.0.' + name[-1])
+
+        result = list_vmss_instance_connection_info('rg1', 'vmss1')
+
+        self.assertEqual(result, {'instance 0': '13.0.0.0:50000', 'instance 1': '13.0.0.1:50001'})
+        network_client.load_balancers.get.assert_called_once_with('rg1', 'lb1')
+        self.assertEqual(network_client.public_ip_addresses.get.call_count, 2)
+
+        # an internal load balancer has no public frontend
+        network_client.load_balancers.get.return_value = mock.MagicMock(
+            frontend_ip_configurations=[mock.MagicMock(public_ip_address=None)])
+        with self.assertRaises(CLIError) as ex:
+            list_vmss_instance_connection_info('rg1', 'vmss1')
+        self.assertIn('internal load balancer', str(ex.exception))
+
+    def test_network_resource_index_lists_scale_set_once(self):
+        network_client = mock.MagicMock()
+        vmss_id = '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Compute/virtualMachineScaleSets/vmss1'
+        public_ip_ids = [vmss_id + '/virtualMachines/{}/networkInterfaces/nic/ipConfigurations/ip/publicIPAddresses/'
+                         'pip'.format(i) for i in range(3)]
+        network_client.public_ip_addresses.list_virtual_machine_scale_set_public_ip_addresses.return_value = \
+            [mock.MagicMock(id=public_ip_id) for public_ip_id in public_ip_ids]
+        network = NetworkResourceIndex(network_client)
+
+        for public_ip_id in public_ip_ids:
+            self.assertEqual(network.get_public_ip(public_ip_id.replace('pip', 'PIP')).id, public_ip_id)
+        network_client.public_ip_addresses.list_virtual_machine_scale_set_public_ip_addresses.assert_called_once_with(
+            'rg1', 'vmss1')
+        network_client.public_ip_addresses.get.assert_not_called()
+        with self.assertRaises(CLIError):
+            network.get_public_ip(public_ip_ids[0].replace('/virtualMachines/0/', '/virtualMachines/5/'))
+
+    def test_network_resource_index_pins_scale_set_nics_api_version(self):
+        vmss_id = '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Compute/virtualMachineScaleSets/vmss1'
+        nic_id = vmss_id + '/virtualMachines/0/networkInterfaces/nic'
+
+        class _NetworkInterfaces(object):  # pylint: disable=too-few-public-methods
+            api_version = '2017-09-01'
+
+            def list_virtual_machine_scale_set_network_interfaces(self, resource_group_name, vm_scale_set_name):
+                return [mock.MagicMock(id=nic_id, api_version=self.api_version)]
+
+        network_client = mock.MagicMock()
+        network_client.network_interfaces = _NetworkInterfaces()
+        network = NetworkResourceIndex(network_client)
+
+        self.assertEqual(network.get_nic(nic_id).api_version, '2016-03-30')
+        self.assertEqual(network_client.network_interfaces.api_version, '2017-09-01')
+
     # pylint: disable=line-too-long
     @mock.patch('azure.cli.command_modules.vm.disk_encryption._compute_client_factory', autospec=True)
     @mock.patch('azure.cli.command_modules.vm.disk_encryption._get_keyvault_key_url', autospec=True)
@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 import os.path
+import tempfile
 import unittest
 import mock
 
@@ -55,6 +56,71 @@ class TestVMImage(unittest.TestCase):
         with self.assertRaises(CLIError):
             load_images_from_aliases_doc()
 
+    @mock.patch('azure.cli.command_modules.vm._actions.urlopen', autospec=True)
+    def test_alias_doc_is_cached(self, mock_urlopen):
+        from azure.cli.command_modules.vm._actions import load_images_from_aliases_doc
+        file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'aliases.json')
+        with open(file_path, 'r') as test_file:
+            mock_urlopen.return_value.read.return_value = test_file.read().encode()
+
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': tempfile.mkdtemp()}):
+            images = load_images_from_aliases_doc(publisher='canonical')
+            self.assertEqual(load_images_from_aliases_doc(publisher='canonical'), images)
+        self.assertEqual([i['urnAlias'] for i in images], ['UbuntuLTS'])
+        self.assertEqual(mock_urlopen.call_count, 1)
+
+    @mock.patch('azure.cli.command_modules.vm._actions._compute_client_factory', autospec=True)
+    def test_image_catalog_lists_missing_and_expired_entries(self, client_factory_mock):
+        from azure.cli.command_modules.vm._actions import load_images_thru_services, _get_image_cache
+
+        def _names(*names):
+            result = []
+            for name in names:
+                item = mock.MagicMock()
+                item.name = name
+                result.append(item)
+            return result
+
+        images_client = client_factory_mock.return_value.virtual_machine_images
+        images_client.list_publishers.return_value = _names('Canonical', 'OpenLogic', 'MicrosoftWindowsServer')
+        images_client.list_offers.side_effect = lambda location, publisher: _names('Server', 'Core')
+        images_client.list_skus.side_effect = lambda location, publisher, offer: _names('16.04', '17.10')
+        images_client.list.side_effect = lambda location, publisher, offer, sku: _names(sku + '.0', sku + '.1')
+
+        def _urns(images):
+            return [':'.join([i['publisher'], i['offer'], i['sku'], i['version']]) for i in images]
+
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': tempfile.mkdtemp()}):
+            images = load_images_thru_services('o', 'server', '16', 'westus')
+            self.assertEqual(_urns(images), ['{}:Server:16.04:16.04.{}'.format(p, i)
+                                             for p in ['Canonical', 'OpenLogic', 'MicrosoftWindowsServer']
+                                             for i in (0, 1)])
+            # only the matching offers and skus are listed
+            self.assertEqual(images_client.list_skus.call_count, 3)
+            self.assertEqual(images_client.list.call_count, 3)
+
+            # the same and narrower queries are answered from the catalog
+            images_client.reset_mock()
+            self.assertEqual(load_images_thru_services('o', 'server', '16', 'westus'), images)
+            self.assertEqual(len(load_images_thru_services('canonical', 'server', '16.04', 'westus')), 2)
+            self.assertEqual(images_client.method_calls, [])
+
+            # entries which are missing or expired are listed again
+            cache = _get_image_cache('AzureCloud.westus')
+            cache.data['versions|canonical|server|16.04']['time'] -= 2 * 86400
+            cache.save()
+            images = load_images_thru_services('canonical', None, None, 'westus')
+            self.assertEqual(len(images), 8)
+            images_client.list_offers.assert_not_called()
+            self.assertEqual(images_client.list_skus.call_count, 1)
+            self.assertEqual(sorted(c[0][2:] for c in images_client.list.call_args_list),
+                             [('Core', '16.04'), ('Core', '17.10'), ('Server', '16.04'), ('Server', '17.10')])
+
+            # the catalog is kept per location
+            images_client.reset_mock()
+            load_images_thru_services('canonical', None, None, 'eastus')
+            images_client.list_publishers.assert_called_once_with('eastus')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -62,6 +62,7 @@ setup(
         'azure.cli.command_modules',
         'azure.cli.command_modules.vm',
     ],
+    package_data={'azure.cli.command_modules.vm': ['_argument_manifest.json', '_help_index.json']},
     install_requires=DEPENDENCIES,
     cmdclass=cmdclass
 )